@@ -1,9 +1,79 @@
+from django.utils import timezone
 from rest_framework import serializers
+from config.fastpath import ValuesSerializer, Column, DateTime
 from .models import Item
 
 
+class ItemListSerializer(serializers.ListSerializer):
+    """Bulk writes for ``ItemSerializer(many=True)``.
+
+    Creates go through ``bulk_create``. For updates, pass the target items
+    as ``instance``; every row must carry the ``id`` of one of them and is
+    validated against it, then all rows are saved with one ``bulk_update``.
+    ``context['batch_size']`` sets the rows per query.
+    """
+
+    def run_child_validation(self, data):
+        if self.instance is None:
+            return super().run_child_validation(data)
+
+        if not hasattr(self, '_targets'):
+            self._targets = {item.pk: item for item in self.instance}
+            self._seen = set()
+        pk = data.get('id') if isinstance(data, dict) else None
+        if pk is None:
+            raise serializers.ValidationError({'id': ['This field is required.']})
+        try:
+            pk = int(pk)
+        except (TypeError, ValueError):
+            raise serializers.ValidationError({'id': ['A valid integer is required.']})
+        if pk not in self._targets:
+            raise serializers.ValidationError({'id': [f'Item {pk} does not exist.']})
+        if pk in self._seen:
+            raise serializers.ValidationError({'id': [f'Item {pk} appears more than once.']})
+        self._seen.add(pk)
+
+        self.child.instance = self._targets[pk]
+        self.child.initial_data = data
+        validated = super().run_child_validation(data)
+        validated['id'] = pk
+        return validated
+
+    def create(self, validated_data):
+        items = [Item(**attrs) for attrs in validated_data]
+        return Item.objects.bulk_create(items, batch_size=self.context.get('batch_size'))
+
+    def update(self, instance, validated_data):
+        targets = {item.pk: item for item in instance}
+        now = timezone.now()
+        fields = {'updated_at'}
+        items = []
+        for attrs in validated_data:
+            item = targets[attrs.pop('id')]
+            for name, value in attrs.items():
+                setattr(item, name, value)
+                fields.add(name)
+            # bulk_update skips auto_now
+            item.updated_at = now
+            items.append(item)
+        Item.objects.bulk_update(items, sorted(fields), batch_size=self.context.get('batch_size'))
+        return items
+
+
 class ItemSerializer(serializers.ModelSerializer):
     class Meta:
         model = Item
         fields = ['id', 'name', 'description', 'created_at', 'updated_at']
         read_only_fields = ['created_at', 'updated_at']
+        list_serializer_class = ItemListSerializer
+
+
+class ItemValuesSerializer(ValuesSerializer):
+    """values()-based twin of ItemSerializer for list responses."""
+    fields = {
+        'id': Column('id'),
+        'name': Column('name'),
+        'description': Column('description'),
+        'created_at': DateTime('created_at'),
+        'updated_at': DateTime('updated_at'),
+    }
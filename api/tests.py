@@ -1,3 +1,151 @@
-from django.test import TestCase
+import csv
+import gzip
+import io
+import json
+import zlib
+from datetime import timedelta
+from urllib.parse import urlencode
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from .models import Item
+
+
+def statements(queries, verb):
+    return [query for query in queries if query['sql'].startswith(verb)]
+
+
+@override_settings(API_BULK_BATCH_SIZE=500, API_BULK_BATCH_SIZE_MAX=3)
+class ItemBulkTests(TestCase):
+    """Bulk create, update and delete on /api/items/."""
+
+    def setUp(self):
+        self.items = Item.objects.bulk_create([Item(name=f'bulk-{i}', description='Triumph') for i in range(5)])
+        self.client.force_login(User.objects.create_user('rider', password='pw'))
+
+    def test_list_create_in_batches(self):
+        rows = [{'name': f'new-{i}', 'description': 'KTM'} for i in range(7)]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/api/items/?batch_size=100', rows, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([row['name'] for row in response.json()], [row['name'] for row in rows])
+        # ?batch_size is capped at API_BULK_BATCH_SIZE_MAX
+        self.assertEqual(len(statements(queries.captured_queries, 'INSERT')), 3)
+        self.assertEqual(Item.objects.filter(name__startswith='new-').count(), 7)
+
+    def test_list_create_validation_errors(self):
+        rows = [{'name': 'ok'}, {'description': 'no name'}, {'name': 'x' * 201}]
+        response = self.client.post('/api/items/', rows, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()
+        self.assertEqual(errors[0], {})
+        self.assertIn('name', errors[1])
+        self.assertIn('name', errors[2])
+        self.assertFalse(Item.objects.filter(name='ok').exists())
+
+    def test_patch_maps_rows_by_id(self):
+        first, second = self.items[0], self.items[1]
+        rows = [{'id': second.pk, 'name': 'renamed'}, {'id': str(first.pk), 'description': 'BMW'}]
+        response = self.client.patch('/api/items/bulk/', rows, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['id'] for row in response.json()], [second.pk, first.pk])
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual((first.name, first.description), ('bulk-0', 'BMW'))
+        self.assertEqual((second.name, second.description), ('renamed', 'Triumph'))
+        self.assertGreater(first.updated_at, first.created_at)
+
+    def test_patch_rejects_bad_ids(self):
+        pk = self.items[0].pk
+        for rows, message in [
+            ([{'name': 'no id'}], 'This field is required.'),
+            ([{'id': 'abc', 'name': 'x'}], 'A valid integer is required.'),
+            ([{'id': 999999, 'name': 'x'}], 'Item 999999 does not exist.'),
+            ([{'id': pk, 'name': 'a'}, {'id': pk, 'name': 'b'}], f'Item {pk} appears more than once.'),
+        ]:
+            with self.subTest(rows=rows):
+                response = self.client.patch('/api/items/bulk/', rows, content_type='application/json')
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(message, [error['id'][0] for error in response.json() if error])
+        response = self.client.patch('/api/items/bulk/', {'id': pk}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Item.objects.exclude(name__startswith='bulk-').exists())
+
+    def test_bulk_requires_login(self):
+        self.client.logout()
+        pk = self.items[0].pk
+        response = self.client.patch('/api/items/bulk/', [{'id': pk, 'name': 'anon'}], content_type='application/json')
+        self.assertEqual(response.status_code, 403)
+        response = self.client.delete(f'/api/items/bulk/?ids={pk}')
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(list(Item.objects.order_by('pk').values_list('name', flat=True)), [f'bulk-{i}' for i in range(5)])
+
+    def test_delete_requires_a_filter(self):
+        for query in ['', '?ids=1,x', '?created_before=yesterday']:
+            with self.subTest(query=query):
+                self.assertEqual(self.client.delete(f'/api/items/bulk/{query}').status_code, 400)
+        self.assertEqual(Item.objects.count(), 5)
+
+    def test_delete_by_filters_in_batches(self):
+        ids = ','.join(str(item.pk) for item in self.items[:2])
+        response = self.client.delete(f'/api/items/bulk/?ids={ids}')
+        self.assertEqual(response.json(), {'deleted': 2})
+
+        Item.objects.create(name='keep-me')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.delete('/api/items/bulk/?name_prefix=bulk-&batch_size=1')
+        self.assertEqual(response.json(), {'deleted': 3})
+        self.assertEqual(len(statements(queries.captured_queries, 'DELETE')), 3)
+
+        before = (timezone.now() + timedelta(minutes=1)).isoformat()
+        response = self.client.delete(f'/api/items/bulk/?{urlencode({"created_before": before})}')
+        self.assertEqual(response.json(), {'deleted': 1})
+        self.assertFalse(Item.objects.exists())
+
+
+@override_settings(EXPORT_CHUNK_SIZE=2)
+class ItemExportTests(TestCase):
+    """GET /api/items/export/ streams every item, a chunk at a time."""
+
+    def setUp(self):
+        self.items = Item.objects.bulk_create([Item(name=f'export-{i}', description=f'Ducati, {i}') for i in range(5)])
+
+    def export(self, query=''):
+        response = self.client.get(f'/api/items/export/{query}')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        chunks = list(response.streaming_content)
+        return response, chunks, b''.join(chunks)
+
+    def test_ndjson(self):
+        response, chunks, body = self.export()
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertRegex(response['Content-Disposition'], r'^attachment; filename="items-[\d-]+\.ndjson"$')
+        rows = [json.loads(line) for line in body.decode().splitlines()]
+        self.assertEqual([row['name'] for row in rows], [f'export-{i}' for i in range(5)])
+        self.assertEqual(list(rows[0]), ['id', 'name', 'description', 'created_at', 'updated_at'])
+        # The first row goes out alone, then EXPORT_CHUNK_SIZE rows per chunk
+        self.assertEqual([chunk.count(b'\n') for chunk in chunks], [1, 2, 2])
+
+    def test_csv(self):
+        response, chunks, body = self.export('?output=csv')
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertTrue(response['Content-Disposition'].endswith('.csv"'))
+        self.assertEqual(chunks[0], b'id,name,description,created_at,updated_at\r\n')
+        rows = list(csv.DictReader(io.StringIO(body.decode())))
+        self.assertEqual([(row['id'], row['description']) for row in rows],
+                         [(str(item.pk), item.description) for item in self.items])
+
+    def test_gzip(self):
+        response, chunks, body = self.export('?gzip=1')
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        self.assertTrue(response['Content-Disposition'].endswith('.ndjson.gz"'))
+        # Every chunk is flushed, so the rows read so far decompress on their own
+        first = zlib.decompressobj(31).decompress(chunks[0])
+        self.assertEqual(json.loads(first)['name'], 'export-0')
+        lines = gzip.decompress(body).decode().splitlines()
+        self.assertEqual([json.loads(line)['name'] for line in lines], [f'export-{i}' for i in range(5)])
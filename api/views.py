@@ -1,8 +1,14 @@
-from rest_framework import viewsets, status
-from rest_framework.decorators import api_view
+from django.conf import settings
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+from rest_framework import permissions, viewsets, status
+from rest_framework.decorators import action, api_view
 from rest_framework.response import Response
+from config.conditional import ConditionalGetMixin, bump_version
+from config.exports import ExportMixin
+from config.fastpath import FastListMixin
 from .models import Item
-from .serializers import ItemSerializer
+from .serializers import ItemSerializer, ItemValuesSerializer
 
 
 @api_view(['GET'])
@@ -16,9 +22,94 @@ def api_root(request):
     })
 
 
-class ItemViewSet(viewsets.ModelViewSet):
+class ItemViewSet(ConditionalGetMixin, FastListMixin, ExportMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing Item instances.
     """
     queryset = Item.objects.all()
     serializer_class = ItemSerializer
+    fast_serializer_class = ItemValuesSerializer
+    export_filename = 'items'
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['batch_size'] = self.batch_size()
+        return context
+
+    def batch_size(self):
+        """Rows per INSERT/UPDATE/DELETE for bulk requests (``?batch_size=`` overrides the setting)."""
+        try:
+            size = int(self.request.query_params.get('batch_size', settings.API_BULK_BATCH_SIZE))
+        except ValueError:
+            size = settings.API_BULK_BATCH_SIZE
+        return max(1, min(size, settings.API_BULK_BATCH_SIZE_MAX))
+
+    def create(self, request, *args, **kwargs):
+        """Create one item, or many from a JSON list in one transaction."""
+        if not isinstance(request.data, list):
+            return super().create(request, *args, **kwargs)
+
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            serializer.save()
+        bump_version(Item)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['patch', 'delete'], permission_classes=[permissions.IsAuthenticated])
+    def bulk(self, request):
+        """PATCH a list of ``{"id": ..., field: value}`` rows, or DELETE the items matching the filters.
+
+        DELETE needs at least one of ``?ids=1,2,3``, ``?name_prefix=`` or
+        ``?created_before=<ISO datetime>``.
+        """
+        if request.method == 'DELETE':
+            return self._bulk_delete(request)
+
+        rows = request.data
+        if not isinstance(rows, list):
+            return Response({'error': 'Expected a list of items.'}, status=status.HTTP_400_BAD_REQUEST)
+        ids = [row.get('id') for row in rows if isinstance(row, dict)]
+        targets = list(Item.objects.filter(pk__in=[pk for pk in ids if str(pk).isdigit()]))
+        serializer = self.get_serializer(targets, data=rows, many=True, partial=True)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            serializer.save()
+        bump_version(Item)
+        return Response(serializer.data)
+
+    def _bulk_delete(self, request):
+        params = request.query_params
+        queryset = Item.objects.all()
+        filtered = False
+        if params.get('ids'):
+            try:
+                ids = [int(pk) for pk in params['ids'].split(',') if pk.strip()]
+            except ValueError:
+                return Response({'error': 'ids must be a comma-separated list of integers.'},
+                                status=status.HTTP_400_BAD_REQUEST)
+            queryset = queryset.filter(pk__in=ids)
+            filtered = True
+        if params.get('name_prefix'):
+            queryset = queryset.filter(name__startswith=params['name_prefix'])
+            filtered = True
+        if params.get('created_before'):
+            before = parse_datetime(params['created_before'])
+            if before is None:
+                return Response({'error': 'created_before must be an ISO 8601 datetime.'},
+                                status=status.HTTP_400_BAD_REQUEST)
+            queryset = queryset.filter(created_at__lt=before)
+            filtered = True
+        if not filtered:
+            return Response({'error': 'Refusing to delete every item; pass ids, name_prefix or created_before.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        batch_size = self.batch_size()
+        deleted = 0
+        with transaction.atomic():
+            ids = list(queryset.order_by().values_list('pk', flat=True))
+            for start in range(0, len(ids), batch_size):
+                # Item has no dependents, so a raw DELETE is safe and skips per-row signals
+                deleted += Item.objects.filter(pk__in=ids[start:start + batch_size])._raw_delete(queryset.db)
+        bump_version(Item)
+        return Response({'deleted': deleted})
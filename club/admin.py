@@ -1,5 +1,8 @@
 from django.contrib import admin
-from .models import Profile, Ride, RidePhoto, RideComment, Poll, PollChoice, Vote
+from .models import (
+    Profile, Ride, RidePhoto, RideComment, Poll, PollChoice, Vote, MemberStats, MemberDeletionJob, MemberImportJob,
+    ArchivedRide
+)
 
 
 @admin.register(Profile)
@@ -105,3 +108,42 @@ class VoteAdmin(admin.ModelAdmin):
     search_fields = ['user__username']
     list_filter = ['voted_at', 'choice__poll']
     readonly_fields = ['voted_at']
+
+
+@admin.register(MemberStats)
+class MemberStatsAdmin(admin.ModelAdmin):
+    list_display = ['user', 'rides_attended', 'rides_led', 'photos_uploaded', 'comments_posted', 'last_ride_date']
+    search_fields = ['user__username']
+    readonly_fields = ['user', 'rides_attended', 'rides_led', 'photos_uploaded', 'comments_posted', 'last_ride_date']
+
+
+@admin.register(MemberDeletionJob)
+class MemberDeletionJobAdmin(admin.ModelAdmin):
+    list_display = ['username', 'status', 'requested_by', 'created_at', 'finished_at']
+    list_filter = ['status', 'created_at']
+    search_fields = ['username']
+    readonly_fields = ['member_id', 'username', 'requested_by', 'status', 'progress', 'error',
+                       'created_at', 'started_at', 'finished_at']
+
+
+@admin.register(MemberImportJob)
+class MemberImportJobAdmin(admin.ModelAdmin):
+    list_display = ['filename', 'status', 'rows', 'requested_by', 'created_at', 'finished_at']
+    list_filter = ['status', 'created_at']
+    search_fields = ['filename']
+    readonly_fields = ['filename', 'rows', 'requested_by', 'status', 'progress', 'report', 'error',
+                       'created_at', 'started_at', 'finished_at']
+
+
+@admin.register(ArchivedRide)
+class ArchivedRideAdmin(admin.ModelAdmin):
+    """Read-only: archived rides are moved in by ``manage.py archive_rides``."""
+    list_display = ['title', 'date_time', 'start_point', 'end_point', 'created_by', 'archived_at']
+    search_fields = ['title', 'description', 'start_point', 'end_point']
+    list_filter = ['date_time', 'archived_at']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -4,3 +4,15 @@ from django.apps import AppConfig
 class ClubConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "club"
+
+    def ready(self):
+        from django.contrib.auth.models import User
+        from config.conditional import track_model_versions
+        from . import signals  # noqa: F401
+        from .models import (
+            ArchivedRide, ArchivedRideComment, ArchivedRidePhoto, MemberStats, Poll, PollChoice, Profile,
+            Ride, RideComment, RidePhoto, Vote, VoteRollup
+        )
+
+        track_model_versions(User, Profile, MemberStats, Ride, RidePhoto, RideComment, Poll, PollChoice, Vote)
+        track_model_versions(ArchivedRide, ArchivedRidePhoto, ArchivedRideComment, VoteRollup)
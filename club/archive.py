@@ -0,0 +1,158 @@
+"""
+Archive tier for old completed rides.
+
+``archive_rides()`` (``manage.py archive_rides``) moves completed rides that
+started before a cutoff, with their rider links, comments and photo
+metadata, into the ``Archived*`` tables. It does this in short batches:
+copy, then a raw delete from the hot tables. The hot tables and their
+indexes then only hold recent and upcoming rides. Ids are kept, so
+``/club/rides/<id>/`` and API URLs keep working. Media files are not
+touched, and member stats are unchanged (``club.stats`` counts both tiers).
+
+Reads that cover history go through both tiers:
+
+- ``TieredRides`` pages hot and archived rides as one sequence, newest first;
+- ``get_ride()`` looks an id up in either tier;
+- ``completed_rides()`` lists both.
+
+Archived rides are read-only: they take no comments, joins or edits.
+"""
+from itertools import chain
+
+from django.db import transaction
+from django.db.models import Count, Value
+from django.http import Http404
+
+from config.conditional import bump_version
+
+from .models import (
+    ArchivedRide, ArchivedRideComment, ArchivedRidePhoto, Ride, RideComment, RidePhoto
+)
+
+BATCH_SIZE = 200
+ORDERING = ('-date_time', '-id')
+
+RideRider = Ride.riders.through
+ArchivedRideRider = ArchivedRide.riders.through
+
+ARCHIVE_MODELS = [ArchivedRide, ArchivedRideRider, ArchivedRidePhoto, ArchivedRideComment]
+
+
+def _copies(model, rows):
+    """Unsaved ``model`` instances with the matching column values of ``rows``."""
+    columns = [field.attname for field in model._meta.concrete_fields if field.attname != 'archived_at']
+    return [model(**{name: getattr(row, name) for name in columns}) for row in rows]
+
+
+def archive_rides(before, batch_size=BATCH_SIZE):
+    """Move completed rides that started before ``before`` into the archive; return counts per table."""
+    queryset = Ride.objects.filter(completed=True, date_time__lt=before)
+    moved = {'rides': 0, 'riders': 0, 'comments': 0, 'photos': 0}
+    while True:
+        with transaction.atomic():
+            rides = list(queryset.order_by('pk')[:batch_size])
+            if not rides:
+                break
+            ids = [ride.pk for ride in rides]
+            riders = list(RideRider.objects.filter(ride_id__in=ids).values_list('ride_id', 'user_id'))
+            comments = list(RideComment.objects.filter(ride_id__in=ids))
+            photos = list(RidePhoto.objects.filter(ride_id__in=ids))
+
+            ArchivedRide.objects.bulk_create(_copies(ArchivedRide, rides))
+            ArchivedRideRider.objects.bulk_create([
+                ArchivedRideRider(archivedride_id=ride_id, user_id=user_id) for ride_id, user_id in riders
+            ])
+            ArchivedRideComment.objects.bulk_create(_copies(ArchivedRideComment, comments))
+            ArchivedRidePhoto.objects.bulk_create(_copies(ArchivedRidePhoto, photos))
+
+            # Raw deletes: no cascade collection and no stats signals; everything was copied above
+            for model, lookup in ((RidePhoto, 'ride_id__in'), (RideComment, 'ride_id__in'),
+                                  (RideRider, 'ride_id__in'), (Ride, 'pk__in')):
+                model._base_manager.filter(**{lookup: ids})._raw_delete(model._base_manager.db)
+
+        moved['rides'] += len(rides)
+        moved['riders'] += len(riders)
+        moved['comments'] += len(comments)
+        moved['photos'] += len(photos)
+    if moved['rides']:
+        bump_version(Ride, RideRider, RidePhoto, RideComment, *ARCHIVE_MODELS)
+    return moved
+
+
+def get_ride(pk):
+    """The ride with this id from either tier, or 404."""
+    ride = Ride.objects.filter(pk=pk).first() or ArchivedRide.objects.filter(pk=pk).first()
+    if ride is None:
+        raise Http404('No ride matches the given query.')
+    return ride
+
+
+def _completed_querysets():
+    return (
+        Ride.objects.filter(completed=True).annotate(rider_count=Count('riders')),
+        ArchivedRide.objects.annotate(rider_count=Count('riders')),
+    )
+
+
+def _newest_first(rides):
+    return sorted(rides, key=lambda ride: (ride.date_time, ride.pk), reverse=True)
+
+
+def completed_rides():
+    """Completed rides from both tiers, newest first, with their rider counts."""
+    return _newest_first(chain(*_completed_querysets()))
+
+
+async def acompleted_rides():
+    """Async twin of ``completed_rides()``."""
+    return _newest_first([ride for queryset in _completed_querysets() async for ride in queryset])
+
+
+class TieredRides:
+    """Hot and archived rides as one countable, sliceable sequence, newest first.
+
+    ``hot`` and ``archived`` are filtered model querysets. ``rows`` turns a
+    queryset into what is returned (e.g. a fast serializer's ``prepare``),
+    so pages hold instances or ``.values()`` rows. A page takes one UNION
+    query over ``(date_time, id, tier)`` keys, then one query per tier for
+    its rows. Both Django's and DRF's paginators accept it.
+    """
+
+    def __init__(self, hot, archived, rows=None):
+        self.hot = hot
+        self.archived = archived
+        self.rows = rows or (lambda queryset: queryset)
+
+    def count(self):
+        return self._keys().order_by().count()
+
+    def __len__(self):
+        return self.count()
+
+    def _keys(self):
+        tiers = [
+            queryset.order_by().annotate(tier=Value(number)).values_list('date_time', 'id', 'tier')
+            for number, queryset in enumerate((self.hot, self.archived))
+        ]
+        return tiers[0].union(tiers[1], all=True).order_by(*ORDERING)
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        keys = list(self._keys()[index])
+        loaded = []
+        for number, queryset in enumerate((self.hot, self.archived)):
+            ids = [pk for _, pk, tier in keys if tier == number]
+            # Both orders agree, so each tier's rows come back in page order
+            loaded.append(iter(self.rows(queryset.filter(pk__in=ids).order_by(*ORDERING)) if ids else ()))
+        return [next(loaded[tier]) for _, _, tier in keys]
+
+    def __iter__(self):
+        return iter(self[:])
+
+    def iterator(self, chunk_size=None):
+        """Every row, hot tier first, without paging (for streamed exports)."""
+        return chain(
+            self.rows(self.hot).iterator(chunk_size=chunk_size),
+            self.rows(self.archived).iterator(chunk_size=chunk_size),
+        )
@@ -0,0 +1,275 @@
+"""
+Async twins of the hot read paths, mounted when ``ASYNC_READ_VIEWS`` is on.
+
+Under ASGI a sync view costs a thread hop per request. These views stay
+on the event loop: every query goes through the async ORM and rows are
+fully loaded (``select_related``/``prefetch_related``/annotations) before
+anything is serialized or rendered, so serializers and templates never
+touch the database. A missed relation raises ``SynchronousOnlyOperation``
+instead of quietly blocking the loop.
+
+Responses match the sync views byte for byte apart from CSRF tokens
+(``manage.py bench_async_views`` checks that). Anything off the fast
+path (writes, the browsable API, unusual query parameters, 404s) is
+handed to the sync view unchanged.
+"""
+from asgiref.sync import sync_to_async
+from django.core.paginator import Paginator
+from django.db.models import Count
+from django.http import HttpResponse
+from django.shortcuts import render
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from config.conditional import avalidator
+from config.fastpath import fast_lists_enabled
+from config.profiling import PARAM as PROFILE_PARAM
+
+from . import views
+from .archive import acompleted_rides
+from .compaction import avoters
+from .middleware import aget_profile
+from .models import Poll, Profile, Ride, Vote, VoteRollup
+from .serializers import ProfileValuesSerializer, RideDetailSerializer, UserSerializer, VoterSerializer
+
+_datetime_field = serializers.DateTimeField()
+
+# The sync views the async ones fall back to, with the router's method mappings
+sync_upcoming = views.RideViewSet.as_view({'get': 'upcoming'})
+sync_poll_detail = views.PollViewSet.as_view({
+    'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy',
+})
+sync_profile_list = views.ProfileViewSet.as_view({'get': 'list', 'post': 'create'})
+
+
+def _fast_path(request, allowed=()):
+    """True for a JSON GET whose query parameters are all in ``allowed``."""
+    if request.method != 'GET' or 'text/html' in request.headers.get('Accept', ''):
+        return False
+    return all(name in allowed or name == PROFILE_PARAM for name in request.GET)
+
+
+def _json(data, status=200):
+    renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+    response = HttpResponse(renderer.render(data), status=status, content_type='application/json')
+    response['Vary'] = 'Accept'
+    return response
+
+
+def _sparse(request, data):
+    requested = request.GET.get('fields')
+    if not requested:
+        return data
+    wanted = {name.strip() for name in requested.split(',') if name.strip()}
+    return {name: value for name, value in data.items() if name in wanted}
+
+
+async def _conditional(request, queryset, conditional_models, updated_field, build):
+    """Async version of ``ConditionalGetMixin._conditional``; ``build`` returns the response or None."""
+    etag, last_modified = await avalidator(request, queryset, conditional_models, updated_field)
+    if etag is not None:
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return not_modified
+    response = await build()
+    if response is not None and etag is not None and response.status_code == 200:
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+async def _load_user(request):
+    """Resolve ``request.user`` and its profile up front so templates don't query."""
+    user = await request.auser()
+    if user.is_authenticated:
+        profile = await aget_profile(request)
+        if profile is not None:
+            user.profile = profile
+    request.user = user
+    return user
+
+
+async def _upcoming_ride_id():
+    now = timezone.now()
+    ride_id = await Ride.objects.filter(
+        date_time__gt=now, completed=False
+    ).order_by('date_time').values_list('pk', flat=True).afirst()
+    return ride_id or await Ride.objects.filter(
+        completed=False
+    ).order_by('-date_time').values_list('pk', flat=True).afirst()
+
+
+@csrf_exempt
+async def upcoming_ride_api(request):
+    """``GET /club/api/rides/upcoming/`` (``RideViewSet.upcoming``)."""
+    if not _fast_path(request, allowed=('fields',)):
+        return await sync_to_async(sync_upcoming)(request)
+    ride_id = await views.upcoming_ride_id.entry.aget_or_set((), _upcoming_ride_id)
+    if not ride_id:
+        return _json({'message': 'No upcoming rides'}, status=404)
+
+    async def build():
+        ride = await Ride.objects.select_related('created_by').prefetch_related('riders').annotate(
+            photo_count=Count('photos')
+        ).aget(pk=ride_id)
+        return RideDetailSerializer(ride, context={'request': request}).data
+
+    parts = [ride_id, request.scheme, request.get_host(), request.GET.get('fields')]
+    return _json(await views.upcoming_ride_payload.aget_or_set(parts, build))
+
+
+async def _compacted_votes(poll, user):
+    """``(voters by choice id, user's choice id)`` from a compacted poll's rollups."""
+    rollups = {rollup.choice_id: rollup async for rollup in VoteRollup.objects.filter(choice__poll=poll)}
+    user_vote = next((choice_id for choice_id, rollup in rollups.items() if user.pk in rollup.voter_ids), None)
+    voters = await avoters([pk for rollup in rollups.values() for pk in rollup.voter_ids])
+    by_pk = {voter.pk: voter for voter in voters}
+    return {
+        choice_id: [by_pk[pk] for pk in rollup.voter_ids if pk in by_pk]
+        for choice_id, rollup in rollups.items()
+    }, user_vote
+
+
+async def _poll_detail_data(request, poll, user):
+    if poll.votes_compacted:
+        voters_by_choice, user_vote = await _compacted_votes(poll, user)
+    else:
+        votes = [vote async for vote in Vote.objects.filter(choice__poll=poll).select_related('user', 'user__profile')]
+        voters_by_choice = {}
+        for vote in votes:
+            voters_by_choice.setdefault(vote.choice_id, []).append(vote.user)
+        user_vote = next((vote.choice_id for vote in votes if vote.user_id == user.pk), None)
+    total = sum(len(voters) for voters in voters_by_choice.values())
+    choices = []
+    async for choice in poll.choices.all():
+        voters = voters_by_choice.get(choice.pk, [])
+        choices.append({
+            'id': choice.pk,
+            'text': choice.text,
+            'description': choice.description,
+            'vote_count': len(voters),
+            'voters': VoterSerializer(voters, many=True, context={'request': request}).data,
+            'percentage': round(len(voters) / total * 100, 1) if total else 0,
+        })
+    if not user.is_authenticated:
+        user_vote = None
+    return {
+        'id': poll.pk,
+        'title': poll.title,
+        'description': poll.description,
+        'is_active': poll.is_active,
+        'created_by': UserSerializer(poll.created_by).data if poll.created_by else None,
+        'choices': choices,
+        'total_votes': total,
+        'user_vote': user_vote,
+        'created_at': _datetime_field.to_representation(poll.created_at),
+        'closes_at': _datetime_field.to_representation(poll.closes_at) if poll.closes_at else None,
+    }
+
+
+@csrf_exempt
+async def poll_detail_api(request, pk):
+    """``GET /club/api/polls/<id>/`` (``PollViewSet.retrieve`` with ``PollDetailSerializer``)."""
+    if not _fast_path(request, allowed=('fields',)):
+        return await sync_to_async(sync_poll_detail)(request, pk=str(pk))
+
+    async def build():
+        poll = await Poll.objects.select_related('created_by').filter(pk=pk).afirst()
+        if poll is None:
+            return None
+        user = await request.auser()
+        return _json(_sparse(request, await _poll_detail_data(request, poll, user)))
+
+    response = await _conditional(
+        request, Poll._base_manager.filter(pk=pk), views.PollViewSet.conditional_models,
+        views.PollViewSet.updated_field, build
+    )
+    if response is None:
+        return await sync_to_async(sync_poll_detail)(request, pk=str(pk))
+    return response
+
+
+@csrf_exempt
+async def profile_list_api(request):
+    """``GET /club/api/profiles/`` (``ProfileViewSet.list`` on the values() fast path)."""
+    if not (fast_lists_enabled() and _fast_path(request, allowed=('page', 'fields', 'username'))):
+        return await sync_to_async(sync_profile_list)(request)
+    queryset = Profile.objects.select_related('user', 'user__stats')
+    if request.GET.get('username'):
+        queryset = queryset.filter(user__username=request.GET['username'])
+
+    async def build():
+        requested = request.GET.get('fields')
+        only = {name.strip() for name in requested.split(',') if name.strip()} if requested else None
+        fast = ProfileValuesSerializer(context={'request': request}, only=only)
+        rows = fast.prepare(queryset)
+        count = await rows.acount()
+        page_size = api_settings.PAGE_SIZE
+        paginator = Paginator(range(count), page_size)
+        try:
+            number = int(request.GET.get('page', 1))
+        except ValueError:
+            return None
+        if not 1 <= number <= paginator.num_pages:
+            return None
+        start = (number - 1) * page_size
+        page = [row async for row in rows[start:start + page_size]]
+
+        url = request.build_absolute_uri()
+        return _json({
+            'count': count,
+            'next': replace_query_param(url, 'page', number + 1) if number < paginator.num_pages else None,
+            'previous': (
+                None if number == 1
+                else remove_query_param(url, 'page') if number == 2
+                else replace_query_param(url, 'page', number - 1)
+            ),
+            'results': fast.serialize(page),
+        })
+
+    response = await _conditional(
+        request, queryset, views.ProfileViewSet.conditional_models, views.ProfileViewSet.updated_field, build
+    )
+    if response is None:
+        return await sync_to_async(sync_profile_list)(request)
+    return response
+
+
+async def rides_list(request):
+    """Completed rides list page."""
+    await _load_user(request)
+    rides = await views.completed_rides.entry.aget_or_set((), acompleted_rides)
+    return render(request, 'club/rides_list.html', {'completed_rides': rides})
+
+
+async def _gallery_page(request, ride):
+    photos = ride.photos.select_related('uploaded_by')
+    paginator = Paginator(photos, views.GALLERY_PAGE_SIZE)
+    paginator.count = await photos.acount()
+    page = paginator.get_page(request.GET.get('page'))
+    page.object_list = [photo async for photo in page.object_list]
+    return page
+
+
+async def ride_detail(request, pk):
+    """Ride detail page; comment posts and deletions go to the sync view."""
+    if request.method != 'GET':
+        return await sync_to_async(views.ride_detail)(request, pk)
+    ride = await Ride.objects.filter(pk=pk).afirst()
+    if ride is None:
+        return await sync_to_async(views.ride_detail)(request, pk)
+    await _load_user(request)
+    comments = [comment async for comment in ride.comments.select_related('user', 'user__profile')]
+    riders = [rider async for rider in ride.riders.select_related('profile')]
+    return render(request, 'club/ride_detail.html', {
+        'ride': ride,
+        'riders': riders,
+        'comments': comments,
+        # The gallery is only shown for completed rides
+        'photos': await _gallery_page(request, ride) if ride.completed else None,
+    })
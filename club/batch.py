@@ -0,0 +1,116 @@
+"""
+In-process dispatch of read-only API sub-requests for ``/club/api/batch/``.
+
+Each sub-request is resolved with the normal URL resolver and handed the
+outer request's user, session and cookies, so session loading, auth and
+middleware run once for the whole batch and every view shares the same
+database connection. Async views (``ASYNC_READ_VIEWS``) are driven with
+``async_to_sync``; their ORM calls hop back onto this thread, so they share
+that connection too. Only GETs under ``BATCH_PATH_PREFIXES`` are allowed.
+"""
+import asyncio
+import json
+import logging
+from urllib.parse import urlsplit
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.http import Http404, HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+
+logger = logging.getLogger(__name__)
+
+BATCH_PATH_PREFIXES = ('/club/api/', '/api/')
+
+
+def _error(status, message):
+    return status, json.dumps({'error': message}).encode(), True
+
+
+def _subrequest(request, path, query):
+    sub = HttpRequest()
+    # WSGIRequest/ASGIRequest supply the scheme; without it absolute URLs come out as http://
+    sub._get_scheme = request._get_scheme
+    sub.method = 'GET'
+    sub.path = sub.path_info = path
+    sub.META = {
+        **request.META,
+        'REQUEST_METHOD': 'GET',
+        'HTTP_ACCEPT': 'application/json',
+        'PATH_INFO': path,
+        'QUERY_STRING': query,
+        'CONTENT_LENGTH': '',
+        'CONTENT_TYPE': '',
+    }
+    sub.GET = QueryDict(query)
+    sub.COOKIES = request.COOKIES
+    sub.session = request.session
+    sub.user = request.user
+    if hasattr(request, 'auser'):
+        sub.auser = request.auser
+    for attr in ('profile', '_cached_profile'):
+        if hasattr(request, attr):
+            setattr(sub, attr, getattr(request, attr))
+    return sub
+
+
+def dispatch(request, url):
+    """Run one GET sub-request; return ``(status, body bytes, body is JSON)``."""
+    parts = urlsplit(url)
+    path = parts.path
+    if parts.scheme or parts.netloc or not path.startswith(BATCH_PATH_PREFIXES):
+        return _error(400, f'Only paths under {", ".join(BATCH_PATH_PREFIXES)} can be batched.')
+    try:
+        match = resolve(path)
+    except Resolver404:
+        return _error(404, 'Not found.')
+    if match.url_name == 'api_batch':
+        return _error(400, 'Batches cannot be nested.')
+
+    sub = _subrequest(request, path, parts.query)
+    sub.resolver_match = match
+    try:
+        view = match.func
+        if asyncio.iscoroutinefunction(view):
+            view = async_to_sync(view)
+        response = view(sub, *match.args, **match.kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+    except Http404:
+        return _error(404, 'Not found.')
+    except PermissionDenied:
+        return _error(403, 'Permission denied.')
+    except Exception:
+        logger.exception('Batched request to %s failed', url)
+        return _error(500, 'Server error.')
+    if response.streaming:
+        return _error(400, 'Streaming responses cannot be batched.')
+    is_json = response.get('Content-Type', '').startswith('application/json')
+    return response.status_code, response.content, is_json
+
+
+def run_batch(request, items):
+    """Dispatch ``items`` and build the JSON response body without re-encoding sub-responses."""
+    parts = []
+    for index, item in enumerate(items):
+        item_id = item.get('id', index) if isinstance(item, dict) else index
+        url = item.get('url') if isinstance(item, dict) else None
+        method = (item.get('method') or 'GET').upper() if isinstance(item, dict) else 'GET'
+        if not isinstance(url, str):
+            status, body, is_json = _error(400, 'Each request needs a "url".')
+        elif method != 'GET':
+            status, body, is_json = _error(405, 'Only GET requests can be batched.')
+        else:
+            status, body, is_json = dispatch(request, url)
+        if not body.strip():
+            body = b'null'
+        elif not is_json:
+            body = json.dumps(body.decode('utf-8', 'replace')).encode()
+        head = json.dumps({'id': item_id, 'url': url, 'status': status})[:-1].encode()
+        parts.append(head + b', "body": ' + body + b'}')
+    return b'{"responses": [' + b', '.join(parts) + b']}'
+
+
+def max_batch_size():
+    return getattr(settings, 'BATCH_MAX_REQUESTS', 25)
@@ -0,0 +1,113 @@
+"""
+Cached club querysets and serialized payloads.
+
+Entries are keyed by the version stamps of the models they depend on (see
+config.conditional). post_save, post_delete and m2m_changed bump those
+stamps for every tracked model, so a change makes each dependent entry miss
+on its next read; stale entries then simply expire.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+
+from config.conditional import amodel_versions, model_versions
+
+_MISSING = object()
+STATS_KEY = 'club-cache-stats:{}:{}'
+
+registry = {}
+
+
+class CachedEntry:
+    """A named cache entry that depends on a set of models."""
+
+    def __init__(self, name, depends_on, timeout=None):
+        self.name = name
+        self.depends_on = list(depends_on)
+        self.timeout = timeout
+
+    def key(self, parts=()):
+        return self._key(model_versions(*self.depends_on), parts)
+
+    def _key(self, versions, parts):
+        digest = hashlib.md5(repr((versions, list(parts))).encode(), usedforsecurity=False).hexdigest()
+        return f'club:{self.name}:{digest}'
+
+    def get_or_set(self, parts, build):
+        """Return the cached value for ``parts``, calling ``build()`` on a miss."""
+        key = self.key(parts)
+        value = cache.get(key, _MISSING)
+        if value is _MISSING:
+            _count(self.name, 'misses')
+            value = build()
+            timeout = self.timeout if self.timeout is not None else settings.CLUB_CACHE_TIMEOUT
+            cache.set(key, value, timeout)
+        else:
+            _count(self.name, 'hits')
+        return value
+
+    async def aget_or_set(self, parts, abuild):
+        """Async twin of ``get_or_set()``; ``abuild`` is a coroutine function."""
+        versions = await amodel_versions(*self.depends_on)
+        key = self._key(versions, parts)
+        value = await cache.aget(key, _MISSING)
+        if value is _MISSING:
+            await _acount(self.name, 'misses')
+            value = await abuild()
+            timeout = self.timeout if self.timeout is not None else settings.CLUB_CACHE_TIMEOUT
+            await cache.aset(key, value, timeout)
+        else:
+            await _acount(self.name, 'hits')
+        return value
+
+    def __call__(self, func):
+        """Use as a decorator: the function's arguments become the key parts."""
+        def wrapper(*args):
+            return self.get_or_set(args, lambda: func(*args))
+        wrapper.entry = self
+        wrapper.__name__ = func.__name__
+        wrapper.__doc__ = func.__doc__
+        return wrapper
+
+
+def cached(name, depends_on, timeout=None):
+    """Register a cache entry; usable directly or as a decorator."""
+    entry = CachedEntry(name, depends_on, timeout)
+    registry[name] = entry
+    return entry
+
+
+def _count(name, outcome):
+    key = STATS_KEY.format(name, outcome)
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Evicted between add() and incr(); losing one count is fine
+        pass
+
+
+async def _acount(name, outcome):
+    key = STATS_KEY.format(name, outcome)
+    await cache.aadd(key, 0, timeout=None)
+    try:
+        await cache.aincr(key)
+    except ValueError:
+        pass
+
+
+def cache_stats():
+    """Hit and miss counters for every registered entry."""
+    keys = {name: (STATS_KEY.format(name, 'hits'), STATS_KEY.format(name, 'misses')) for name in registry}
+    found = cache.get_many([key for pair in keys.values() for key in pair])
+    stats = {}
+    for name, (hits_key, misses_key) in keys.items():
+        hits, misses = found.get(hits_key, 0), found.get(misses_key, 0)
+        total = hits + misses
+        stats[name] = {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / total, 3) if total else None,
+        }
+    return stats
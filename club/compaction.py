@@ -0,0 +1,79 @@
+"""
+Vote compaction for closed polls.
+
+``compact_poll_votes()`` (``manage.py compact_poll_votes``) rolls the votes
+of polls past ``closes_at`` into one ``VoteRollup`` row per choice: the
+vote count and the voter ids, newest vote first. The rollups and
+``Poll.votes_compacted`` are written in one transaction, and reads switch
+to the rollups from then on. Only after that are the raw ``Vote`` rows
+deleted, in batches. ``Vote`` and its indexes then only hold votes for
+open polls.
+
+Poll responses stay the same:
+
+- counts, totals and percentages come from the rollups;
+- voters are loaded by id in the stored order;
+- ``user_vote`` is the choice whose voter list holds the member.
+
+Voting ends at ``closes_at``, so compaction only changes where the votes
+are read from. ``is_active`` is not enough: it can be switched back on.
+Compacted polls cannot be reopened. Deleting a member removes them from
+the voter lists, as it removes their ``Vote`` rows: the member deletion job
+(``club.jobs``) does it in batches, and a ``User`` post_delete handler
+(``club.signals``) covers deletes made elsewhere.
+"""
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+from config.conditional import bump_version
+
+from .jobs import _delete_in_batches
+from .models import Poll, Vote, VoteRollup
+
+BATCH_SIZE = 1000
+
+
+def compactable_polls(now=None):
+    """Polls whose votes can no longer change: past ``closes_at``."""
+    now = now or timezone.now()
+    return Poll.objects.filter(votes_compacted=False, closes_at__lt=now)
+
+
+def compact_poll_votes(polls=None, batch_size=BATCH_SIZE):
+    """Roll up, then delete, the votes of ``polls`` (default: every closed poll); return counts."""
+    polls = compactable_polls() if polls is None else polls
+    done = {'polls': 0, 'votes': 0}
+    for poll_id in list(polls.values_list('pk', flat=True)):
+        with transaction.atomic():
+            # The write transaction keeps votes from landing between the read and the flag
+            poll = Poll.objects.select_for_update().filter(pk=poll_id, votes_compacted=False).first()
+            if poll is None:
+                continue
+            voters = {choice_id: [] for choice_id in poll.choices.values_list('pk', flat=True)}
+            # Vote's default ordering (newest first) is the order the voters are listed in
+            for choice_id, user_id in Vote.objects.filter(choice__poll=poll).values_list('choice_id', 'user_id'):
+                voters[choice_id].append(user_id)
+            VoteRollup.objects.bulk_create([
+                VoteRollup(choice_id=choice_id, vote_count=len(user_ids), voter_ids=user_ids)
+                for choice_id, user_ids in voters.items()
+            ])
+            Poll.objects.filter(pk=poll_id).update(votes_compacted=True)
+        done['votes'] += _delete_in_batches(Vote.objects.filter(choice__poll_id=poll_id), batch_size)
+        done['polls'] += 1
+    if done['polls']:
+        bump_version(Poll, Vote, VoteRollup)
+    return done
+
+
+def voters(voter_ids):
+    """The users behind ``voter_ids``, in that order, with their profiles loaded."""
+    users = User.objects.select_related('profile').in_bulk(voter_ids)
+    return [users[pk] for pk in voter_ids if pk in users]
+
+
+async def avoters(voter_ids):
+    """Async twin of ``voters()``."""
+    users = {user.pk: user async for user in User.objects.select_related('profile').filter(pk__in=voter_ids)}
+    return [users[pk] for pk in voter_ids if pk in users]
+
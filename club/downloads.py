@@ -0,0 +1,159 @@
+import hashlib
+import os
+import zipfile
+
+from django.core.cache import cache
+from django.utils import timezone
+
+CHUNK_SIZE = 64 * 1024
+MANIFEST_TIMEOUT = 60 * 60 * 24
+
+# Per-entry framing zipfile writes around STORED data on a non-seekable output
+DATA_DESCRIPTOR_SIZE = 16
+ZIP64_DATA_DESCRIPTOR_SIZE = 24
+ZIP64_LOCAL_EXTRA_SIZE = 20
+
+
+class _ZipSink:
+    """Write-only, non-seekable file object that buffers what zipfile writes.
+
+    zipfile falls back to data descriptors for non-seekable outputs, so each
+    entry can be streamed without knowing its CRC up front.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _manifest_key(ride):
+    return f'club:ride-zip:{ride.pk}'
+
+
+def _encoded_name(arcname):
+    try:
+        return arcname.encode('ascii')
+    except UnicodeEncodeError:
+        return arcname.encode('utf-8')
+
+
+def archive_size(entries):
+    """Exact length of the archive ``stream_zip()`` writes for these entries.
+
+    Every entry is STORED, so its data is exactly its file size, and the
+    headers, data descriptors and central directory around it have fixed
+    sizes (mirroring zipfile's rules for when ZIP64 fields are added).
+    """
+    position = 0
+    central_size = 0
+    for entry in entries:
+        name = len(_encoded_name(entry['arcname']))
+        # zipfile reserves ZIP64 fields up front when the data might exceed the limit
+        zip64 = entry['size'] * 1.05 > zipfile.ZIP64_LIMIT
+        header_offset = position
+        position += zipfile.sizeFileHeader + name + (ZIP64_LOCAL_EXTRA_SIZE if zip64 else 0)
+        position += entry['size']
+        position += ZIP64_DATA_DESCRIPTOR_SIZE if zip64 else DATA_DESCRIPTOR_SIZE
+
+        zip64_fields = (2 if entry['size'] > zipfile.ZIP64_LIMIT else 0) + (header_offset > zipfile.ZIP64_LIMIT)
+        central_size += zipfile.sizeCentralDir + name + (4 + 8 * zip64_fields if zip64_fields else 0)
+
+    end = zipfile.sizeEndCentDir
+    if (len(entries) > zipfile.ZIP_FILECOUNT_LIMIT or position > zipfile.ZIP64_LIMIT
+            or central_size > zipfile.ZIP64_LIMIT):
+        end += zipfile.sizeEndCentDir64 + zipfile.sizeEndCentDir64Locator
+    return position + central_size + end
+
+
+def build_manifest(ride):
+    """Describe the archive for a ride: entry list, validator and size.
+
+    The manifest is cached so a resumed download replays exactly the same
+    entries in the same order, producing byte-identical output.
+    """
+    entries = []
+    for index, photo in enumerate(ride.photos.all(), start=1):
+        storage = photo.photo.storage
+        try:
+            size = storage.size(photo.photo.name)
+        except OSError:
+            continue
+        entries.append({
+            'name': photo.photo.name,
+            'arcname': f'{index:03d}_{os.path.basename(photo.photo.name)}',
+            'size': size,
+            'date_time': tuple(timezone.localtime(photo.created_at).timetuple()[:6]),
+        })
+
+    signature = repr([(e['name'], e['size'], e['date_time']) for e in entries])
+    etag = '"%s"' % hashlib.sha1(f'{ride.pk}:{signature}'.encode()).hexdigest()
+
+    manifest = cache.get(_manifest_key(ride))
+    # Manifests cached before sizes were computed up front have no size
+    if not manifest or manifest['etag'] != etag or manifest['size'] is None:
+        manifest = {'etag': etag, 'entries': entries, 'size': archive_size(entries)}
+        cache.set(_manifest_key(ride), manifest, MANIFEST_TIMEOUT)
+    return manifest
+
+
+def stream_zip(manifest, storage, offset=0):
+    """Yield the archive bytes for a manifest, skipping the first ``offset`` bytes.
+
+    Entries are STORED, never deflated: gallery files are nearly all
+    already-compressed images, and stored entries keep the archive size
+    computable up front, so even a first download can be resumed.
+    """
+    sink = _ZipSink()
+    position = 0
+
+    def emit(data):
+        nonlocal position
+        start = position
+        position += len(data)
+        if position <= offset:
+            return b''
+        return data[max(offset - start, 0):]
+
+    with zipfile.ZipFile(sink, 'w') as archive:
+        for entry in manifest['entries']:
+            info = zipfile.ZipInfo(entry['arcname'], date_time=entry['date_time'])
+            info.file_size = entry['size']
+            info.compress_type = zipfile.ZIP_STORED
+
+            with storage.open(entry['name'], 'rb') as source, archive.open(info, 'w') as target:
+                for chunk in iter(lambda: source.read(CHUNK_SIZE), b''):
+                    target.write(chunk)
+                    data = emit(sink.drain())
+                    if data:
+                        yield data
+            data = emit(sink.drain())
+            if data:
+                yield data
+
+    data = emit(sink.drain())
+    if data:
+        yield data
+
+
+def parse_range_start(header):
+    """Return N for a ``bytes=N-`` Range header, or None for anything else."""
+    if not header or not header.startswith('bytes='):
+        return None
+    spec = header[len('bytes='):].strip()
+    if ',' in spec or not spec.endswith('-'):
+        return None
+    try:
+        return int(spec[:-1])
+    except ValueError:
+        return None
@@ -0,0 +1,49 @@
+import base64
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+THUMBNAIL_SIZE = (480, 480)
+PLACEHOLDER_SIZE = (16, 16)
+
+
+def _encode_jpeg(image, quality):
+    buffer = BytesIO()
+    image.save(buffer, format='JPEG', quality=quality, optimize=True)
+    return buffer.getvalue()
+
+
+def build_previews(ride_photo):
+    """Fill in the thumbnail and LQIP placeholder for a RidePhoto.
+
+    Runs before the photo is saved so the work is done once per upload.
+    Unreadable images are left without previews instead of failing the upload.
+    """
+    source = ride_photo.photo
+    try:
+        source.open('rb')
+        source.seek(0)
+        with Image.open(source) as original:
+            image = ImageOps.exif_transpose(original).convert('RGB')
+    except (OSError, ValueError, UnidentifiedImageError):
+        return
+    finally:
+        source.seek(0)
+
+    ride_photo.width, ride_photo.height = image.size
+
+    thumb = image.copy()
+    thumb.thumbnail(THUMBNAIL_SIZE)
+    name = os.path.splitext(os.path.basename(source.name))[0]
+    ride_photo.thumbnail.save(
+        f'{name}_thumb.jpg',
+        ContentFile(_encode_jpeg(thumb, quality=80)),
+        save=False
+    )
+
+    tiny = image.copy()
+    tiny.thumbnail(PLACEHOLDER_SIZE)
+    encoded = base64.b64encode(_encode_jpeg(tiny, quality=40)).decode('ascii')
+    ride_photo.placeholder = f'data:image/jpeg;base64,{encoded}'
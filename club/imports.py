@@ -0,0 +1,147 @@
+import csv
+import io
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+
+from config.conditional import bump_version
+from .models import MemberStats, Profile
+
+MEMBER_FIELDS = ['username', 'email', 'password', 'first_name', 'last_name', 'bio']
+
+# Below this many rows, starting worker processes costs more than it saves
+PARALLEL_THRESHOLD = 8
+
+
+def read_members(data, fmt):
+    """Parse CSV or JSON text into a list of row dicts."""
+    if fmt == 'json':
+        rows = json.loads(data)
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise ValueError('JSON import must be a list of objects.')
+        return rows
+    if fmt == 'csv':
+        return list(csv.DictReader(io.StringIO(data)))
+    raise ValueError(f'Unsupported format: {fmt}')
+
+
+def hash_passwords(passwords, workers=None, progress=None):
+    """Hash raw passwords, spreading the work over a process pool for larger imports.
+
+    Workers are spawned rather than forked, so the pool is safe to start from
+    a threaded web process; each sets Django up from DJANGO_SETTINGS_MODULE.
+    ``progress(count)`` is called as hashes come in.
+    """
+    if len(passwords) < PARALLEL_THRESHOLD or workers == 1:
+        return _collect(map(make_password, passwords), len(passwords), PARALLEL_THRESHOLD, progress)
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(passwords) // (workers * 4))
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=django.setup) as pool:
+        return _collect(pool.map(make_password, passwords, chunksize=chunksize), len(passwords), chunksize, progress)
+
+
+def _collect(results, total, every, progress):
+    hashes = []
+    for hashed in results:
+        hashes.append(hashed)
+        if progress and (len(hashes) % every == 0 or len(hashes) == total):
+            progress(len(hashes))
+    return hashes
+
+
+def _clean(rows):
+    """Validate rows; return (valid rows, errors). Row numbers are 1-based."""
+    valid, errors = [], []
+    usernames = [str(row.get('username') or '').strip() for row in rows]
+    taken = set(User.objects.filter(username__in=usernames).values_list('username', flat=True))
+    seen = set()
+
+    for number, row in enumerate(rows, start=1):
+        member = {field: str(row.get(field) or '').strip() for field in MEMBER_FIELDS}
+        username = member['username']
+        error = None
+        if not username or not member['password']:
+            error = 'Username and password are required.'
+        elif username in taken:
+            error = f'Username "{username}" already exists.'
+        elif username in seen:
+            error = f'Username "{username}" appears more than once in the file.'
+        elif member['email']:
+            try:
+                validate_email(member['email'])
+            except ValidationError:
+                error = f'Invalid email "{member["email"]}".'
+
+        if error:
+            errors.append({'row': number, 'username': username, 'error': error})
+            continue
+        seen.add(username)
+        member['row'] = number
+        valid.append(member)
+    return valid, errors
+
+
+def _insert(batch):
+    """Insert one batch of members with their profiles and empty stats rows."""
+    users = User.objects.bulk_create([
+        User(
+            username=member['username'],
+            email=member['email'],
+            password=member['password'],
+            first_name=member['first_name'],
+            last_name=member['last_name'],
+        )
+        for member in batch
+    ])
+    Profile.objects.bulk_create([
+        Profile(user=user, bio=member['bio']) for user, member in zip(users, batch)
+    ])
+    MemberStats.objects.bulk_create([MemberStats(user=user) for user in users])
+
+
+def import_members(rows, workers=None, batch_size=200, progress=None):
+    """Create users and profiles in bulk.
+
+    Invalid rows are reported and skipped. Everything is written in one
+    transaction; a batch that hits a database error is retried row by row
+    so a single bad row cannot abort the rest. ``progress`` is passed on to
+    ``hash_passwords()``.
+
+    Returns ``{'created': [usernames], 'errors': [{'row', 'username', 'error'}]}``.
+    """
+    members, errors = _clean(rows)
+    hashes = hash_passwords([member['password'] for member in members], workers=workers, progress=progress)
+    for member, hashed in zip(members, hashes):
+        member['password'] = hashed
+
+    created = []
+    with transaction.atomic():
+        for start in range(0, len(members), batch_size):
+            batch = members[start:start + batch_size]
+            try:
+                with transaction.atomic():
+                    _insert(batch)
+                created.extend(member['username'] for member in batch)
+                continue
+            except IntegrityError:
+                pass
+            for member in batch:
+                try:
+                    with transaction.atomic():
+                        _insert([member])
+                    created.append(member['username'])
+                except IntegrityError as exc:
+                    errors.append({'row': member['row'], 'username': member['username'], 'error': str(exc)})
+
+    bump_version(User, Profile, MemberStats)
+    errors.sort(key=lambda error: error['row'])
+    return {'created': created, 'errors': errors}
@@ -0,0 +1,194 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connections, transaction
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
+
+from config.conditional import bump_version
+from .imports import import_members
+from .models import (
+    ArchivedRide, ArchivedRideComment, ArchivedRidePhoto, MemberDeletionJob, MemberImportJob, Poll, Profile, Ride,
+    RideComment, RidePhoto, Vote, VoteRollup
+)
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+PROFILE_MEDIA_FIELDS = ['avatar', 'bike_photo_1', 'bike_photo_2', 'bike_photo_3']
+
+# One worker: jobs queue up behind each other instead of competing for SQLite's write lock
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='club-jobs')
+
+
+def enqueue_member_deletion(job):
+    """Start the job once the surrounding transaction commits.
+
+    Set CLUB_JOBS_EAGER = True to run jobs inline (handy for tests and scripts).
+    """
+    if getattr(settings, 'CLUB_JOBS_EAGER', False):
+        transaction.on_commit(lambda: run_member_deletion(job.pk))
+    else:
+        transaction.on_commit(lambda: _executor.submit(_run_in_thread, run_member_deletion, job.pk))
+
+
+def enqueue_member_import(job, rows):
+    """Start the import once the surrounding transaction commits; see ``enqueue_member_deletion()``."""
+    if getattr(settings, 'CLUB_JOBS_EAGER', False):
+        transaction.on_commit(lambda: run_member_import(job.pk, rows))
+    else:
+        transaction.on_commit(lambda: _executor.submit(_run_in_thread, run_member_import, job.pk, rows))
+
+
+def _run_in_thread(run, *args):
+    try:
+        run(*args)
+    finally:
+        connections.close_all()
+
+
+def _delete_in_batches(queryset, batch_size):
+    """DELETE matching rows in pk batches, one short transaction per batch.
+
+    Uses a raw delete: no cascade collection and no signals, so callers must
+    only pass models whose dependents are handled separately.
+    """
+    model = queryset.model
+    total = 0
+    while True:
+        with transaction.atomic(using=queryset.db):
+            ids = list(queryset.order_by().values_list('pk', flat=True)[:batch_size])
+            if not ids:
+                return total
+            total += model._base_manager.filter(pk__in=ids)._raw_delete(queryset.db)
+
+
+def _update_in_batches(queryset, batch_size, **values):
+    """UPDATE matching rows in pk batches; values must make rows stop matching."""
+    model = queryset.model
+    total = 0
+    while True:
+        with transaction.atomic(using=queryset.db):
+            ids = list(queryset.order_by().values_list('pk', flat=True)[:batch_size])
+            if not ids:
+                return total
+            total += model._base_manager.filter(pk__in=ids).update(**values)
+
+
+def _forget_voter(member_id, batch_size):
+    """Drop a member from compacted voter lists (club.compaction), a batch of rollups at a time."""
+    table = VoteRollup._meta.db_table
+    # json_each walks the lists inside SQLite; only rollups that hold the member reach Python
+    holding = VoteRollup.objects.filter(pk__in=RawSQL(
+        f'SELECT {table}.choice_id FROM {table}, json_each({table}.voter_ids) WHERE json_each.value = %s',
+        [member_id],
+    ))
+    total = 0
+    while True:
+        with transaction.atomic():
+            rollups = list(holding.order_by('pk')[:batch_size])
+            if not rollups:
+                return total
+            for rollup in rollups:
+                rollup.voter_ids = [pk for pk in rollup.voter_ids if pk != member_id]
+                rollup.vote_count = len(rollup.voter_ids)
+            VoteRollup.objects.bulk_update(rollups, ['voter_ids', 'vote_count'])
+            total += len(rollups)
+
+
+def _profile_media(member_id):
+    profile = Profile.objects.filter(user_id=member_id).first()
+    if profile is None:
+        return []
+    files = [getattr(profile, name) for name in PROFILE_MEDIA_FIELDS]
+    return [(f.storage, f.name) for f in files if f]
+
+
+def run_member_deletion(job_id, batch_size=BATCH_SIZE):
+    """Delete a member's dependents in bounded batches, then the member and their media."""
+    job = MemberDeletionJob.objects.get(pk=job_id)
+    if job.status == MemberDeletionJob.STATUS_DONE:
+        return job
+    job.status = MemberDeletionJob.STATUS_RUNNING
+    job.started_at = timezone.now()
+    job.error = ''
+    job.save(update_fields=['status', 'started_at', 'error'])
+
+    member_id = job.member_id
+    steps = [
+        ('votes', lambda: _delete_in_batches(Vote.objects.filter(user_id=member_id), batch_size)),
+        ('voter_lists', lambda: _forget_voter(member_id, batch_size)),
+        ('comments', lambda: _delete_in_batches(RideComment.objects.filter(user_id=member_id), batch_size)),
+        ('ride_memberships', lambda: _delete_in_batches(
+            Ride.riders.through.objects.filter(user_id=member_id), batch_size)),
+        ('rides_unlinked', lambda: _update_in_batches(
+            Ride.objects.filter(created_by_id=member_id), batch_size, created_by=None)),
+        ('photos_unlinked', lambda: _update_in_batches(
+            RidePhoto.objects.filter(uploaded_by_id=member_id), batch_size, uploaded_by=None)),
+        ('polls_unlinked', lambda: _update_in_batches(
+            Poll.objects.filter(created_by_id=member_id), batch_size, created_by=None)),
+        # The same links in the archive tier (club.archive)
+        ('archived_comments', lambda: _delete_in_batches(
+            ArchivedRideComment.objects.filter(user_id=member_id), batch_size)),
+        ('archived_ride_memberships', lambda: _delete_in_batches(
+            ArchivedRide.riders.through.objects.filter(user_id=member_id), batch_size)),
+        ('archived_rides_unlinked', lambda: _update_in_batches(
+            ArchivedRide.objects.filter(created_by_id=member_id), batch_size, created_by=None)),
+        ('archived_photos_unlinked', lambda: _update_in_batches(
+            ArchivedRidePhoto.objects.filter(uploaded_by_id=member_id), batch_size, uploaded_by=None)),
+    ]
+    try:
+        for name, step in steps:
+            job.progress[name] = step()
+            job.save(update_fields=['progress'])
+
+        # Only a handful of rows are left (profile, stats, auth links); let the ORM cascade them
+        media = _profile_media(member_id)
+        with transaction.atomic():
+            User.objects.filter(pk=member_id).delete()
+        for storage, name in media:
+            storage.delete(name)
+        job.progress['media_files'] = len(media)
+        job.status = MemberDeletionJob.STATUS_DONE
+    except Exception as exc:
+        logger.exception("Member deletion job %s failed", job.pk)
+        job.status = MemberDeletionJob.STATUS_FAILED
+        job.error = str(exc)
+    # The batched steps bypass model signals
+    bump_version(
+        Vote, VoteRollup, RideComment, Ride.riders.through, Ride, RidePhoto, Poll,
+        ArchivedRideComment, ArchivedRide.riders.through, ArchivedRide, ArchivedRidePhoto
+    )
+    job.finished_at = timezone.now()
+    job.save(update_fields=['progress', 'status', 'error', 'finished_at'])
+    return job
+
+
+def run_member_import(job_id, rows, workers=None):
+    """Import ``rows`` (see ``club.imports.import_members()``), hashing passwords on a process pool."""
+    job = MemberImportJob.objects.get(pk=job_id)
+    if job.status != MemberImportJob.STATUS_PENDING:
+        # The rows only ever lived in memory; a job that was interrupted cannot be resumed
+        return job
+    job.status = MemberImportJob.STATUS_RUNNING
+    job.started_at = timezone.now()
+    job.save(update_fields=['status', 'started_at'])
+
+    def hashed(count):
+        job.progress['hashed'] = count
+        job.save(update_fields=['progress'])
+
+    try:
+        report = import_members(rows, workers=workers, progress=hashed)
+        job.progress['created'] = len(report['created'])
+        job.report = report
+        job.status = MemberImportJob.STATUS_DONE
+    except Exception as exc:
+        logger.exception("Member import job %s failed", job.pk)
+        job.status = MemberImportJob.STATUS_FAILED
+        job.error = str(exc)
+    job.finished_at = timezone.now()
+    job.save(update_fields=['progress', 'report', 'status', 'error', 'finished_at'])
+    return job
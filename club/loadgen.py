@@ -0,0 +1,315 @@
+"""
+Asyncio load generator for ride-day traffic.
+
+Each virtual member replays a scripted journey against a running server:
+log in, load the home page, fetch the upcoming ride from the API, join it,
+open the ride page and post a comment, then vote in the active poll. The
+HTTP/1.1 client is built on ``asyncio`` streams so the tool needs nothing
+beyond the standard library. ``run_load()`` returns a ``Recorder`` holding
+per-step latencies, errors and throttled requests.
+
+Every virtual member connects from this machine's IP, so the per-IP
+buckets in ``config.throttling`` fill up long before the server does.
+Start the target with ``THROTTLE_ENABLED=False`` unless the limits are
+what is being measured; 429s are counted apart from errors either way.
+"""
+import asyncio
+import json
+import random
+import time
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode, urlsplit
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+BUCKETS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+
+class Response:
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def json(self):
+        return json.loads(self.body or b'null')
+
+
+class HTTPError(Exception):
+    pass
+
+
+class Session:
+    """One member's keep-alive connection and cookie jar."""
+
+    def __init__(self, base_url, timeout=30):
+        parts = urlsplit(base_url)
+        self.base_url = base_url.rstrip('/')
+        self.host = parts.hostname
+        self.ssl = parts.scheme == 'https'
+        self.port = parts.port or (443 if self.ssl else 80)
+        self.timeout = timeout
+        self.cookies = {}
+        self.reader = self.writer = None
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+            self.reader = self.writer = None
+
+    async def _connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port, ssl=self.ssl or None)
+
+    def csrf_headers(self):
+        return {'X-CSRFToken': self.cookies.get('csrftoken', ''), 'Referer': self.base_url + '/'}
+
+    async def request(self, method, path, form=None, json_body=None, headers=None):
+        body = b''
+        extra = dict(headers or {})
+        if form is not None:
+            body = urlencode(form).encode()
+            extra['Content-Type'] = 'application/x-www-form-urlencoded'
+        elif json_body is not None:
+            body = json.dumps(json_body).encode()
+            extra['Content-Type'] = 'application/json'
+        if self.cookies:
+            extra['Cookie'] = '; '.join(f'{name}={value}' for name, value in self.cookies.items())
+
+        lines = [f'{method} {path} HTTP/1.1', f'Host: {self.host}:{self.port}', f'Content-Length: {len(body)}']
+        lines.extend(f'{name}: {value}' for name, value in extra.items())
+        payload = ('\r\n'.join(lines) + '\r\n\r\n').encode() + body
+
+        # A reused keep-alive connection may have been closed by the server; retry once on a fresh one
+        for attempt in (1, 2):
+            if self.writer is None:
+                await self._connect()
+            try:
+                self.writer.write(payload)
+                await self.writer.drain()
+                return await asyncio.wait_for(self._read_response(), self.timeout)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                await self.close()
+                if attempt == 2:
+                    raise
+            except asyncio.TimeoutError:
+                # The late response would desynchronise the connection
+                await self.close()
+                raise
+
+    async def _read_response(self):
+        status_line = await self.reader.readuntil(b'\r\n')
+        try:
+            status = int(status_line.split()[1])
+        except (IndexError, ValueError):
+            raise HTTPError(f'Malformed status line: {status_line!r}')
+
+        headers = {}
+        while True:
+            line = await self.reader.readuntil(b'\r\n')
+            if line == b'\r\n':
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            name, value = name.strip().lower(), value.strip()
+            if name == 'set-cookie':
+                cookie = SimpleCookie()
+                cookie.load(value)
+                for key, morsel in cookie.items():
+                    self.cookies[key] = morsel.value
+            headers[name] = value
+
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await self.reader.readuntil(b'\r\n')).split(b';')[0], 16)
+                if size == 0:
+                    await self.reader.readuntil(b'\r\n')
+                    break
+                chunks.append(await self.reader.readexactly(size))
+                await self.reader.readexactly(2)
+            body = b''.join(chunks)
+        elif 'content-length' in headers:
+            body = await self.reader.readexactly(int(headers['content-length']))
+        else:
+            body = await self.reader.read()
+            await self.close()
+
+        if headers.get('connection', '').lower() == 'close':
+            await self.close()
+        return Response(status, headers, body)
+
+
+THROTTLED = 429
+
+
+class Recorder:
+    """Latencies (ms), status codes, errors and throttled requests per journey step."""
+
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+        self.throttled = {}
+        self.statuses = {}
+        self.journeys = 0
+        self.started = time.perf_counter()
+        self.finished = None
+
+    def add(self, step, elapsed_ms, status=None, error=None):
+        self.latencies.setdefault(step, []).append(elapsed_ms)
+        if status is not None:
+            self.statuses.setdefault(step, {}).setdefault(status, 0)
+            self.statuses[step][status] += 1
+        if status == THROTTLED:
+            self.throttled[step] = self.throttled.get(step, 0) + 1
+        if error is not None:
+            self.errors.setdefault(step, {}).setdefault(error, 0)
+            self.errors[step][error] += 1
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    def histogram(self, latencies):
+        counts = [0] * (len(BUCKETS) + 1)
+        for value in latencies:
+            for index, bound in enumerate(BUCKETS):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            else:
+                counts[-1] += 1
+        return counts
+
+    def summary(self):
+        """Per-step and overall numbers as a JSON-ready dict."""
+        steps = {}
+        everything = []
+        total_errors = 0
+        for step, latencies in self.latencies.items():
+            errors = sum(self.errors.get(step, {}).values())
+            total_errors += errors
+            everything.extend(latencies)
+            throttled = self.throttled.get(step, 0)
+            steps[step] = {
+                'requests': len(latencies),
+                'errors': errors,
+                'error_rate': round(errors / len(latencies), 4),
+                'throttled': throttled,
+                'throttle_rate': round(throttled / len(latencies), 4),
+                'statuses': {str(code): count for code, count in sorted(self.statuses.get(step, {}).items())},
+                **_percentiles(latencies),
+                'histogram': self.histogram(latencies),
+            }
+        return {
+            'elapsed_s': round(self.elapsed, 2),
+            'journeys': self.journeys,
+            'requests': len(everything),
+            'errors': total_errors,
+            'error_rate': round(total_errors / len(everything), 4) if everything else 0,
+            'throttled': sum(self.throttled.values()),
+            'throughput_rps': round(len(everything) / self.elapsed, 1) if self.elapsed else 0,
+            **_percentiles(everything),
+            'histogram_buckets_ms': BUCKETS,
+            'histogram': self.histogram(everything),
+            'steps': steps,
+            'error_kinds': self.errors,
+        }
+
+
+def _percentiles(latencies):
+    if not latencies:
+        return {'p50_ms': None, 'p90_ms': None, 'p99_ms': None, 'max_ms': None}
+    ordered = sorted(latencies)
+
+    def pick(pct):
+        return round(ordered[max(1, round(pct / 100 * len(ordered))) - 1], 1)
+    return {'p50_ms': pick(50), 'p90_ms': pick(90), 'p99_ms': pick(99), 'max_ms': round(ordered[-1], 1)}
+
+
+async def _step(recorder, name, call, expect):
+    """Time one request; 429s count as throttled, other non-``expect`` statuses and exceptions as errors."""
+    started = time.perf_counter()
+    try:
+        response = await call
+    except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, HTTPError) as exc:
+        recorder.add(name, (time.perf_counter() - started) * 1000, error=type(exc).__name__)
+        return None
+    elapsed = (time.perf_counter() - started) * 1000
+    error = None if response.status in expect or response.status == THROTTLED else f'HTTP {response.status}'
+    recorder.add(name, elapsed, status=response.status, error=error)
+    return response if response.status in expect else None
+
+
+async def journey(base_url, username, password, recorder, rng, think):
+    """One member's ride-morning visit."""
+    session = Session(base_url)
+
+    async def pause():
+        if think:
+            await asyncio.sleep(rng.uniform(0, think))
+
+    try:
+        if not await _step(recorder, 'login_page', session.request('GET', '/club/login/'), {200}):
+            return
+        login = await _step(recorder, 'login', session.request(
+            'POST', '/club/login/',
+            form={'username': username, 'password': password,
+                  'csrfmiddlewaretoken': session.cookies.get('csrftoken', '')},
+            headers={'Referer': base_url + '/club/login/'},
+        ), {302})
+        if not login or 'sessionid' not in session.cookies:
+            return
+        await pause()
+        await _step(recorder, 'home', session.request('GET', '/club/'), {200})
+        await pause()
+
+        upcoming = await _step(recorder, 'api_upcoming', session.request('GET', '/club/api/rides/upcoming/'), {200})
+        if upcoming:
+            ride_id = upcoming.json()['id']
+            await _step(recorder, 'api_join', session.request(
+                'POST', f'/club/api/rides/{ride_id}/join/', json_body={}, headers=session.csrf_headers()
+            ), {200})
+            await pause()
+            await _step(recorder, 'upcoming_page', session.request('GET', '/club/upcoming-ride/'), {200})
+            await pause()
+            await _step(recorder, 'comment', session.request(
+                'POST', '/club/upcoming-ride/',
+                form={'comment_message': rng.choice(['On my way!', 'Fuel stop first?', 'See you there.']),
+                      'csrfmiddlewaretoken': session.cookies.get('csrftoken', '')},
+                headers={'Referer': base_url + '/club/upcoming-ride/'},
+            ), {302})
+            await pause()
+
+        poll = await _step(recorder, 'api_active_poll', session.request('GET', '/club/api/polls/active/'), {200, 404})
+        if poll and poll.status == 200:
+            choices = poll.json().get('choices') or []
+            if choices:
+                await _step(recorder, 'api_vote', session.request(
+                    'POST', f'/club/api/polls/{poll.json()["id"]}/vote/',
+                    json_body={'choice_id': rng.choice(choices)['id']}, headers=session.csrf_headers(),
+                ), {200, 201})
+        recorder.journeys += 1
+    finally:
+        await session.close()
+
+
+async def _member_loop(index, base_url, usernames, password, recorder, deadline, journeys, seed, think):
+    rng = random.Random(seed + index)
+    done = 0
+    while (journeys is None or done < journeys) and (deadline is None or time.perf_counter() < deadline):
+        await journey(base_url, rng.choice(usernames), password, recorder, rng, think)
+        done += 1
+
+
+async def run_load(base_url, usernames, password, concurrency=10, duration=None, journeys=None, seed=1, think=0.0):
+    """Run ``concurrency`` members until ``duration`` seconds pass or each finishes ``journeys`` visits."""
+    recorder = Recorder()
+    deadline = time.perf_counter() + duration if duration else None
+    await asyncio.gather(*[
+        _member_loop(index, base_url, usernames, password, recorder, deadline, journeys, seed, think)
+        for index in range(concurrency)
+    ])
+    recorder.finished = time.perf_counter()
+    return recorder
@@ -0,0 +1,47 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from club.archive import BATCH_SIZE, archive_rides
+from club.models import Ride
+
+
+class Command(BaseCommand):
+    help = (
+        "Move completed rides older than a cutoff, with their riders, comments and photo metadata, "
+        "into the archive tables. Pages and the API keep showing them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than-days',
+            type=int,
+            default=365,
+            help="Archive completed rides that started more than N days ago (default: 365).",
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help=f"Rides moved per transaction (default: {BATCH_SIZE}).",
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Only count the rides that would be archived.",
+        )
+
+    def handle(self, *args, **options):
+        if options['older_than_days'] < 0 or options['batch_size'] < 1:
+            raise CommandError("--older-than-days must be >= 0 and --batch-size >= 1.")
+        before = timezone.now() - timedelta(days=options['older_than_days'])
+        if options['dry_run']:
+            count = Ride.objects.filter(completed=True, date_time__lt=before).count()
+            self.stdout.write(f"{count} completed rides started before {before:%Y-%m-%d} would be archived.")
+            return
+        moved = archive_rides(before, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {moved['rides']} rides ({moved['riders']} rider links, {moved['comments']} comments, "
+            f"{moved['photos']} photos) started before {before:%Y-%m-%d}."
+        ))
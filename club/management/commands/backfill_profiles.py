@@ -0,0 +1,16 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+
+from club.models import Profile
+from config.conditional import bump_version
+
+
+class Command(BaseCommand):
+    help = "Create missing profiles for users created before profiles were automatic."
+
+    def handle(self, *args, **options):
+        missing = User.objects.filter(profile__isnull=True).values_list('pk', flat=True)
+        profiles = [Profile(user_id=pk) for pk in missing.iterator()]
+        Profile.objects.bulk_create(profiles, batch_size=500, ignore_conflicts=True)
+        bump_version(Profile)
+        self.stdout.write(self.style.SUCCESS(f"Created {len(profiles)} profile(s)."))
@@ -0,0 +1,225 @@
+import asyncio
+import importlib
+import json
+import logging
+import re
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+from django.test import Client, override_settings
+from django.urls import clear_url_caches
+
+from club.models import Poll, Ride
+from club.synthetic import clear, generate
+
+from .bench_endpoints import percentile
+
+HOST = 'testserver'
+# Masked CSRF tokens differ on every render
+CSRF_TOKEN = re.compile(rb'(name="csrfmiddlewaretoken" value=")[^"]+')
+
+
+def _mount():
+    """Re-import the URLconfs so ``ASYNC_READ_VIEWS`` takes effect in this process."""
+    import club.urls
+    import config.urls
+    importlib.reload(club.urls)
+    importlib.reload(config.urls)
+    clear_url_caches()
+
+
+async def _get(app, path, cookie):
+    """One GET through the ASGI application; returns ``(status, body)``."""
+    path, _, query = path.partition('?')
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': query.encode(),
+        'root_path': '',
+        'headers': [(b'host', HOST.encode()), (b'cookie', cookie.encode()), (b'accept', b'application/json')],
+        'client': ('127.0.0.1', 0),
+        'server': (HOST, 80),
+    }
+    sent = False
+    disconnect = asyncio.Event()
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        # Django listens for a disconnect while the view runs; the client never leaves early
+        await disconnect.wait()
+        return {'type': 'http.disconnect'}
+
+    status, chunks = None, []
+
+    async def send(message):
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+        elif message['type'] == 'http.response.body':
+            chunks.append(message.get('body', b''))
+
+    await app(scope, receive, send)
+    disconnect.set()
+    return status, b''.join(chunks)
+
+
+async def _drive(app, path, cookie, concurrency, total):
+    """Send ``total`` requests from ``concurrency`` clients; return latencies (ms) and wall time (s)."""
+    latencies = []
+    remaining = total
+
+    async def client():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            status, _ = await _get(app, path, cookie)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if status != 200:
+                raise CommandError(f"{path} returned {status}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*[client() for _ in range(concurrency)])
+    return latencies, time.perf_counter() - started
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the sync and async read views (ASYNC_READ_VIEWS) through the ASGI handler in one "
+        "process: same event loop, same thread pool. Checks both return the same bodies, then reports "
+        "throughput and latency at each concurrency level."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency',
+            default='1,8,32',
+            help="Comma-separated numbers of concurrent clients (default: 1,8,32).",
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=200,
+            help="Requests per route at each concurrency level (default: 200).",
+        )
+        parser.add_argument(
+            '--members',
+            type=int,
+            default=0,
+            help="Generate N synthetic members (removed afterwards) instead of using the existing data.",
+        )
+        parser.add_argument(
+            '--output',
+            default=None,
+            help="Also write the results as JSON to this file.",
+        )
+
+    def handle(self, *args, **options):
+        levels = [int(level) for level in options['concurrency'].split(',') if level.strip()]
+        # Expected 4xx responses would otherwise log a warning per request
+        logging.getLogger('django.request').setLevel(logging.ERROR)
+        prefix = 'bench-async-'
+        if options['members']:
+            generate(options['members'], prefix=prefix)
+        try:
+            with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, HOST]):
+                results = self._run(levels, options['requests'])
+        finally:
+            if options['members']:
+                clear(prefix)
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(results, output, indent=2)
+                output.write('\n')
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+
+    def _routes(self):
+        ride = Ride.objects.filter(completed=True).annotate(
+            photo_total=Count('photos')
+        ).order_by('-photo_total', 'pk').first()
+        poll = Poll.objects.annotate(vote_total=Count('choices__votes')).order_by('-vote_total', 'pk').first()
+        if ride is None or poll is None:
+            raise CommandError("Needs a completed ride and a poll: run seed_club_data or pass --members.")
+        return {
+            'upcoming': '/club/api/rides/upcoming/',
+            'poll_detail': f'/club/api/polls/{poll.pk}/',
+            'profiles': '/club/api/profiles/',
+            'rides_list': '/club/rides/',
+            'ride_detail': f'/club/rides/{ride.pk}/',
+        }
+
+    def _cookie(self):
+        user = User.objects.filter(is_superuser=True).order_by('pk').first() or User.objects.order_by('pk').first()
+        client = Client()
+        client.force_login(user)
+        return '; '.join(f'{name}={morsel.value}' for name, morsel in client.cookies.items())
+
+    def _run(self, levels, total):
+        routes = self._routes()
+        cookie = self._cookie()
+        results = {'requests': total, 'routes': routes, 'modes': {}}
+
+        # Fetch every route in both modes back to back first, so timesince() output can't drift
+        bodies = {}
+        for mode in ('sync', 'async'):
+            with override_settings(ASYNC_READ_VIEWS=mode == 'async'):
+                _mount()
+                bodies[mode] = asyncio.run(self._fetch_all(get_asgi_application(), routes, cookie))
+        for name in routes:
+            if bodies['sync'][name] != bodies['async'][name]:
+                raise CommandError(f"{name}: async response differs from the sync view\n{self._first_difference(bodies, name)}")
+
+        self.stdout.write(f"{'route':<14}{'mode':<7}{'clients':>8}{'req/s':>9}{'p50 ms':>9}{'p99 ms':>9}")
+        for mode in ('sync', 'async'):
+            with override_settings(ASYNC_READ_VIEWS=mode == 'async'):
+                _mount()
+                # A fresh handler builds the middleware chain for this mode
+                app = get_asgi_application()
+                results['modes'][mode] = asyncio.run(self._measure(app, mode, routes, cookie, levels, total))
+        _mount()
+        return results
+
+    async def _fetch_all(self, app, routes, cookie):
+        bodies = {}
+        for name, path in routes.items():
+            status, body = await _get(app, path, cookie)
+            bodies[name] = (status, CSRF_TOKEN.sub(rb'\1', body))
+        return bodies
+
+    def _first_difference(self, bodies, name):
+        (sync_status, sync_body), (async_status, async_body) = bodies['sync'][name], bodies['async'][name]
+        if sync_status != async_status:
+            return f"status {sync_status} != {async_status}"
+        for sync_line, async_line in zip(sync_body.splitlines(), async_body.splitlines()):
+            if sync_line != async_line:
+                return f"sync:  {sync_line.strip()[:200]!r}\nasync: {async_line.strip()[:200]!r}"
+        return f"length {len(sync_body)} != {len(async_body)}"
+
+    async def _measure(self, app, mode, routes, cookie, levels, total):
+        results = {}
+        for name, path in routes.items():
+            results[name] = {}
+            for level in levels:
+                latencies, elapsed = await _drive(app, path, cookie, level, total)
+                row = results[name][str(level)] = {
+                    'rps': round(len(latencies) / elapsed, 1),
+                    'p50_ms': round(percentile(latencies, 50), 2),
+                    'p99_ms': round(percentile(latencies, 99), 2),
+                }
+                self.stdout.write(
+                    f"{name:<14}{mode:<7}{level:>8}{row['rps']:>9.1f}{row['p50_ms']:>9.1f}{row['p99_ms']:>9.1f}"
+                )
+        return results
@@ -0,0 +1,156 @@
+import json
+import logging
+import platform
+import subprocess
+import time
+from datetime import datetime, timezone as dt_timezone
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from club.models import MemberStats
+from club.routes import iter_routes, route_url, sample_targets
+from club.synthetic import MODELS, generate
+from config.conditional import bump_version
+
+
+class Rollback(Exception):
+    pass
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, round(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class Command(BaseCommand):
+    help = "Benchmark every club and api route against synthetic data at several scales; write JSON results."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scales',
+            default='100,1000',
+            help="Comma-separated member counts to generate (default: 100,1000).",
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=20,
+            help="Timed requests per route after one warm-up request (default: 20).",
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help="Dataset seed (default: 42).",
+        )
+        parser.add_argument(
+            '--output',
+            default='endpoint_bench.json',
+            help="Where to write the JSON results (default: endpoint_bench.json).",
+        )
+
+    def handle(self, *args, **options):
+        scales = [int(scale) for scale in options['scales'].split(',') if scale.strip()]
+        results = {'meta': self._meta(options), 'scales': {}}
+        # Expected 4xx responses would otherwise log a warning per request
+        logging.getLogger('django.request').setLevel(logging.ERROR)
+
+        for scale in scales:
+            self.stdout.write(f"Scale {scale}:")
+            try:
+                with transaction.atomic():
+                    counts = generate(scale, seed=options['seed'], prefix='bench-')
+                    results['scales'][str(scale)] = {
+                        'rows': counts,
+                        'routes': self._run(options['requests']),
+                    }
+                    raise Rollback
+            except Rollback:
+                pass
+            finally:
+                # The rollback leaves the cache alone: version stamps, cached payloads and
+                # ETags built from the bench rows would otherwise outlive them
+                bump_version(*MODELS, MemberStats)
+
+        with open(options['output'], 'w') as output:
+            json.dump(results, output, indent=2, sort_keys=True)
+            output.write('\n')
+        self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+
+    def _meta(self, options):
+        try:
+            commit = subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+                capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+        return {
+            'commit': commit,
+            'date': datetime.now(dt_timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'requests': options['requests'],
+            'seed': options['seed'],
+        }
+
+    def _run(self, repeat):
+        admin = User.objects.create_superuser('bench-admin', 'bench-admin@example.com', 'bench')
+        host = settings.ALLOWED_HOSTS[0].lstrip('.') if settings.ALLOWED_HOSTS else 'localhost'
+        client = Client(HTTP_HOST='localhost' if host == '*' else host)
+        client.force_login(admin)
+        targets = sample_targets('bench-', admin)
+
+        routes = {}
+        for route in iter_routes():
+            if route.skip:
+                routes[route.key] = {'skipped': route.skip}
+                continue
+            result = routes[route.key] = self._measure(client, route_url(route, targets), repeat)
+            self.stdout.write(
+                f"  {route.key:<36}{result['status']:>5}{result['p50_ms']:>9.1f} ms"
+                f"{result['queries_warm']:>5} queries"
+            )
+        return routes
+
+    def _fetch(self, client, url):
+        response = client.get(url)
+        if response.streaming:
+            body = b''.join(response.streaming_content)
+        else:
+            body = response.content
+        return response, len(body)
+
+    def _measure(self, client, url, repeat):
+        with CaptureQueriesContext(connection) as cold:
+            response, size = self._fetch(client, url)
+
+        timings = []
+        warm_queries = 0
+        for _ in range(max(1, repeat)):
+            with CaptureQueriesContext(connection) as warm:
+                started = time.perf_counter()
+                self._fetch(client, url)
+                timings.append((time.perf_counter() - started) * 1000)
+            warm_queries = len(warm)
+
+        return {
+            'url': url,
+            'status': response.status_code,
+            'bytes': size,
+            'queries_cold': len(cold),
+            'queries_warm': warm_queries,
+            'p50_ms': round(percentile(timings, 50), 2),
+            'p90_ms': round(percentile(timings, 90), 2),
+            'p99_ms': round(percentile(timings, 99), 2),
+            'mean_ms': round(sum(timings) / len(timings), 2),
+        }
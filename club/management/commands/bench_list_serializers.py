@@ -0,0 +1,135 @@
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.models import Item
+from api.serializers import ItemSerializer, ItemValuesSerializer
+from club.models import Poll, PollChoice, Profile, Ride, Vote
+from club.serializers import (
+    PollListSerializer, PollListValuesSerializer, ProfileSerializer,
+    ProfileValuesSerializer, RideListSerializer, RideListValuesSerializer
+)
+from config.renderers import FastJSONRenderer, fast_json_backend
+
+ENDPOINTS = [
+    ('profiles', lambda: Profile.objects.select_related('user', 'user__stats'),
+     ProfileSerializer, ProfileValuesSerializer),
+    ('rides', lambda: Ride.objects.all(), RideListSerializer, RideListValuesSerializer),
+    ('polls', lambda: Poll.objects.all(), PollListSerializer, PollListValuesSerializer),
+    ('items', lambda: Item.objects.all(), ItemSerializer, ItemValuesSerializer),
+]
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Compare DRF serializers with the values() fast path (and the JSON renderers) on list endpoints."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            metavar='N',
+            help="Add N temporary rows per model before measuring (rolled back afterwards).",
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help="Timing runs per path; the best run is reported (default: 5).",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                if options['seed']:
+                    self._seed(options['seed'])
+                self._run(options['repeat'])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def _seed(self, count):
+        rng = random.Random(42)
+        now = timezone.now()
+        stamp = int(time.time())
+        users = User.objects.bulk_create([
+            User(username=f'bench-{stamp}-{i}', email=f'bench{i}@example.com') for i in range(count)
+        ])
+        Profile.objects.bulk_create(
+            [Profile(user=user, bio='Bench rider') for user in users], ignore_conflicts=True
+        )
+        rides = Ride.objects.bulk_create([
+            Ride(
+                title=f'Bench ride {i}', description='Loop', start_point='A', end_point='B',
+                date_time=now + timedelta(days=rng.randint(-400, 60)), created_by=rng.choice(users),
+            )
+            for i in range(count)
+        ])
+        Ride.riders.through.objects.bulk_create([
+            Ride.riders.through(ride=ride, user=user)
+            for ride in rides for user in rng.sample(users, min(5, len(users)))
+        ])
+        polls = Poll.objects.bulk_create([Poll(title=f'Bench poll {i}') for i in range(count)])
+        choices = PollChoice.objects.bulk_create([
+            PollChoice(poll=poll, text=f'Choice {j}') for poll in polls for j in range(3)
+        ])
+        Vote.objects.bulk_create([
+            Vote(user=user, choice=rng.choice(choices)) for user in users
+        ], ignore_conflicts=True)
+        Item.objects.bulk_create([Item(name=f'Bench item {i}') for i in range(count)])
+
+    def _best(self, repeat, func):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, result
+
+    def _run(self, repeat):
+        request = Request(APIRequestFactory().get('/'))
+        context = {'request': request}
+        stock, fast_renderer = JSONRenderer(), FastJSONRenderer()
+        self.stdout.write(f"json ms: DRF JSONRenderer; fast json: {fast_json_backend()}")
+
+        header = f"{'endpoint':<10}{'rows':>7}{'drf ms':>10}{'queries':>9}{'fast ms':>10}{'queries':>9}{'speedup':>9}{'json ms':>10}{'fast json':>11}"
+        self.stdout.write(header)
+        for name, queryset, serializer_class, fast_class in ENDPOINTS:
+            def slow():
+                return serializer_class(queryset(), many=True, context=context).data
+
+            def fast():
+                serializer = fast_class(context=context)
+                return serializer.serialize(serializer.prepare(queryset()))
+
+            with CaptureQueriesContext(connection) as slow_queries:
+                slow_data = slow()
+            with CaptureQueriesContext(connection) as fast_queries:
+                fast_data = fast()
+            if [dict(row) for row in slow_data] != fast_data:
+                raise CommandError(f"{name}: fast path output differs from {serializer_class.__name__}")
+
+            slow_time, _ = self._best(repeat, slow)
+            fast_time, _ = self._best(repeat, fast)
+            json_time, _ = self._best(repeat, lambda: stock.render(fast_data))
+            fast_json_time, _ = self._best(repeat, lambda: fast_renderer.render(fast_data))
+            speedup = slow_time / fast_time if fast_time else float('inf')
+            self.stdout.write(
+                f"{name:<10}{len(fast_data):>7}{slow_time * 1000:>10.1f}{len(slow_queries):>9}"
+                f"{fast_time * 1000:>10.1f}{len(fast_queries):>9}{speedup:>8.1f}x"
+                f"{json_time * 1000:>10.1f}{fast_json_time * 1000:>11.1f}"
+            )
@@ -0,0 +1,124 @@
+import json
+import os
+import tempfile
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections, transaction
+
+from .bench_endpoints import percentile
+
+# (label, ENGINE, OPTIONS)
+CONFIGS = [
+    ('stock', 'django.db.backends.sqlite3', {}),
+    ('pragmas, deferred', 'config.sqlite', {'transaction_mode': 'DEFERRED'}),
+    ('pragmas, immediate', 'config.sqlite', {}),
+    ('pragmas, immediate, queue', 'config.sqlite', {'write_queue': True}),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Run concurrent read-then-write transactions (the shape of a join, vote or comment) against "
+        "a scratch SQLite file with the stock backend and config.sqlite settings; report throughput, "
+        "latency and 'database is locked' failures."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=16,
+            help="Concurrent writers (default: 16).",
+        )
+        parser.add_argument(
+            '--transactions',
+            type=int,
+            default=50,
+            help="Transactions per writer (default: 50).",
+        )
+        parser.add_argument(
+            '--hold-ms',
+            type=float,
+            default=1.0,
+            help="Work done between the read and the write inside each transaction (default: 1 ms).",
+        )
+        parser.add_argument(
+            '--output',
+            default=None,
+            help="Also write the results as JSON to this file.",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'backend':<28}{'tx/s':>9}{'ok':>7}{'locked':>8}{'p50 ms':>9}{'p99 ms':>9}")
+        results = {}
+        for label, engine, extra in CONFIGS:
+            with tempfile.TemporaryDirectory(prefix='sqlite-bench-') as directory:
+                row = results[label] = self._run(engine, extra, os.path.join(directory, 'bench.sqlite3'), options)
+            self.stdout.write(
+                f"{label:<28}{row['tps']:>9.1f}{row['ok']:>7}{row['locked']:>8}"
+                f"{row['p50_ms'] or 0:>9.1f}{row['p99_ms'] or 0:>9.1f}"
+            )
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump({'options': {key: options[key] for key in ('threads', 'transactions', 'hold_ms')},
+                           'results': results}, output, indent=2)
+                output.write('\n')
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+
+    def _run(self, engine, extra, path, options):
+        alias = 'sqlite-contention-bench'
+        connections.settings[alias] = {
+            **connections['default'].settings_dict,
+            'ENGINE': engine, 'NAME': path, 'OPTIONS': extra, 'CONN_MAX_AGE': 0,
+        }
+        try:
+            with connections[alias].cursor() as cursor:
+                cursor.execute('CREATE TABLE bench (id INTEGER PRIMARY KEY, k INTEGER, v TEXT)')
+                cursor.execute('CREATE INDEX bench_k ON bench (k)')
+            connections[alias].close()
+            # Forget this thread's wrapper; the next configuration reuses the alias
+            del connections[alias]
+
+            latencies, locked = [], []
+            hold = options['hold_ms'] / 1000
+            start = threading.Barrier(options['threads'] + 1)
+
+            def writer(number):
+                start.wait()
+                try:
+                    for index in range(options['transactions']):
+                        started = time.perf_counter()
+                        try:
+                            with transaction.atomic(using=alias):
+                                cursor = connections[alias].cursor()
+                                cursor.execute('SELECT COUNT(*) FROM bench WHERE k = %s', [number])
+                                time.sleep(hold)
+                                cursor.execute('INSERT INTO bench (k, v) VALUES (%s, %s)', [number, str(index)])
+                        except OperationalError:
+                            locked.append(1)
+                        else:
+                            latencies.append((time.perf_counter() - started) * 1000)
+                finally:
+                    connections[alias].close()
+
+            threads = [threading.Thread(target=writer, args=(number,)) for number in range(options['threads'])]
+            for thread in threads:
+                thread.start()
+            start.wait()
+            started = time.perf_counter()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+        finally:
+            del connections.settings[alias]
+
+        return {
+            'tps': round(len(latencies) / elapsed, 1),
+            'ok': len(latencies),
+            'locked': len(locked),
+            'p50_ms': round(percentile(latencies, 50), 2) if latencies else None,
+            'p99_ms': round(percentile(latencies, 99), 2) if latencies else None,
+        }
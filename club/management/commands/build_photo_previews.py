@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from club.images import build_previews
+from club.models import RidePhoto
+
+
+class Command(BaseCommand):
+    help = "Generate thumbnails and placeholders for ride photos uploaded before previews existed."
+
+    def handle(self, *args, **options):
+        built = 0
+        missing = RidePhoto.objects.filter(Q(thumbnail__isnull=True) | Q(thumbnail=''))
+        for photo in missing.iterator(chunk_size=200):
+            build_previews(photo)
+            if photo.thumbnail:
+                photo.save(update_fields=['thumbnail', 'placeholder', 'width', 'height'])
+                built += 1
+        self.stdout.write(self.style.SUCCESS(f"Built previews for {built} photo(s)."))
@@ -0,0 +1,113 @@
+import os
+import shutil
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models
+
+
+def referenced_media_names():
+    """Return the set of every file name stored in a FileField/ImageField column."""
+    names = set()
+    for model in apps.get_models():
+        for field in model._meta.concrete_fields:
+            if not isinstance(field, models.FileField):
+                continue
+            values = (
+                model._default_manager
+                .exclude(**{f'{field.attname}__isnull': True})
+                .exclude(**{field.attname: ''})
+                .values_list(field.attname, flat=True)
+            )
+            names.update(values.iterator(chunk_size=2000))
+    return names
+
+
+def iter_media_files(root, skip=()):
+    """Yield DirEntry objects for every regular file below root."""
+    pending = [root]
+    while pending:
+        directory = pending.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if os.path.abspath(entry.path) not in skip:
+                        pending.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry
+
+
+class Command(BaseCommand):
+    help = "Delete or quarantine files in MEDIA_ROOT that no model field references."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Only report what would be removed.",
+        )
+        parser.add_argument(
+            '--grace-hours',
+            type=float,
+            default=24,
+            help="Leave files modified within this many hours alone (default: 24).",
+        )
+        parser.add_argument(
+            '--quarantine',
+            metavar='DIR',
+            help="Move orphans into DIR (keeping their relative paths) instead of deleting them.",
+        )
+
+    def handle(self, *args, **options):
+        media_root = os.path.abspath(settings.MEDIA_ROOT)
+        if not os.path.isdir(media_root):
+            raise CommandError(f"MEDIA_ROOT {media_root} does not exist.")
+
+        dry_run = options['dry_run']
+        quarantine = options['quarantine']
+        skip = set()
+        if quarantine:
+            quarantine = os.path.abspath(quarantine)
+            skip.add(quarantine)
+        cutoff = time.time() - options['grace_hours'] * 3600
+
+        started = time.monotonic()
+        referenced = referenced_media_names()
+        indexed = time.monotonic()
+
+        scanned = orphaned = too_new = 0
+        reclaimed = 0
+        for entry in iter_media_files(media_root, skip):
+            scanned += 1
+            name = os.path.relpath(entry.path, media_root).replace(os.sep, '/')
+            if name in referenced:
+                continue
+            stat = entry.stat(follow_symlinks=False)
+            if stat.st_mtime > cutoff:
+                too_new += 1
+                continue
+
+            orphaned += 1
+            reclaimed += stat.st_size
+            if dry_run:
+                self.stdout.write(f"Would remove {name}")
+            elif quarantine:
+                target = os.path.join(quarantine, name)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.move(entry.path, target)
+            else:
+                os.remove(entry.path)
+
+        elapsed = time.monotonic() - started
+        rate = scanned / elapsed if elapsed else scanned
+        action = 'would be removed' if dry_run else ('quarantined' if quarantine else 'deleted')
+        self.stdout.write(
+            f"Indexed {len(referenced)} referenced file(s) in {indexed - started:.2f}s; "
+            f"scanned {scanned} file(s) in {elapsed:.2f}s ({rate:.0f} files/s)."
+        )
+        self.stdout.write(f"Skipped {too_new} unreferenced file(s) newer than the grace period.")
+        self.stdout.write(self.style.SUCCESS(
+            f"{orphaned} orphaned file(s) {action}, {reclaimed / (1024 * 1024):.1f} MB."
+        ))
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from club.compaction import BATCH_SIZE, compact_poll_votes, compactable_polls
+from club.models import Vote
+
+
+class Command(BaseCommand):
+    help = (
+        "Roll the votes of polls past closes_at into per-choice counts and voter lists, then delete "
+        "the Vote rows in batches. Poll responses stay the same; compacted polls take no new votes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help=f"Vote rows deleted per transaction (default: {BATCH_SIZE}).",
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Only count the polls and votes that would be compacted.",
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be >= 1.")
+        polls = compactable_polls()
+        if options['dry_run']:
+            votes = Vote.objects.filter(choice__poll__in=polls).count()
+            self.stdout.write(f"{polls.count()} closed polls with {votes} votes would be compacted.")
+            return
+        done = compact_poll_votes(polls, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Compacted {done['polls']} polls, deleted {done['votes']} vote rows."))
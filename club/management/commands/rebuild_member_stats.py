@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from club.stats import rebuild_member_stats
+
+
+class Command(BaseCommand):
+    help = "Recompute every member's activity statistics from scratch."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help="Rows per INSERT (default: 500).",
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        count = rebuild_member_stats(batch_size=options['batch_size'])
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt stats for {count} member(s) in {elapsed:.2f}s."
+        ))
@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from config.replicas import replicas, replicate
+
+
+class Command(BaseCommand):
+    help = (
+        "Stand-in for replication when trying the read replicas locally: copy the primary SQLite "
+        "database into every SQLITE_REPLICAS file, once or every --interval seconds."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=1.0,
+            help="Seconds between copies, i.e. the replica lag (default: 1).",
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help="Copy once and exit.",
+        )
+
+    def handle(self, *args, **options):
+        if not replicas():
+            raise CommandError("No replicas configured: set SQLITE_REPLICAS, e.g. SQLITE_REPLICAS=db-replica.sqlite3.")
+        while True:
+            started = time.perf_counter()
+            copied = replicate()
+            self.stdout.write(f"Copied the primary to {', '.join(copied)} in {(time.perf_counter() - started) * 1000:.1f} ms")
+            if options['once']:
+                return
+            time.sleep(options['interval'])
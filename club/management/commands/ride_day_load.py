@@ -0,0 +1,124 @@
+import asyncio
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from club.loadgen import BUCKETS, run_load
+from club.synthetic import PASSWORD
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay ride-morning member journeys (login, home, upcoming ride, join, comment, vote) "
+        "against a running server and report throughput, latency and errors. "
+        "Writes comments, joins and votes: point it at a development or staging copy. "
+        "Every member shares this machine's IP, so start the target with THROTTLE_ENABLED=False "
+        "unless the rate limits are under test; 429s are reported apart from errors."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--url',
+            default='http://127.0.0.1:8000',
+            help="Base URL of the server under test (default: http://127.0.0.1:8000).",
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=10,
+            help="Members active at the same time (default: 10).",
+        )
+        parser.add_argument(
+            '--duration',
+            type=float,
+            default=None,
+            help="Run for this many seconds.",
+        )
+        parser.add_argument(
+            '--journeys',
+            type=int,
+            default=None,
+            help="Journeys per concurrent member (default: 5 when --duration is not given).",
+        )
+        parser.add_argument(
+            '--members',
+            type=int,
+            default=100,
+            help="Log in as the first N members named <prefix>N (default: 100).",
+        )
+        parser.add_argument(
+            '--prefix',
+            default='synthetic-',
+            help="Username prefix, as created by seed_club_data (default: synthetic-).",
+        )
+        parser.add_argument(
+            '--password',
+            default=PASSWORD,
+            help="Password shared by the members (default: the seed_club_data password).",
+        )
+        parser.add_argument(
+            '--think',
+            type=float,
+            default=0.0,
+            help="Maximum random pause in seconds between a member's steps (default: 0).",
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=1,
+            help="Seed for member and choice selection (default: 1).",
+        )
+        parser.add_argument(
+            '--json',
+            metavar='PATH',
+            help="Also write the full summary as JSON.",
+        )
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1 or options['members'] < 1:
+            raise CommandError("--concurrency and --members must be at least 1.")
+        journeys = options['journeys']
+        if journeys is None and options['duration'] is None:
+            journeys = 5
+        usernames = [f"{options['prefix']}{i}" for i in range(options['members'])]
+
+        recorder = asyncio.run(run_load(
+            options['url'], usernames, options['password'],
+            concurrency=options['concurrency'], duration=options['duration'], journeys=journeys,
+            seed=options['seed'], think=options['think'],
+        ))
+        summary = recorder.summary()
+        self._report(summary)
+        if options['json']:
+            with open(options['json'], 'w') as output:
+                json.dump(summary, output, indent=2, sort_keys=True)
+                output.write('\n')
+
+    def _report(self, summary):
+        self.stdout.write(
+            f"{summary['journeys']} journeys, {summary['requests']} requests in {summary['elapsed_s']}s: "
+            f"{summary['throughput_rps']} req/s, {summary['error_rate'] * 100:.1f}% errors, "
+            f"{summary['throttled']} throttled"
+        )
+        self.stdout.write(f"{'step':<18}{'reqs':>7}{'err%':>7}{'429%':>7}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}")
+        for step, row in summary['steps'].items():
+            self.stdout.write(
+                f"{step:<18}{row['requests']:>7}{row['error_rate'] * 100:>6.1f}%{row['throttle_rate'] * 100:>6.1f}%"
+                f"{row['p50_ms']:>9}{row['p90_ms']:>9}{row['p99_ms']:>9}{row['max_ms']:>9}"
+            )
+
+        self.stdout.write("\nLatency histogram (all requests):")
+        counts = summary['histogram']
+        widest = max(counts) or 1
+        labels = [f"<= {bound} ms" for bound in BUCKETS] + [f"> {BUCKETS[-1]} ms"]
+        for label, count in zip(labels, counts):
+            self.stdout.write(f"{label:>12} {count:>7} {'#' * round(40 * count / widest)}")
+
+        for step, kinds in summary['error_kinds'].items():
+            for kind, count in kinds.items():
+                self.stdout.write(self.style.WARNING(f"{step}: {kind} x{count}"))
+        if summary['throttled']:
+            self.stdout.write(self.style.WARNING(
+                f"{summary['throttled']} requests were throttled (429). Every member shares this machine's IP; "
+                "start the target with THROTTLE_ENABLED=False to measure the server rather than the rate limits."
+            ))
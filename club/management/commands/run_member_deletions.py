@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from club.jobs import run_member_deletion
+from club.models import MemberDeletionJob
+
+
+class Command(BaseCommand):
+    help = "Run member deletion jobs left pending or interrupted (e.g. by a server restart)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--retry-failed',
+            action='store_true',
+            help="Also retry jobs that failed.",
+        )
+
+    def handle(self, *args, **options):
+        statuses = [MemberDeletionJob.STATUS_PENDING, MemberDeletionJob.STATUS_RUNNING]
+        if options['retry_failed']:
+            statuses.append(MemberDeletionJob.STATUS_FAILED)
+        for job_id in MemberDeletionJob.objects.filter(status__in=statuses).values_list('pk', flat=True):
+            job = run_member_deletion(job_id)
+            self.stdout.write(f"Job {job.pk} ({job.username}): {job.status} {job.progress}")
@@ -0,0 +1,109 @@
+from functools import partial
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.contrib.auth import BACKEND_SESSION_KEY
+from django.contrib.auth.middleware import auser, get_user
+from django.contrib.auth.models import User
+from django.utils.functional import SimpleLazyObject
+
+from .models import Profile
+
+
+def get_profile(request):
+    """Return the current member's profile, memoized on the request.
+
+    Anonymous users get None. A missing profile (which the post_save hook
+    should prevent) is created on the spot as a fallback.
+    """
+    if not hasattr(request, '_cached_profile'):
+        profile = None
+        user = request.user
+        if user.is_authenticated:
+            try:
+                profile = user.profile
+            except Profile.DoesNotExist:
+                profile, created = Profile.objects.get_or_create(user=user)
+        request._cached_profile = profile
+    return request._cached_profile
+
+
+async def aget_profile(request):
+    """Async twin of ``get_profile()`` for async views."""
+    if not hasattr(request, '_cached_profile'):
+        profile = None
+        user = await request.auser()
+        if user.is_authenticated:
+            try:
+                # Joined in by ProfileModelBackend.aget_user(); reading it uncached would be a sync query
+                profile = user.profile if User.profile.is_cached(user) else None
+            except Profile.DoesNotExist:
+                pass
+            if profile is None:
+                profile, created = await Profile.objects.aget_or_create(user=user)
+        request._cached_profile = profile
+    return request._cached_profile
+
+
+class ProfileMiddleware:
+    """Attach a lazy ``request.profile``; must come after AuthenticationMiddleware.
+
+    Async views should use ``await aget_profile(request)`` instead.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        request.profile = SimpleLazyObject(lambda: get_profile(request))
+        # Under ASGI this hands back get_response's coroutine for the handler to await
+        return self.get_response(request)
+
+
+# Sessions naming a backend that has left AUTHENTICATION_BACKENDS, and the one that replaces it
+RETIRED_BACKENDS = {
+    'django.contrib.auth.backends.ModelBackend': 'club.backends.ProfileModelBackend',
+}
+
+
+def _restamp(request):
+    backend = request.session.get(BACKEND_SESSION_KEY)
+    if backend in RETIRED_BACKENDS:
+        request.session[BACKEND_SESSION_KEY] = RETIRED_BACKENDS[backend]
+    return request
+
+
+async def _arestamp(request):
+    backend = await request.session.aget(BACKEND_SESSION_KEY)
+    if backend in RETIRED_BACKENDS:
+        await request.session.aset(BACKEND_SESSION_KEY, RETIRED_BACKENDS[backend])
+    return request
+
+
+async def _auser(request):
+    return await auser(await _arestamp(request))
+
+
+class RetiredBackendMiddleware:
+    """Move sessions from a retired auth backend to its replacement.
+
+    Must come right after AuthenticationMiddleware, which would otherwise
+    log such sessions out; the session is only read once the user is.
+    Listing the old backend instead would run its ``authenticate()`` (and
+    the password hasher) a second time on every failed login.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        request.user = SimpleLazyObject(lambda: get_user(_restamp(request)))
+        request.auser = partial(_auser, request)
+        return self.get_response(request)
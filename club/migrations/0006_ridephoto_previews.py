@@ -0,0 +1,51 @@
+# Generated by Django 5.1.15 on 2026-10-19 04:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("club", "0005_ride_what3words_url"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ridephoto",
+            name="height",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="ridephoto",
+            name="placeholder",
+            field=models.TextField(
+                blank=True,
+                editable=False,
+                help_text="Tiny inline preview (data URI) shown while the thumbnail loads",
+            ),
+        ),
+        migrations.AddField(
+            model_name="ridephoto",
+            name="thumbnail",
+            field=models.ImageField(
+                blank=True,
+                editable=False,
+                help_text="Gallery thumbnail generated at upload",
+                null=True,
+                upload_to="ride_photos/thumbs/",
+            ),
+        ),
+        migrations.AddField(
+            model_name="ridephoto",
+            name="width",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="ridephoto",
+            index=models.Index(
+                fields=["ride", "order", "-created_at"], name="club_photo_gallery_idx"
+            ),
+        ),
+    ]
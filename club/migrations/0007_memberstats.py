@@ -0,0 +1,46 @@
+# Generated by Django 5.1.15 on 2026-10-19 04:32
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("club", "0006_ridephoto_previews"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MemberStats",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="stats",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("rides_attended", models.PositiveIntegerField(default=0)),
+                ("rides_led", models.PositiveIntegerField(default=0)),
+                ("photos_uploaded", models.PositiveIntegerField(default=0)),
+                ("comments_posted", models.PositiveIntegerField(default=0)),
+                (
+                    "last_ride_date",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="Date of the most recent completed ride attended",
+                        null=True,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "member stats",
+            },
+        ),
+    ]
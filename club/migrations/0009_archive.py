@@ -0,0 +1,135 @@
+# Generated by Django 5.1.15 on 2026-10-19 05:19
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("club", "0008_memberdeletionjob"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedRide",
+            fields=[
+                ("id", models.IntegerField(primary_key=True, serialize=False)),
+                ("title", models.CharField(max_length=200)),
+                ("description", models.TextField()),
+                ("date_time", models.DateTimeField()),
+                (
+                    "header_photo",
+                    models.ImageField(blank=True, null=True, upload_to="ride_headers/"),
+                ),
+                ("calimoto_url", models.URLField(blank=True, max_length=500)),
+                ("relive_url", models.URLField(blank=True, max_length=500)),
+                ("what3words_url", models.URLField(blank=True, max_length=500)),
+                ("start_point", models.CharField(max_length=300)),
+                ("end_point", models.CharField(max_length=300)),
+                (
+                    "gpx_file",
+                    models.FileField(blank=True, null=True, upload_to="gpx_files/"),
+                ),
+                ("completed", models.BooleanField(default=True)),
+                ("created_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField()),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="archived_created_rides",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "riders",
+                    models.ManyToManyField(
+                        blank=True,
+                        related_name="archived_rides",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-date_time"],
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedRideComment",
+            fields=[
+                ("id", models.IntegerField(primary_key=True, serialize=False)),
+                ("message", models.TextField()),
+                ("created_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField()),
+                (
+                    "ride",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="comments",
+                        to="club.archivedride",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_ride_comments",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["created_at"],
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedRidePhoto",
+            fields=[
+                ("id", models.IntegerField(primary_key=True, serialize=False)),
+                ("photo", models.ImageField(upload_to="ride_photos/")),
+                ("width", models.PositiveIntegerField(blank=True, null=True)),
+                ("height", models.PositiveIntegerField(blank=True, null=True)),
+                (
+                    "thumbnail",
+                    models.ImageField(
+                        blank=True, null=True, upload_to="ride_photos/thumbs/"
+                    ),
+                ),
+                ("placeholder", models.TextField(blank=True)),
+                ("caption", models.TextField(blank=True)),
+                ("order", models.IntegerField(default=0)),
+                ("created_at", models.DateTimeField()),
+                (
+                    "ride",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="photos",
+                        to="club.archivedride",
+                    ),
+                ),
+                (
+                    "uploaded_by",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="archived_photos",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["order", "-created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["ride", "order", "-created_at"],
+                        name="club_archived_gallery_idx",
+                    )
+                ],
+            },
+        ),
+    ]
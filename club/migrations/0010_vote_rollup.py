@@ -0,0 +1,47 @@
+# Generated by Django 5.1.15 on 2026-10-19 05:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("club", "0009_archive"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="VoteRollup",
+            fields=[
+                (
+                    "choice",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="rollup",
+                        serialize=False,
+                        to="club.pollchoice",
+                    ),
+                ),
+                ("vote_count", models.PositiveIntegerField(default=0)),
+                (
+                    "voter_ids",
+                    models.JSONField(
+                        default=list,
+                        help_text="User ids of the voters, newest vote first (the order Vote rows are listed in)",
+                    ),
+                ),
+                ("compacted_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="poll",
+            name="votes_compacted",
+            field=models.BooleanField(
+                default=False,
+                editable=False,
+                help_text="Votes were rolled up into VoteRollup rows (see club.compaction)",
+            ),
+        ),
+    ]
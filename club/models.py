@@ -1,6 +1,7 @@
 from django.db import models
 from django.contrib.auth.models import User
 from django.core.validators import FileExtensionValidator
+from django.utils import timezone
 
 
 class Profile(models.Model):
@@ -124,6 +125,20 @@ class RidePhoto(models.Model):
         upload_to='ride_photos/',
         help_text="Ride photo"
     )
+    width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    thumbnail = models.ImageField(
+        upload_to='ride_photos/thumbs/',
+        blank=True,
+        null=True,
+        editable=False,
+        help_text="Gallery thumbnail generated at upload"
+    )
+    placeholder = models.TextField(
+        blank=True,
+        editable=False,
+        help_text="Tiny inline preview (data URI) shown while the thumbnail loads"
+    )
     uploaded_by = models.ForeignKey(
         User,
         on_delete=models.SET_NULL,
@@ -144,8 +159,18 @@ class RidePhoto(models.Model):
     def __str__(self):
         return f"Photo for {self.ride.title} by {self.uploaded_by.username if self.uploaded_by else 'Unknown'}"
 
+    def save(self, *args, **kwargs):
+        # Build the thumbnail and placeholder once, when the photo is first stored
+        if self.photo and not self.thumbnail:
+            from .images import build_previews
+            build_previews(self)
+        super().save(*args, **kwargs)
+
     class Meta:
         ordering = ['order', '-created_at']
+        indexes = [
+            models.Index(fields=['ride', 'order', '-created_at'], name='club_photo_gallery_idx'),
+        ]
 
 
 class RideComment(models.Model):
@@ -186,6 +211,11 @@ class Poll(models.Model):
     is_active = models.BooleanField(default=True, help_text="Is this poll currently active")
     created_at = models.DateTimeField(auto_now_add=True)
     closes_at = models.DateTimeField(null=True, blank=True, help_text="When voting closes")
+    votes_compacted = models.BooleanField(
+        default=False,
+        editable=False,
+        help_text="Votes were rolled up into VoteRollup rows (see club.compaction)"
+    )
 
     def __str__(self):
         return self.title
@@ -196,8 +226,17 @@ class Poll(models.Model):
     @property
     def total_votes(self):
         """Get total number of votes across all choices."""
+        if self.votes_compacted:
+            return VoteRollup.objects.filter(choice__poll=self).aggregate(
+                total=models.Sum('vote_count')
+            )['total'] or 0
         return Vote.objects.filter(choice__poll=self).count()
 
+    @property
+    def voting_closed(self):
+        """True once ``closes_at`` has passed or the votes were compacted."""
+        return self.votes_compacted or (self.closes_at is not None and self.closes_at <= timezone.now())
+
 
 class PollChoice(models.Model):
     """Individual choice option in a poll."""
@@ -214,6 +253,8 @@ class PollChoice(models.Model):
     @property
     def vote_count(self):
         """Count votes for this choice."""
+        if self.poll.votes_compacted:
+            return self.rollup.vote_count if hasattr(self, 'rollup') else 0
         return self.votes.count()
 
 
@@ -230,3 +271,211 @@ class Vote(models.Model):
         # Ensure one vote per user per poll
         unique_together = ['user', 'choice']
         ordering = ['-voted_at']
+
+
+class VoteRollup(models.Model):
+    """The votes of one choice in a closed poll, compacted by ``manage.py compact_poll_votes``."""
+    choice = models.OneToOneField(
+        PollChoice,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='rollup'
+    )
+    vote_count = models.PositiveIntegerField(default=0)
+    voter_ids = models.JSONField(
+        default=list,
+        help_text="User ids of the voters, newest vote first (the order Vote rows are listed in)"
+    )
+    compacted_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.vote_count} votes for {self.choice.text}"
+
+
+class MemberStats(models.Model):
+    """Precomputed activity counters for a member, kept current by signals."""
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats'
+    )
+    rides_attended = models.PositiveIntegerField(default=0)
+    rides_led = models.PositiveIntegerField(default=0)
+    photos_uploaded = models.PositiveIntegerField(default=0)
+    comments_posted = models.PositiveIntegerField(default=0)
+    last_ride_date = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Date of the most recent completed ride attended"
+    )
+
+    def __str__(self):
+        return f"Stats for {self.user.username}"
+
+    class Meta:
+        verbose_name_plural = 'member stats'
+
+
+class MemberDeletionJob(models.Model):
+    """Background removal of a member and everything that depends on them."""
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    member_id = models.IntegerField(help_text="ID of the user being deleted")
+    username = models.CharField(max_length=150)
+    requested_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='+',
+        help_text="Staff member who requested the deletion"
+    )
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING, db_index=True)
+    progress = models.JSONField(default=dict, blank=True, help_text="Rows removed or unlinked per step")
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Delete {self.username} ({self.status})"
+
+    class Meta:
+        ordering = ['-created_at']
+
+
+class MemberImportJob(models.Model):
+    """Background bulk import of members from an uploaded file (see club.imports).
+
+    The parsed rows, raw passwords included, are handed to the job in memory
+    and never stored; only counts and the final report are kept.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    filename = models.CharField(max_length=255)
+    requested_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='+',
+        help_text="Staff member who uploaded the file"
+    )
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING, db_index=True)
+    rows = models.PositiveIntegerField(default=0, help_text="Rows in the uploaded file")
+    progress = models.JSONField(default=dict, blank=True, help_text="Passwords hashed and members created so far")
+    report = models.JSONField(default=dict, blank=True, help_text="Created usernames and skipped rows")
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Import {self.filename} ({self.status})"
+
+    class Meta:
+        ordering = ['-created_at']
+
+
+# Archive tier (see club.archive): completed rides moved out of the hot tables.
+# Rows keep their original ids, so ride URLs and photo ids stay valid.
+
+class ArchivedRide(models.Model):
+    """A completed ride moved out of the ``Ride`` table by ``manage.py archive_rides``."""
+    is_archived = True
+
+    id = models.IntegerField(primary_key=True)
+    title = models.CharField(max_length=200)
+    description = models.TextField()
+    date_time = models.DateTimeField()
+    header_photo = models.ImageField(upload_to='ride_headers/', blank=True, null=True)
+    calimoto_url = models.URLField(blank=True, max_length=500)
+    relive_url = models.URLField(blank=True, max_length=500)
+    what3words_url = models.URLField(blank=True, max_length=500)
+    start_point = models.CharField(max_length=300)
+    end_point = models.CharField(max_length=300)
+    gpx_file = models.FileField(upload_to='gpx_files/', blank=True, null=True)
+    riders = models.ManyToManyField(User, related_name='archived_rides', blank=True)
+    created_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='archived_created_rides'
+    )
+    completed = models.BooleanField(default=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.title} - {self.date_time.strftime('%Y-%m-%d')} (archived)"
+
+    class Meta:
+        ordering = ['-date_time']
+
+    @property
+    def is_upcoming(self):
+        from django.utils import timezone
+        return self.date_time > timezone.now()
+
+
+class ArchivedRidePhoto(models.Model):
+    """Photo metadata of an archived ride; the files stay where they were."""
+    id = models.IntegerField(primary_key=True)
+    ride = models.ForeignKey(ArchivedRide, on_delete=models.CASCADE, related_name='photos')
+    photo = models.ImageField(upload_to='ride_photos/')
+    width = models.PositiveIntegerField(null=True, blank=True)
+    height = models.PositiveIntegerField(null=True, blank=True)
+    thumbnail = models.ImageField(upload_to='ride_photos/thumbs/', blank=True, null=True)
+    placeholder = models.TextField(blank=True)
+    uploaded_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='archived_photos'
+    )
+    caption = models.TextField(blank=True)
+    order = models.IntegerField(default=0)
+    created_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"Archived photo {self.pk} for ride {self.ride_id}"
+
+    class Meta:
+        ordering = ['order', '-created_at']
+        indexes = [
+            models.Index(fields=['ride', 'order', '-created_at'], name='club_archived_gallery_idx'),
+        ]
+
+
+class ArchivedRideComment(models.Model):
+    """A comment on an archived ride."""
+    id = models.IntegerField(primary_key=True)
+    ride = models.ForeignKey(ArchivedRide, on_delete=models.CASCADE, related_name='comments')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_ride_comments')
+    message = models.TextField()
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.user.username} on archived ride {self.ride_id}"
+
+    class Meta:
+        ordering = ['created_at']
@@ -0,0 +1,95 @@
+"""
+Route discovery shared by ``bench_endpoints`` and the query budget tests.
+
+``iter_routes()`` walks ``club.urls`` and ``api.urls`` (including the DRF
+routers) and yields every named route once, keyed ``<app>:<name>``.
+``sample_targets()`` picks objects from the current data to fill URL
+kwargs and ``route_url()`` builds the concrete path.
+"""
+from dataclasses import dataclass
+
+from django.contrib.auth.models import User
+from django.db.models import Count
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+
+from api.models import Item
+
+from .models import MemberDeletionJob, MemberImportJob, Poll, Profile, Ride
+
+URLCONFS = [('/club/', 'club.urls'), ('/api/', 'api.urls')]
+
+# GET on these changes the client's state
+UNSAFE_GET = {'logout': "GET logs the client out"}
+# Plain views that only accept POST
+POST_ONLY = {'api_batch': "no GET handler"}
+
+
+@dataclass
+class Route:
+    key: str
+    name: str
+    prefix: str
+    urlconf: str
+    kwargs: list
+    skip: str = None
+
+
+def _walk(patterns):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _walk(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            kwargs = list(pattern.pattern.regex.groupindex)
+            if 'format' not in kwargs:
+                yield pattern.name, kwargs, pattern.callback
+
+
+def iter_routes():
+    """Yield a ``Route`` for every named route; ``skip`` says why one can't be fetched with GET."""
+    seen = set()
+    for prefix, urlconf in URLCONFS:
+        for name, kwargs, callback in _walk(get_resolver(urlconf).url_patterns):
+            key = f'{urlconf.split(".")[0]}:{name}'
+            if key in seen:
+                continue
+            seen.add(key)
+            skip = UNSAFE_GET.get(name) or POST_ONLY.get(name)
+            actions = getattr(callback, 'actions', None)
+            if skip is None and actions is not None and 'get' not in actions:
+                skip = "no GET handler"
+            yield Route(key, name, prefix, urlconf, kwargs, skip)
+
+
+def sample_targets(member_prefix, requested_by):
+    """Pick objects for URL kwargs: the ride with most photos, a member, finished jobs, etc."""
+    ride = Ride.objects.annotate(photo_total=Count('photos')).order_by('-photo_total', 'pk').first()
+    member = User.objects.filter(username__startswith=member_prefix).order_by('pk').first()
+    job = MemberDeletionJob.objects.create(
+        member_id=member.pk, username=member.username, requested_by=requested_by,
+        status=MemberDeletionJob.STATUS_DONE,
+    )
+    import_job = MemberImportJob.objects.create(
+        filename='riders.csv', requested_by=requested_by, status=MemberImportJob.STATUS_DONE,
+    )
+    return {
+        'profile': Profile.objects.filter(user=member).values_list('pk', flat=True).first(),
+        'ride': ride.pk,
+        'poll': Poll.objects.order_by('pk').values_list('pk', flat=True).first(),
+        'item': Item.objects.order_by('pk').values_list('pk', flat=True).first(),
+        'user_id': member.pk,
+        'job_id': job.pk,
+        'import_job_id': import_job.pk,
+    }
+
+
+def route_url(route, targets):
+    values = {}
+    for kwarg in route.kwargs:
+        if kwarg == 'pk':
+            # Router routes are named <basename>-<action>; plain club views with a pk are ride pages
+            values[kwarg] = targets.get(route.name.split('-')[0], targets['ride'])
+        elif kwarg == 'job_id' and route.name == 'member_import_status':
+            values[kwarg] = targets['import_job_id']
+        else:
+            values[kwarg] = targets[kwarg]
+    return route.prefix + reverse(route.name, urlconf=route.urlconf, kwargs=values).lstrip('/')
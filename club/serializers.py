@@ -1,6 +1,38 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
-from .models import Profile, Ride, RidePhoto, Poll, PollChoice, Vote
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from config.fastpath import ValuesSerializer, Column, DateTime, File, Related, Computed, Nested
+from . import compaction
+from .models import Profile, Ride, RidePhoto, Poll, PollChoice, Vote, VoteRollup, MemberStats
+
+
+class SparseFieldsMixin:
+    """Let GET requests trim the output with ``?fields=id,username,...``.
+
+    Only the top-level serializer is trimmed; nested serializers keep their
+    full shape.
+    """
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if request is None or request.method != 'GET' or not self._is_root():
+            return fields
+        params = getattr(request, 'query_params', request.GET)
+        requested = params.get('fields')
+        if requested:
+            wanted = {name.strip() for name in requested.split(',') if name.strip()}
+            for name in list(fields):
+                if name not in wanted:
+                    fields.pop(name)
+        return fields
+    
+    def _is_root(self):
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        return parent is None
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -11,22 +43,54 @@ class UserSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 
-class ProfileSerializer(serializers.ModelSerializer):
+class MemberStatsSerializer(serializers.ModelSerializer):
+    """Serializer for a member's precomputed activity statistics."""
+    class Meta:
+        model = MemberStats
+        fields = ['rides_attended', 'rides_led', 'photos_uploaded', 'comments_posted', 'last_ride_date']
+        read_only_fields = fields
+
+
+class LeaderboardSerializer(MemberStatsSerializer):
+    """Member statistics with the member's identity, for leaderboards."""
+    username = serializers.CharField(source='user.username', read_only=True)
+    
+    class Meta(MemberStatsSerializer.Meta):
+        fields = ['user_id', 'username'] + MemberStatsSerializer.Meta.fields
+        read_only_fields = fields
+
+
+class ProfileSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for Profile model."""
     user = UserSerializer(read_only=True)
     username = serializers.CharField(source='user.username', read_only=True)
+    stats = MemberStatsSerializer(source='user.stats', read_only=True, default=None)
     
     class Meta:
         model = Profile
         fields = [
             'id', 'user', 'username', 'avatar', 
             'bike_photo_1', 'bike_photo_2', 'bike_photo_3',
-            'bio', 'created_at', 'updated_at'
+            'bio', 'stats', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
-class RideListSerializer(serializers.ModelSerializer):
+class MemberDirectorySerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """Flat serializer with just what the members grid renders."""
+    username = serializers.CharField(source='user.username', read_only=True)
+    stats = MemberStatsSerializer(source='user.stats', read_only=True, default=None)
+    
+    class Meta:
+        model = Profile
+        fields = [
+            'id', 'user_id', 'username', 'avatar', 'bio',
+            'bike_photo_1', 'bike_photo_2', 'bike_photo_3', 'stats'
+        ]
+        read_only_fields = fields
+
+
+class RideListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Lightweight serializer for listing rides."""
     created_by_username = serializers.CharField(source='created_by.username', read_only=True)
     rider_count = serializers.SerializerMethodField()
@@ -59,7 +123,29 @@ class RidePhotoSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'uploaded_by', 'created_at']
 
 
-class RideDetailSerializer(serializers.ModelSerializer):
+class RideGalleryPhotoSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """Compact serializer for paginated ride galleries."""
+    uploaded_by_username = serializers.CharField(source='uploaded_by.username', read_only=True)
+    thumbnail = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = RidePhoto
+        fields = [
+            'id', 'photo', 'thumbnail', 'width', 'height', 'placeholder',
+            'caption', 'uploaded_by_username', 'order', 'created_at'
+        ]
+        read_only_fields = fields
+    
+    def get_thumbnail(self, obj):
+        # Photos uploaded before previews existed fall back to the original
+        image = obj.thumbnail or obj.photo
+        request = self.context.get('request')
+        if request:
+            return request.build_absolute_uri(image.url)
+        return image.url
+
+
+class RideDetailSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Detailed serializer for individual ride."""
     created_by = UserSerializer(read_only=True)
     riders = UserSerializer(many=True, read_only=True)
@@ -70,7 +156,7 @@ class RideDetailSerializer(serializers.ModelSerializer):
         write_only=True,
         required=False
     )
-    photos = RidePhotoSerializer(many=True, read_only=True)
+    photo_count = serializers.SerializerMethodField()
     is_upcoming = serializers.BooleanField(read_only=True)
     
     class Meta:
@@ -79,10 +165,16 @@ class RideDetailSerializer(serializers.ModelSerializer):
             'id', 'title', 'description', 'date_time',
             'header_photo', 'calimoto_url', 'relive_url',
             'start_point', 'end_point', 'gpx_file',
-            'created_by', 'riders', 'rider_ids', 'photos',
+            'created_by', 'riders', 'rider_ids', 'photo_count',
             'is_upcoming', 'completed', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_by', 'created_at', 'updated_at']
+    
+    def get_photo_count(self, obj):
+        # Use the annotation from RideViewSet when present
+        if hasattr(obj, 'photo_count'):
+            return obj.photo_count
+        return obj.photos.count()
 
 
 class VoterSerializer(serializers.ModelSerializer):
@@ -105,9 +197,35 @@ class VoterSerializer(serializers.ModelSerializer):
         return None
 
 
+def poll_votes(poll, user_id=None):
+    """``(voters by choice id, the user's choice id)`` for a whole poll in one or two queries.
+
+    Voters are listed newest vote first; compacted polls read their rollups
+    (club.compaction) instead of Vote rows.
+    """
+    if poll.votes_compacted:
+        rollups = list(VoteRollup.objects.filter(choice__poll=poll))
+        users = {user.pk: user for user in compaction.voters([pk for rollup in rollups for pk in rollup.voter_ids])}
+        voters_by_choice = {
+            rollup.choice_id: [users[pk] for pk in rollup.voter_ids if pk in users] for rollup in rollups
+        }
+        user_vote = next((rollup.choice_id for rollup in rollups if user_id in rollup.voter_ids), None)
+    else:
+        votes = Vote.objects.filter(choice__poll=poll).select_related('user', 'user__profile')
+        voters_by_choice = {}
+        for vote in votes:
+            voters_by_choice.setdefault(vote.choice_id, []).append(vote.user)
+        user_vote = next((vote.choice_id for vote in votes if vote.user_id == user_id), None)
+    return voters_by_choice, user_vote
+
+
 class PollChoiceSerializer(serializers.ModelSerializer):
-    """Serializer for poll choices."""
-    vote_count = serializers.IntegerField(read_only=True)
+    """Serializer for poll choices.
+
+    ``context['voters_by_choice']`` holds the poll's voters (see ``poll_votes()``),
+    so a whole poll is serialized without a query per choice.
+    """
+    vote_count = serializers.SerializerMethodField()
     voters = serializers.SerializerMethodField()
     percentage = serializers.SerializerMethodField()
     
@@ -116,23 +234,25 @@ class PollChoiceSerializer(serializers.ModelSerializer):
         fields = ['id', 'text', 'description', 'vote_count', 'voters', 'percentage']
         read_only_fields = ['id']
     
+    def _voters(self, obj):
+        return self.context['voters_by_choice'].get(obj.pk, [])
+    
+    def get_vote_count(self, obj):
+        return len(self._voters(obj))
+    
     def get_voters(self, obj):
         """Get list of users who voted for this choice."""
-        votes = Vote.objects.filter(choice=obj).select_related('user', 'user__profile')
-        return VoterSerializer([
-            vote.user for vote in votes
-        ], many=True, context=self.context).data
+        return VoterSerializer(self._voters(obj), many=True, context=self.context).data
     
     def get_percentage(self, obj):
         """Calculate percentage of total votes."""
-        poll = obj.poll
-        total = Vote.objects.filter(choice__poll=poll).count()
+        total = sum(len(voters) for voters in self.context['voters_by_choice'].values())
         if total == 0:
             return 0
-        return round((obj.vote_count / total) * 100, 1)
+        return round((len(self._voters(obj)) / total) * 100, 1)
 
 
-class PollListSerializer(serializers.ModelSerializer):
+class PollListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Lightweight serializer for listing polls."""
     created_by_username = serializers.CharField(source='created_by.username', read_only=True)
     choice_count = serializers.SerializerMethodField()
@@ -150,11 +270,11 @@ class PollListSerializer(serializers.ModelSerializer):
         return obj.choices.count()
 
 
-class PollDetailSerializer(serializers.ModelSerializer):
+class PollDetailSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Detailed serializer for individual poll with choices."""
     created_by = UserSerializer(read_only=True)
-    choices = PollChoiceSerializer(many=True, read_only=True)
-    total_votes = serializers.IntegerField(read_only=True)
+    choices = serializers.SerializerMethodField()
+    total_votes = serializers.SerializerMethodField()
     user_vote = serializers.SerializerMethodField()
     
     class Meta:
@@ -166,17 +286,31 @@ class PollDetailSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_by', 'created_at']
     
+    def validate_closes_at(self, value):
+        """Compacted polls (club.compaction) stay closed: their Vote rows are gone."""
+        if self.instance is not None and self.instance.votes_compacted:
+            if value is None or value > timezone.now():
+                raise serializers.ValidationError('Voting has closed for this poll; it cannot be reopened.')
+        return value
+    
+    def _votes(self, obj):
+        """``poll_votes()`` for obj, loaded once per poll."""
+        if getattr(self, '_votes_poll', None) != obj.pk:
+            request = self.context.get('request')
+            user_id = request.user.pk if request and request.user.is_authenticated else None
+            self._votes_poll, self._votes_data = obj.pk, poll_votes(obj, user_id)
+        return self._votes_data
+    
+    def get_choices(self, obj):
+        context = {**self.context, 'voters_by_choice': self._votes(obj)[0]}
+        return PollChoiceSerializer(obj.choices.all(), many=True, context=context).data
+    
+    def get_total_votes(self, obj):
+        return sum(len(voters) for voters in self._votes(obj)[0].values())
+    
     def get_user_vote(self, obj):
         """Get the current user's vote for this poll if any."""
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            vote = Vote.objects.filter(
-                user=request.user,
-                choice__poll=obj
-            ).first()
-            if vote:
-                return vote.choice.id
-        return None
+        return self._votes(obj)[1]
 
 
 class VoteSerializer(serializers.ModelSerializer):
@@ -209,3 +343,88 @@ class VoteSerializer(serializers.ModelSerializer):
         request = self.context.get('request')
         validated_data['user'] = request.user
         return super().create(validated_data)
+
+
+# Fast list serializers (see config.fastpath); output must match the serializers above
+
+class ProfileValuesSerializer(ValuesSerializer):
+    """values()-based twin of ProfileSerializer."""
+    sparse_fields = True
+    fields = {
+        'id': Column('id'),
+        'user': Nested({
+            'id': Column('user__id'),
+            'username': Column('user__username'),
+            'email': Column('user__email'),
+            'first_name': Column('user__first_name'),
+            'last_name': Column('user__last_name'),
+        }),
+        'username': Column('user__username'),
+        'avatar': File('avatar'),
+        'bike_photo_1': File('bike_photo_1'),
+        'bike_photo_2': File('bike_photo_2'),
+        'bike_photo_3': File('bike_photo_3'),
+        'bio': Column('bio'),
+        'stats': Nested({
+            'rides_attended': Column('user__stats__rides_attended'),
+            'rides_led': Column('user__stats__rides_led'),
+            'photos_uploaded': Column('user__stats__photos_uploaded'),
+            'comments_posted': Column('user__stats__comments_posted'),
+            'last_ride_date': DateTime('user__stats__last_ride_date'),
+        }, present='user__stats'),
+        'created_at': DateTime('created_at'),
+        'updated_at': DateTime('updated_at'),
+    }
+
+
+class RideListValuesSerializer(ValuesSerializer):
+    """values()-based twin of RideListSerializer."""
+    sparse_fields = True
+    fields = {
+        'id': Column('id'),
+        'title': Column('title'),
+        'date_time': DateTime('date_time'),
+        'start_point': Column('start_point'),
+        'end_point': Column('end_point'),
+        'header_photo': File('header_photo'),
+        'created_by_username': Related('created_by__username'),
+        'rider_count': Column('rider_count'),
+        'is_upcoming': Computed(lambda date_time: date_time > timezone.now(), 'date_time'),
+        'created_at': DateTime('created_at'),
+    }
+    
+    def annotate(self, queryset):
+        # ?fields= without rider_count skips the riders join and GROUP BY
+        if 'rider_count' not in self.names:
+            return queryset
+        return queryset.annotate(rider_count=Count('riders', distinct=True))
+
+
+class PollListValuesSerializer(ValuesSerializer):
+    """values()-based twin of PollListSerializer."""
+    sparse_fields = True
+    fields = {
+        'id': Column('id'),
+        'title': Column('title'),
+        'is_active': Column('is_active'),
+        'created_by_username': Related('created_by__username'),
+        'choice_count': Column('choice_count'),
+        'total_votes': Column('vote_total'),
+        'created_at': DateTime('created_at'),
+        'closes_at': DateTime('closes_at'),
+    }
+    
+    def annotate(self, queryset):
+        # Poll.total_votes is a property, so the annotation needs another name;
+        # compacted polls (club.compaction) count their rollups instead of Vote rows
+        annotations = {}
+        if 'choice_count' in self.names:
+            annotations['choice_count'] = Count('choices', distinct=True)
+        if 'total_votes' in self.names:
+            rolled_up = VoteRollup.objects.filter(choice__poll=OuterRef('pk')).values('choice__poll').annotate(
+                total=Sum('vote_count')
+            ).values('total')
+            annotations['vote_total'] = Count('choices__votes', distinct=True) + Coalesce(
+                Subquery(rolled_up, output_field=IntegerField()), 0
+            )
+        return queryset.annotate(**annotations)
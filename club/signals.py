@@ -0,0 +1,155 @@
+from django.contrib.auth.models import User
+from django.db.models import QuerySet
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from config.conditional import bump_version
+from . import stats
+from .jobs import BATCH_SIZE, _forget_voter
+from .models import Profile, Ride, RideComment, RidePhoto, VoteRollup
+
+
+def _deleting_user(origin):
+    """True when a delete was cascaded from removing a User (its stats row goes too)."""
+    if isinstance(origin, QuerySet):
+        return origin.model is User
+    return isinstance(origin, User)
+
+
+# Profiles
+
+@receiver(post_save, sender=User)
+def create_profile(sender, instance, created, raw=False, **kwargs):
+    """Every user gets a profile, however they were created (admin, createsuperuser, ...)."""
+    if created and not raw:
+        Profile.objects.get_or_create(user=instance)
+
+
+# Ride riders and leaders
+
+@receiver(m2m_changed, sender=Ride.riders.through)
+def ride_riders_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_remove':
+        # remove() reports every id it was given, linked or not; keep the ones that are
+        if reverse:
+            linked = sender.objects.filter(user=instance, ride_id__in=pk_set).values_list('ride_id', flat=True)
+        else:
+            linked = sender.objects.filter(ride=instance, user_id__in=pk_set).values_list('user_id', flat=True)
+        instance._stats_removed = set(linked)
+        return
+    if action == 'post_remove':
+        pk_set = getattr(instance, '_stats_removed', set())
+    if action == 'pre_clear':
+        if reverse:
+            instance._stats_cleared = [instance.pk]
+        else:
+            instance._stats_cleared = list(instance.riders.values_list('pk', flat=True))
+        return
+    if action == 'post_clear':
+        stats.refresh(getattr(instance, '_stats_cleared', []), ['rides_attended', 'last_ride_date'])
+        return
+    if action not in ('post_add', 'post_remove') or not pk_set:
+        return
+
+    delta = 1 if action == 'post_add' else -1
+    if reverse:
+        # user.rides.add(...) - instance is the user, pk_set holds ride ids
+        user_ids = [instance.pk]
+        stats.bump(user_ids, 'rides_attended', delta * len(pk_set))
+        completed = Ride.objects.filter(pk__in=pk_set, completed=True).exists()
+    else:
+        user_ids = pk_set
+        stats.bump(user_ids, 'rides_attended', delta)
+        completed = instance.completed
+    if completed:
+        stats.refresh(user_ids, ['last_ride_date'])
+
+
+@receiver(pre_save, sender=Ride)
+def remember_ride_state(sender, instance, **kwargs):
+    instance._stats_previous = None
+    if instance.pk:
+        instance._stats_previous = Ride.objects.filter(pk=instance.pk).values(
+            'created_by_id', 'completed', 'date_time'
+        ).first()
+
+
+@receiver(post_save, sender=Ride)
+def ride_saved(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_stats_previous', None)
+    if created or previous is None:
+        stats.bump([instance.created_by_id], 'rides_led', 1)
+        return
+    if previous['created_by_id'] != instance.created_by_id:
+        stats.bump([previous['created_by_id']], 'rides_led', -1)
+        stats.bump([instance.created_by_id], 'rides_led', 1)
+    if previous['completed'] != instance.completed or previous['date_time'] != instance.date_time:
+        stats.refresh(instance.riders.values_list('pk', flat=True), ['last_ride_date'])
+
+
+@receiver(pre_delete, sender=Ride)
+def remember_ride_riders(sender, instance, **kwargs):
+    instance._stats_riders = list(instance.riders.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Ride)
+def ride_deleted(sender, instance, origin=None, **kwargs):
+    if _deleting_user(origin):
+        return
+    stats.bump([instance.created_by_id], 'rides_led', -1)
+    stats.refresh(getattr(instance, '_stats_riders', []), ['rides_attended', 'last_ride_date'])
+
+
+# Photos
+
+@receiver(pre_save, sender=RidePhoto)
+def remember_photo_uploader(sender, instance, **kwargs):
+    instance._stats_uploader = None
+    if instance.pk:
+        instance._stats_uploader = RidePhoto.objects.filter(pk=instance.pk).values_list(
+            'uploaded_by_id', flat=True
+        ).first()
+
+
+@receiver(post_save, sender=RidePhoto)
+def photo_saved(sender, instance, created, **kwargs):
+    if created:
+        stats.bump([instance.uploaded_by_id], 'photos_uploaded', 1)
+        return
+    previous = getattr(instance, '_stats_uploader', None)
+    if previous != instance.uploaded_by_id:
+        stats.bump([previous], 'photos_uploaded', -1)
+        stats.bump([instance.uploaded_by_id], 'photos_uploaded', 1)
+
+
+@receiver(post_delete, sender=RidePhoto)
+def photo_deleted(sender, instance, origin=None, **kwargs):
+    if not _deleting_user(origin):
+        stats.bump([instance.uploaded_by_id], 'photos_uploaded', -1)
+
+
+# Comments
+
+@receiver(post_save, sender=RideComment)
+def comment_saved(sender, instance, created, **kwargs):
+    if created:
+        stats.bump([instance.user_id], 'comments_posted', 1)
+
+
+@receiver(post_delete, sender=RideComment)
+def comment_deleted(sender, instance, origin=None, **kwargs):
+    if not _deleting_user(origin):
+        stats.bump([instance.user_id], 'comments_posted', -1)
+
+
+# Compacted votes
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    """Drop the member from compacted voter lists, like the cascade drops their Vote rows.
+
+    Covers deletes outside the member deletion job (admin, ``user.delete()``);
+    after the job's own voter_lists step this finds nothing to do.
+    """
+    if _forget_voter(instance.pk, BATCH_SIZE):
+        bump_version(VoteRollup)
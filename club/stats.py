@@ -0,0 +1,121 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Count, F, Max
+from django.db.models.functions import Greatest
+
+from config.conditional import bump_version
+
+from .models import (
+    ArchivedRide, ArchivedRideComment, ArchivedRidePhoto, MemberStats, Ride, RideComment, RidePhoto
+)
+
+COUNTER_FIELDS = ['rides_attended', 'rides_led', 'photos_uploaded', 'comments_posted']
+STAT_FIELDS = COUNTER_FIELDS + ['last_ride_date']
+
+RideRider = Ride.riders.through
+ArchivedRideRider = ArchivedRide.riders.through
+
+
+def _grouped(queryset, key, user_ids, **aggregate):
+    """Run one GROUP BY over queryset and return {user_id: value}."""
+    if user_ids is not None:
+        queryset = queryset.filter(**{f'{key}__in': user_ids})
+    name, expression = next(iter(aggregate.items()))
+    rows = queryset.values(key).annotate(**{name: expression}).values_list(key, name)
+    return dict(rows)
+
+
+def _combined(hot, archived, merge=lambda a, b: a + b):
+    """Merge the per-member results of the hot and archive tables."""
+    combined = dict(hot)
+    for pk, value in archived.items():
+        combined[pk] = merge(combined[pk], value) if pk in combined else value
+    return combined
+
+
+def compute_stats(user_ids=None):
+    """Build unsaved MemberStats for the given users (or everyone) from the source tables."""
+    users = User.objects.all()
+    if user_ids is not None:
+        user_ids = list(user_ids)
+        users = users.filter(pk__in=user_ids)
+
+    # Archived rides (club.archive) still count towards a member's history
+    attended = _combined(
+        _grouped(RideRider.objects.all(), 'user_id', user_ids, value=Count('id')),
+        _grouped(ArchivedRideRider.objects.all(), 'user_id', user_ids, value=Count('id')),
+    )
+    led = _combined(
+        _grouped(Ride.objects.all(), 'created_by_id', user_ids, value=Count('id')),
+        _grouped(ArchivedRide.objects.all(), 'created_by_id', user_ids, value=Count('id')),
+    )
+    photos = _combined(
+        _grouped(RidePhoto.objects.all(), 'uploaded_by_id', user_ids, value=Count('id')),
+        _grouped(ArchivedRidePhoto.objects.all(), 'uploaded_by_id', user_ids, value=Count('id')),
+    )
+    comments = _combined(
+        _grouped(RideComment.objects.all(), 'user_id', user_ids, value=Count('id')),
+        _grouped(ArchivedRideComment.objects.all(), 'user_id', user_ids, value=Count('id')),
+    )
+    last_ride = _combined(
+        _grouped(
+            RideRider.objects.filter(ride__completed=True), 'user_id', user_ids,
+            value=Max('ride__date_time')
+        ),
+        _grouped(ArchivedRideRider.objects.all(), 'user_id', user_ids, value=Max('archivedride__date_time')),
+        merge=max,
+    )
+
+    return [
+        MemberStats(
+            user_id=pk,
+            rides_attended=attended.get(pk, 0),
+            rides_led=led.get(pk, 0),
+            photos_uploaded=photos.get(pk, 0),
+            comments_posted=comments.get(pk, 0),
+            last_ride_date=last_ride.get(pk),
+        )
+        for pk in users.values_list('pk', flat=True).iterator()
+    ]
+
+
+def rebuild_member_stats(batch_size=500):
+    """Recompute the whole stats table in bulk. Returns the number of rows written."""
+    stats = compute_stats()
+    with transaction.atomic():
+        MemberStats.objects.all().delete()
+        MemberStats.objects.bulk_create(stats, batch_size=batch_size)
+    bump_version(MemberStats)
+    return len(stats)
+
+
+def refresh(user_ids, fields=STAT_FIELDS):
+    """Recompute stats for a few members, e.g. after a ride is deleted."""
+    user_ids = {pk for pk in user_ids if pk is not None}
+    if not user_ids:
+        return
+    stats = compute_stats(user_ids)
+    existing = set(MemberStats.objects.filter(user_id__in=user_ids).values_list('user_id', flat=True))
+    MemberStats.objects.bulk_update([s for s in stats if s.user_id in existing], fields)
+    MemberStats.objects.bulk_create([s for s in stats if s.user_id not in existing], ignore_conflicts=True)
+    bump_version(MemberStats)
+
+
+def bump(user_ids, field, delta):
+    """Add delta to one counter for each member.
+
+    Members without a stats row yet get one computed from scratch; signals
+    fire after the change is written, so the fresh row already includes it.
+    """
+    user_ids = {pk for pk in user_ids if pk is not None}
+    if not user_ids or not delta:
+        return
+    existing = set(MemberStats.objects.filter(user_id__in=user_ids).values_list('user_id', flat=True))
+    if existing:
+        MemberStats.objects.filter(user_id__in=existing).update(
+            **{field: Greatest(F(field) + delta, 0)}
+        )
+    missing = user_ids - existing
+    if missing:
+        MemberStats.objects.bulk_create(compute_stats(missing), ignore_conflicts=True)
+    bump_version(MemberStats)
@@ -0,0 +1,172 @@
+"""
+Reproducible synthetic club data for benchmarks.
+
+``generate(members, seed)`` bulk-creates members with profiles, rides with
+riders, photos and comments, polls with votes, and API items, all derived
+from ``random.Random(seed)`` so the same arguments always give the same
+dataset. Every username starts with ``prefix``; ``clear(prefix)`` removes
+a previous run. Bulk inserts skip signals, so member stats are rebuilt and
+model versions bumped at the end.
+"""
+import io
+import random
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from api.models import Item
+from config.conditional import bump_version
+
+from .models import Poll, PollChoice, Profile, Ride, RideComment, RidePhoto, Vote
+from .stats import rebuild_member_stats
+
+PASSWORD = 'synthetic-rider'
+PHOTO_NAME = 'synthetic/photo.jpg'
+THUMB_NAME = 'synthetic/thumb.jpg'
+
+# Every model generate() and clear() write to (MemberStats goes through rebuild_member_stats)
+MODELS = (User, Profile, Ride, Ride.riders.through, RidePhoto, RideComment, Poll, PollChoice, Vote, Item)
+
+FIRST_NAMES = ['Alex', 'Sam', 'Jo', 'Chris', 'Robin', 'Kim', 'Lee', 'Pat', 'Max', 'Charlie', 'Jamie', 'Toni']
+LAST_NAMES = ['Smith', 'Jones', 'Taylor', 'Brown', 'Evans', 'Walker', 'Wright', 'Hughes', 'Green', 'Hall']
+BIKES = ['Triumph Bonneville', 'BMW R1250GS', 'Honda CB500X', 'Ducati Monster', 'KTM 890 Adventure', 'Yamaha MT-07']
+PLACES = ['Snake Pass', 'Cat and Fiddle', 'Horseshoe Pass', 'Buttertubs', 'Hardknott Pass', 'Cheddar Gorge',
+          'Bwlch y Groes', 'Devil\'s Elbow', 'Rosedale Chimney', 'Kirkstone Pass', 'Llanberis', 'Ullswater']
+COMMENTS = ['Great ride, thanks for leading!', 'Count me in.', 'Where are we stopping for lunch?',
+            'Fuel stop at the services first?', 'Roads were a bit damp but worth it.', 'Photos uploaded.']
+
+
+def _placeholder_images():
+    """Store one shared photo and thumbnail so file-backed views have real bytes to serve."""
+    from PIL import Image
+
+    for name, size in ((PHOTO_NAME, (1280, 960)), (THUMB_NAME, (480, 360))):
+        if default_storage.exists(name):
+            continue
+        buffer = io.BytesIO()
+        Image.new('RGB', size, (90, 110, 130)).save(buffer, 'JPEG', quality=70)
+        default_storage.save(name, ContentFile(buffer.getvalue()))
+
+
+def clear(prefix='synthetic-'):
+    """Delete a previous synthetic dataset. Returns the number of rows removed."""
+    users = User.objects.filter(username__startswith=prefix)
+    with transaction.atomic():
+        Ride.objects.filter(created_by__in=users).delete()
+        Poll.objects.filter(created_by__in=users).delete()
+        Item.objects.filter(name__startswith=prefix).delete()
+        count, _ = users.delete()
+    bump_version(*MODELS)
+    rebuild_member_stats()
+    return count
+
+
+def generate(members, seed=42, prefix='synthetic-', batch_size=1000):
+    """Create a club of ``members`` riders and proportional activity. Returns row counts."""
+    rng = random.Random(seed)
+    now = timezone.now()
+    _placeholder_images()
+    password = make_password(PASSWORD)
+
+    with transaction.atomic():
+        users = User.objects.bulk_create([
+            User(
+                username=f'{prefix}{i}',
+                email=f'{prefix}{i}@example.com',
+                first_name=rng.choice(FIRST_NAMES),
+                last_name=rng.choice(LAST_NAMES),
+                password=password,
+                date_joined=now - timedelta(days=rng.randint(0, 2000)),
+            )
+            for i in range(members)
+        ], batch_size=batch_size)
+        Profile.objects.bulk_create([
+            Profile(user=user, bio=f'Rides a {rng.choice(BIKES)}.') for user in users
+        ], batch_size=batch_size)
+
+        # Roughly one ride per two members, mostly in the past
+        leaders = users[:max(1, members // 10)]
+        rides = Ride.objects.bulk_create([
+            Ride(
+                title=f'{rng.choice(PLACES)} run',
+                description='Meet at the usual spot, full tank please.',
+                date_time=now + timedelta(days=rng.randint(-730, 60), hours=rng.randint(7, 11)),
+                start_point=rng.choice(PLACES),
+                end_point=rng.choice(PLACES),
+                created_by=rng.choice(leaders),
+            )
+            for _ in range(max(1, members // 2))
+        ], batch_size=batch_size)
+        for ride in rides:
+            ride.completed = ride.date_time < now
+        Ride.objects.bulk_update(rides, ['completed'], batch_size=batch_size)
+
+        riders = []
+        photos = []
+        comments = []
+        for ride in rides:
+            group = rng.sample(users, min(len(users), rng.randint(3, 15)))
+            riders.extend(Ride.riders.through(ride=ride, user=user) for user in group)
+            comments.extend(
+                RideComment(ride=ride, user=rng.choice(group), message=rng.choice(COMMENTS))
+                for _ in range(rng.randint(0, 8))
+            )
+            if ride.completed:
+                photos.extend(
+                    RidePhoto(
+                        ride=ride, photo=PHOTO_NAME, thumbnail=THUMB_NAME, width=1280, height=960,
+                        uploaded_by=rng.choice(group), order=order,
+                    )
+                    for order in range(rng.randint(0, 12))
+                )
+        Ride.riders.through.objects.bulk_create(riders, batch_size=batch_size)
+        RidePhoto.objects.bulk_create(photos, batch_size=batch_size)
+        RideComment.objects.bulk_create(comments, batch_size=batch_size)
+
+        polls = Poll.objects.bulk_create([
+            Poll(
+                title=f'Where should we ride next? #{i + 1}',
+                created_by=rng.choice(leaders),
+                is_active=rng.random() < 0.3,
+                closes_at=now + timedelta(days=rng.randint(-365, 30)),
+            )
+            for i in range(max(1, members // 20))
+        ], batch_size=batch_size)
+        choices_by_poll = {}
+        choices = []
+        for poll in polls:
+            options = [PollChoice(poll=poll, text=place) for place in rng.sample(PLACES, rng.randint(2, 5))]
+            choices_by_poll[poll.pk] = options
+            choices.extend(options)
+        PollChoice.objects.bulk_create(choices, batch_size=batch_size)
+
+        # Each member votes once in about 60% of polls
+        votes = [
+            Vote(user=user, choice=rng.choice(choices_by_poll[poll.pk]))
+            for poll in polls for user in users if rng.random() < 0.6
+        ]
+        Vote.objects.bulk_create(votes, batch_size=batch_size)
+
+        items = Item.objects.bulk_create([
+            Item(name=f'{prefix}item-{i}', description=rng.choice(BIKES)) for i in range(members)
+        ], batch_size=batch_size)
+
+        rebuild_member_stats()
+
+    bump_version(*MODELS)
+    return {
+        'members': len(users),
+        'rides': len(rides),
+        'riders': len(riders),
+        'photos': len(photos),
+        'comments': len(comments),
+        'polls': len(polls),
+        'choices': len(choices),
+        'votes': len(votes),
+        'items': len(items),
+    }
@@ -1,3 +1,1114 @@
-from django.test import TestCase
+import importlib
+import io
+import json
+import os
+import pstats
+import re
+import shutil
+import tempfile
+import time
+from datetime import timedelta
+import zipfile
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync, sync_to_async
+from django.contrib.auth import BACKEND_SESSION_KEY
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, check_password
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import OperationalError, connection, connections, transaction
+from django.db.models import Count
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import clear_url_caches, resolve
+from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
+
+from config.conditional import model_versions
+from config.profiling import ProfilingMiddleware
+from config.sqlite.base import DatabaseWrapper, write_lock
+from config.querylog import QueryLogMiddleware, fingerprint
+from config.replicas import COOKIE, PrimaryReplicaRouter, ReplicaPinMiddleware
+
+from .archive import archive_rides
+from .backends import ProfileModelBackend
+from .cache import CachedEntry
+from .compaction import compact_poll_votes, compactable_polls
+from .imports import hash_passwords, import_members
+from .jobs import run_member_deletion
+from .middleware import aget_profile
+from .models import (
+    ArchivedRide, ArchivedRideComment, MemberDeletionJob, MemberImportJob, MemberStats, Poll, PollChoice, Profile,
+    Ride, RideComment, RidePhoto, Vote, VoteRollup
+)
+from .routes import iter_routes, route_url, sample_targets
+from .stats import STAT_FIELDS, compute_stats
+from .synthetic import generate
+
+BUDGETS_PATH = Path(__file__).with_name('query_budgets.json')
+MEDIA_ROOT = tempfile.mkdtemp(prefix='club-test-media-')
+
+
+def describe_queries(queries):
+    """List repeated statements first, then every query in order."""
+    counts = {}
+    for query in queries:
+        key = fingerprint(query['sql'])
+        counts[key] = counts.get(key, 0) + 1
+    lines = ['Repeated statements:']
+    lines.extend(f'  x{count}  {sql[:300]}' for sql, count in sorted(counts.items(), key=lambda item: -item[1]) if count > 1)
+    lines.append('All queries:')
+    lines.extend(f'  {number}. {query["sql"][:300]}' for number, query in enumerate(queries, start=1))
+    return '\n'.join(lines)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, ALLOWED_HOSTS=['testserver'])
+class QueryBudgetTests(TestCase):
+    """Every named route stays within the query and size budget in query_budgets.json.
+
+    Budgets are measured on a fixed seeded dataset as a logged-in staff
+    member with a cold cache. When a change legitimately needs more, update
+    the manifest in the same commit.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        generate(40, seed=7, prefix='budget-')
+        cls.admin = User.objects.create_superuser('budget-admin', 'budget-admin@example.com', 'budget')
+        cls.targets = sample_targets('budget-', cls.admin)
+        # Make sure /polls/active/ has a poll to render
+        Poll.objects.filter(pk=cls.targets['poll']).update(is_active=True)
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+        with open(BUDGETS_PATH) as manifest:
+            self.budgets = json.load(manifest)
+
+    def measure(self, route):
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(route_url(route, self.targets))
+            body = b''.join(response.streaming_content) if response.streaming else response.content
+        return response, len(body), queries.captured_queries
+
+    def test_manifest_lists_every_route(self):
+        routes = {route.key for route in iter_routes()}
+        missing = sorted(routes - set(self.budgets))
+        stale = sorted(set(self.budgets) - routes)
+        self.assertFalse(missing, f'Routes without a budget in {BUDGETS_PATH.name}: {missing}')
+        self.assertFalse(stale, f'Budgets for routes that no longer exist: {stale}')
+
+    def test_routes_within_budget(self):
+        for route in iter_routes():
+            budget = self.budgets.get(route.key)
+            if budget is None or route.skip:
+                continue
+            with self.subTest(route=route.key):
+                response, size, queries = self.measure(route)
+                self.assertLess(response.status_code, 500, f'{route.key} failed with {response.status_code}')
+                self.assertLessEqual(
+                    len(queries), budget['queries'],
+                    f'{route.key} ran {len(queries)} queries, budget is {budget["queries"]}.\n'
+                    f'{describe_queries(queries)}'
+                )
+                self.assertLessEqual(
+                    size, budget['max_bytes'],
+                    f'{route.key} rendered {size} bytes, budget is {budget["max_bytes"]}.'
+                )
+
+    def test_skipped_routes_are_declared(self):
+        for route in iter_routes():
+            if route.skip and route.key in self.budgets:
+                with self.subTest(route=route.key):
+                    self.assertIn('skip', self.budgets[route.key], f'{route.key} cannot be fetched: {route.skip}')
+
+
+def stored_stats():
+    return [[getattr(row, name) for name in ['user_id', *STAT_FIELDS]] for row in MemberStats.objects.order_by('user_id')]
+
+
+def computed_stats(user_ids=None):
+    return [[getattr(row, name) for name in ['user_id', *STAT_FIELDS]] for row in compute_stats(user_ids)]
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class StatsSignalTests(TestCase):
+    """Rider changes keep MemberStats equal to a full recompute."""
+
+    @classmethod
+    def setUpTestData(cls):
+        generate(10, seed=4, prefix='signals-')
+        cls.ride = Ride.objects.filter(completed=True).annotate(count=Count('riders')).order_by('count', 'pk').first()
+        cls.member = User.objects.filter(username__startswith='signals-').exclude(rides=cls.ride).order_by('pk').first()
+        cls.rider = cls.ride.riders.order_by('pk').first()
+
+    def assertStatsConsistent(self):
+        self.assertEqual(stored_stats(), computed_stats())
+
+    def test_add_remove_and_clear(self):
+        self.assertStatsConsistent()
+        self.ride.riders.add(self.member)
+        self.assertStatsConsistent()
+        self.ride.riders.remove(self.member)
+        self.assertStatsConsistent()
+        self.member.rides.add(self.ride)
+        self.assertStatsConsistent()
+        self.member.rides.remove(self.ride)
+        self.assertStatsConsistent()
+        self.ride.riders.clear()
+        self.assertStatsConsistent()
+
+    def test_removing_a_rider_who_is_not_on_the_ride(self):
+        attended = MemberStats.objects.get(user=self.member).rides_attended
+        self.assertGreater(attended, 0)
+        self.ride.riders.remove(self.member)
+        self.member.rides.remove(self.ride)
+        self.assertEqual(MemberStats.objects.get(user=self.member).rides_attended, attended)
+        # Mixed: one linked rider and one stranger
+        self.ride.riders.remove(self.rider, self.member)
+        self.assertStatsConsistent()
+
+
+def reload_urlconfs():
+    import club.urls
+    import config.urls
+    importlib.reload(club.urls)
+    importlib.reload(config.urls)
+    clear_url_caches()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, ALLOWED_HOSTS=['testserver'])
+class AsyncReadViewTests(TestCase):
+    """The async read views (ASYNC_READ_VIEWS) answer exactly like the sync ones."""
+    csrf_token = re.compile(rb'(name="csrfmiddlewaretoken" value=")[^"]+')
+
+    @classmethod
+    def setUpTestData(cls):
+        generate(20, seed=11, prefix='async-')
+        cls.member = User.objects.filter(username__startswith='async-').order_by('pk').first()
+        cls.ride = Ride.objects.filter(completed=True).order_by('pk').first()
+        cls.poll = Poll.objects.order_by('pk').first()
+
+    def fetch_all(self, paths):
+        bodies = {}
+        for path in paths:
+            response = self.client.get(path, HTTP_ACCEPT='application/json')
+            bodies[path] = (response.status_code, self.csrf_token.sub(rb'\1', response.content))
+        return bodies
+
+    def test_async_views_match_sync_views(self):
+        self.client.force_login(self.member)
+        paths = [
+            '/club/api/rides/upcoming/', f'/club/api/polls/{self.poll.pk}/', f'/club/api/polls/{self.poll.pk}/?fields=id,choices',
+            '/club/api/profiles/', '/club/api/profiles/?page=2', '/club/rides/', f'/club/rides/{self.ride.pk}/',
+        ]
+        sync_bodies = self.fetch_all(paths)
+        try:
+            with override_settings(ASYNC_READ_VIEWS=True):
+                reload_urlconfs()
+                self.assertEqual(resolve(paths[1]).func.__module__, 'club.async_views')
+                async_bodies = self.fetch_all(paths)
+        finally:
+            reload_urlconfs()
+        for path in paths:
+            with self.subTest(path=path):
+                self.assertEqual(sync_bodies[path], async_bodies[path])
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, THROTTLE_ENABLED=True, THROTTLE_RATES={
+    'vote': {'ip': '100/min', 'user': '2/min'},
+    'ride_membership': {'ip': '100/min', 'user': '2/min'},
+    'comment': {'ip': '3/min', 'user': '100/min'},
+})
+class ThrottleTests(TestCase):
+    """Write endpoints answer 429 with Retry-After once a bucket is empty, without writing."""
+
+    @classmethod
+    def setUpTestData(cls):
+        generate(5, seed=3, prefix='throttle-')
+        cls.member = User.objects.filter(username__startswith='throttle-').order_by('pk').first()
+        cls.ride = Ride.objects.order_by('pk').first()
+        cls.choice = PollChoice.objects.order_by('pk').first()
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.member)
+
+    def test_api_vote_is_limited_per_user(self):
+        url = f'/club/api/polls/{self.choice.poll_id}/vote/'
+        statuses = [
+            self.client.post(url, {'choice_id': self.choice.pk}, content_type='application/json').status_code
+            for _ in range(2)
+        ]
+        self.assertNotIn(429, statuses)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(url, {'choice_id': self.choice.pk}, content_type='application/json')
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response['Retry-After']), 0)
+        self.assertFalse([query for query in queries if not query['sql'].startswith('SELECT')])
+
+    def test_comment_posts_are_limited_per_ip(self):
+        url = f'/club/rides/{self.ride.pk}/'
+        for _ in range(3):
+            self.assertEqual(self.client.post(url, {'comment_message': 'Fuel stop?'}).status_code, 302)
+        comments = RideComment.objects.count()
+        response = self.client.post(url, {'comment_message': 'Fuel stop?'})
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+        self.assertEqual(RideComment.objects.count(), comments)
+        # Reading the page is not limited
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+
+@override_settings(DATABASE_REPLICAS=['replica'], REPLICA_PIN_SECONDS=5)
+class ReplicaRoutingTests(SimpleTestCase):
+    """Club reads go to a replica unless the client has just written."""
+
+    def route(self, write=False, cookies=None):
+        router = PrimaryReplicaRouter()
+        routed = {}
+
+        def view(request):
+            if write:
+                routed['write'] = router.db_for_write(RideComment)
+            routed['club'] = router.db_for_read(RideComment)
+            routed['auth'] = router.db_for_read(User)
+            return HttpResponse()
+
+        request = RequestFactory().get('/')
+        request.COOKIES.update(cookies or {})
+        return routed, ReplicaPinMiddleware(view)(request)
+
+    def test_reads_use_the_replica(self):
+        routed, response = self.route()
+        self.assertEqual(routed['club'], 'replica')
+        self.assertIsNone(routed['auth'])
+        self.assertNotIn(COOKIE, response.cookies)
+
+    def test_writes_pin_reads_to_the_primary(self):
+        routed, response = self.route(write=True)
+        self.assertEqual(routed['write'], 'default')
+        self.assertEqual(routed['club'], 'default')
+        self.assertEqual(response.cookies[COOKIE]['max-age'], 5)
+        # The next request from the same client still reads the primary
+        routed, _ = self.route(cookies={COOKIE: '1'})
+        self.assertEqual(routed['club'], 'default')
+
+
+class ProfilingTests(SimpleTestCase):
+    """Staff requests that ask for it are profiled; everything else passes straight through."""
+
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp(prefix='club-test-profiles-'))
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        override = override_settings(PROFILING_DIR=self.directory, PROFILING_PATHS=('/club/',))
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def profile(self, path, user, **headers):
+        request = RequestFactory().get(path, **headers)
+        request.user = user
+        return ProfilingMiddleware(lambda request: HttpResponse('ok'))(request)
+
+    def test_header_profiles_staff_requests(self):
+        response = self.profile('/club/rides/', User(is_staff=True), HTTP_X_PROFILE='1')
+        profile_id = response['X-Profile-Id']
+        self.assertEqual(response.content, b'ok')
+        self.assertEqual(sorted(path.name for path in self.directory.iterdir()),
+                         [f'{profile_id}.collapsed', f'{profile_id}.pstats'])
+        self.assertGreater(pstats.Stats(str(self.directory / f'{profile_id}.pstats')).total_calls, 0)
+
+    def test_query_parameter_profiles_staff_requests(self):
+        response = self.profile('/club/rides/?_profile=1', User(is_staff=True))
+        self.assertTrue((self.directory / f'{response["X-Profile-Id"]}.collapsed').exists())
+
+    def test_only_staff_and_profiled_paths(self):
+        for path, user in [('/club/rides/', User()), ('/admin/', User(is_staff=True))]:
+            with self.subTest(path=path):
+                response = self.profile(path, user, HTTP_X_PROFILE='1')
+                self.assertNotIn('X-Profile-Id', response)
+        self.assertEqual(list(self.directory.iterdir()), [])
+
+    def test_untriggered_requests_skip_the_profiler(self):
+        def user():
+            raise AssertionError('the user should not be loaded')
+
+        with mock.patch('config.profiling.StackSampler') as sampler, mock.patch('cProfile.Profile') as profiler:
+            response = self.profile('/club/rides/', SimpleLazyObject(user))
+        self.assertNotIn('X-Profile-Id', response)
+        sampler.assert_not_called()
+        profiler.assert_not_called()
+        self.assertEqual(list(self.directory.iterdir()), [])
+
+    @override_settings(PROFILING_KEEP=1)
+    def test_old_profiles_are_rotated(self):
+        first = self.profile('/club/rides/', User(is_staff=True), HTTP_X_PROFILE='1')['X-Profile-Id']
+        os.utime(self.directory / f'{first}.collapsed', (0, 0))
+        second = self.profile('/club/rides/', User(is_staff=True), HTTP_X_PROFILE='1')['X-Profile-Id']
+        self.assertEqual(sorted(path.stem for path in self.directory.iterdir()), [second, second])
+
+
+@override_settings(SQL_INSTRUMENTATION=True, SQL_N_PLUS_ONE_THRESHOLD=3)
+class QueryLogTests(TestCase):
+    """The query log middleware times each request and flags repeated statements."""
+
+    def request(self, lookups):
+        users = [User.objects.create_user(f'rider-{i}') for i in range(lookups)]
+
+        def view(request):
+            for user in users:
+                Profile.objects.filter(user=user).exists()
+            return HttpResponse()
+
+        with self.assertLogs('config.querylog', 'INFO') as logs:
+            response = QueryLogMiddleware(view)(RequestFactory().get('/rides/'))
+        return response, [json.loads(record.getMessage()) for record in logs.records]
+
+    def test_repeated_statement_is_flagged(self):
+        response, lines = self.request(3)
+        timing = response['Server-Timing']
+        self.assertIn('desc="3 queries"', timing)
+        self.assertIn('n1;desc="1 repeated statements"', timing)
+        self.assertEqual(lines[0]['path'], '/rides/')
+        self.assertEqual((lines[0]['queries'], lines[0]['distinct']), (3, 1))
+        self.assertTrue(lines[1]['n_plus_one'])
+        self.assertEqual(lines[1]['count'], 3)
+        self.assertIn('club_profile', lines[1]['sql'])
+        self.assertTrue(lines[1]['source'].startswith('club/tests.py:'))
+
+    def test_below_threshold_is_not_flagged(self):
+        response, lines = self.request(2)
+        self.assertIn('desc="2 queries"', response['Server-Timing'])
+        self.assertNotIn('n1;', response['Server-Timing'])
+        self.assertEqual(len(lines), 1)
+
+    @override_settings(SQL_INSTRUMENTATION=False)
+    def test_disabled_middleware_removes_itself(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            QueryLogMiddleware(lambda request: HttpResponse())
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, ALLOWED_HOSTS=['testserver'], THROTTLE_ENABLED=False)
+class ArchiveTests(TestCase):
+    """Archived rides leave the hot tables but every page, API response and stat stays the same."""
+
+    @classmethod
+    def setUpTestData(cls):
+        generate(40, seed=5, prefix='archive-')
+        cls.member = User.objects.filter(username__startswith='archive-').order_by('pk').first()
+        cls.ride = Ride.objects.filter(completed=True).order_by('date_time').first()
+
+    def setUp(self):
+        self.client.force_login(self.member)
+
+    def archive(self):
+        return archive_rides(timezone.now() - timedelta(days=30), batch_size=5)
+
+    def snapshot(self):
+        cache.clear()
+        paths = [
+            '/club/api/rides/', '/club/api/rides/?page=2', '/club/api/rides/?page=2&fast=0',
+            '/club/api/rides/?completed=true&fields=id,title', f'/club/api/rides/{self.ride.pk}/',
+            f'/club/api/rides/{self.ride.pk}/photos/', '/club/rides/', f'/club/rides/{self.ride.pk}/',
+        ]
+        bodies = {}
+        for path in paths:
+            response = self.client.get(path)
+            bodies[path] = (response.status_code, AsyncReadViewTests.csrf_token.sub(rb'\1', response.content))
+        return bodies, [[getattr(stats, name) for name in ['user_id', *STAT_FIELDS]] for stats in compute_stats()]
+
+    def test_archive_keeps_responses_and_stats(self):
+        bodies, stats = self.snapshot()
+        moved = self.archive()
+        self.assertGreater(moved['rides'], 5)
+        self.assertFalse(Ride.objects.filter(pk=self.ride.pk).exists())
+        archived_bodies, archived_stats = self.snapshot()
+        for path in bodies:
+            with self.subTest(path=path):
+                self.assertEqual(bodies[path][0], 200)
+                if path != f'/club/rides/{self.ride.pk}/':  # says comments are closed
+                    self.assertEqual(bodies[path], archived_bodies[path])
+        self.assertEqual(stats, archived_stats)
+
+    def test_archived_rides_are_read_only(self):
+        self.archive()
+        url = f'/club/rides/{self.ride.pk}/'
+        comments = ArchivedRideComment.objects.count() + RideComment.objects.count()
+        self.assertEqual(self.client.post(url, {'comment_message': 'Still here?'}).status_code, 200)
+        self.assertEqual(ArchivedRideComment.objects.count() + RideComment.objects.count(), comments)
+        self.assertEqual(self.client.post(f'/club/api/rides/{self.ride.pk}/join/').status_code, 404)
+        self.assertTrue(ArchivedRide.objects.filter(pk=self.ride.pk).exists())
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, ALLOWED_HOSTS=['testserver'], THROTTLE_ENABLED=False)
+class VoteCompactionTests(TestCase):
+    """Compacting closed polls deletes their Vote rows without changing any poll response."""
+
+    @classmethod
+    def setUpTestData(cls):
+        generate(40, seed=8, prefix='compact-')
+        cls.voter = Vote.objects.filter(choice__poll__in=compactable_polls()).order_by('pk').first().user
+
+    def snapshot(self):
+        cache.clear()
+        paths = ['/club/api/polls/', '/club/api/polls/?page=2&fast=0']
+        paths += [f'/club/api/polls/{pk}/' for pk in Poll.objects.values_list('pk', flat=True)]
+        return {path: self.client.get(path).content for path in paths}
+
+    def test_compaction_keeps_poll_responses(self):
+        self.client.force_login(self.voter)
+        before = self.snapshot()
+        closed = list(compactable_polls().values_list('pk', flat=True))
+        done = compact_poll_votes(batch_size=7)
+        self.assertEqual(done['polls'], len(closed))
+        self.assertFalse(Vote.objects.filter(choice__poll__in=closed).exists())
+        after = self.snapshot()
+        for path in before:
+            with self.subTest(path=path):
+                self.assertEqual(before[path], after[path])
+
+        choice = PollChoice.objects.filter(poll_id=closed[0]).first()
+        response = self.client.post(
+            f'/club/api/polls/{closed[0]}/vote/', {'choice_id': choice.pk}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Vote.objects.filter(choice__poll_id=closed[0]).exists())
+
+    def test_compacted_polls_stay_closed(self):
+        self.client.force_login(self.voter)
+        poll = compactable_polls().first()
+        compact_poll_votes()
+        url = f'/club/api/polls/{poll.pk}/'
+        response = self.client.patch(url, {'is_active': True}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        for closes_at in [None, (timezone.now() + timedelta(days=7)).isoformat()]:
+            response = self.client.patch(url, {'closes_at': closes_at}, content_type='application/json')
+            self.assertEqual(response.status_code, 400)
+        choice = poll.choices.first()
+        response = self.client.post(f'{url}vote/', {'choice_id': choice.pk}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Vote.objects.filter(choice__poll=poll).exists())
+
+    def test_member_deletion_updates_voter_lists(self):
+        compact_poll_votes()
+        held = {rollup.pk: rollup.vote_count for rollup in VoteRollup.objects.all() if self.voter.pk in rollup.voter_ids}
+        self.assertTrue(held)
+        job = MemberDeletionJob.objects.create(member_id=self.voter.pk, username=self.voter.username)
+        job = run_member_deletion(job.pk, batch_size=1)
+        self.assertEqual(job.progress['voter_lists'], len(held))
+        for rollup in VoteRollup.objects.all():
+            self.assertNotIn(self.voter.pk, rollup.voter_ids)
+            self.assertEqual(rollup.vote_count, len(rollup.voter_ids))
+            if rollup.pk in held:
+                self.assertEqual(rollup.vote_count, held[rollup.pk] - 1)
+
+    def test_deleting_a_user_directly_updates_voter_lists(self):
+        compact_poll_votes()
+        poll = next(rollup.choice.poll for rollup in VoteRollup.objects.all() if self.voter.pk in rollup.voter_ids)
+        self.client.force_login(self.voter)
+        before = self.client.get(f'/club/api/polls/{poll.pk}/').json()['total_votes']
+        self.client.logout()
+
+        voter_id = self.voter.pk
+        self.voter.delete()
+        self.assertFalse(any(voter_id in rollup.voter_ids for rollup in VoteRollup.objects.all()))
+        self.assertEqual(self.client.get(f'/club/api/polls/{poll.pk}/').json()['total_votes'], before - 1)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, ALLOWED_HOSTS=['testserver'], BATCH_MAX_REQUESTS=6)
+class BatchTests(TestCase):
+    """/club/api/batch/ answers each sub-request exactly as a direct GET would."""
+
+    @classmethod
+    def setUpTestData(cls):
+        generate(40, seed=9, prefix='batch-')
+        cls.member = User.objects.filter(username__startswith='batch-').order_by('pk').first()
+        cls.ride = Ride.objects.filter(completed=True).order_by('pk').first()
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.member)
+
+    def batch(self, requests, secure=True):
+        response = self.client.post(
+            '/club/api/batch/', {'requests': requests}, content_type='application/json', secure=secure
+        )
+        return response.status_code, response.json()
+
+    def test_batched_bodies_match_direct_calls(self):
+        urls = [
+            '/club/api/profiles/', '/club/api/profiles/?page=2', f'/club/api/rides/{self.ride.pk}/',
+            f'/club/api/rides/{self.ride.pk}/photos/', '/club/api/polls/', '/api/items/',
+        ]
+        for secure in (True, False):
+            status, batched = self.batch([{'id': n, 'url': url} for n, url in enumerate(urls)], secure=secure)
+            self.assertEqual(status, 200)
+            for item, url in zip(batched['responses'], urls):
+                with self.subTest(url=url, secure=secure):
+                    direct = self.client.get(url, HTTP_ACCEPT='application/json', secure=secure)
+                    self.assertEqual(item['status'], direct.status_code)
+                    self.assertEqual(item['body'], direct.json())
+            scheme = 'https' if secure else 'http'
+            self.assertTrue(batched['responses'][0]['body']['next'].startswith(f'{scheme}://testserver/'))
+
+    def test_async_read_views_can_be_batched(self):
+        poll = Poll.objects.order_by('pk').first()
+        urls = ['/club/api/rides/upcoming/', f'/club/api/polls/{poll.pk}/', '/club/api/profiles/?page=2']
+        try:
+            with override_settings(ASYNC_READ_VIEWS=True):
+                reload_urlconfs()
+                self.assertEqual(resolve(urls[1]).func.__module__, 'club.async_views')
+                status, batched = self.batch([{'url': url} for url in urls])
+                direct = [self.client.get(url, HTTP_ACCEPT='application/json', secure=True) for url in urls]
+        finally:
+            reload_urlconfs()
+        self.assertEqual(status, 200)
+        for item, response in zip(batched['responses'], direct):
+            with self.subTest(url=item['url']):
+                self.assertEqual(item['status'], 200)
+                self.assertEqual(item['body'], response.json())
+
+    def test_limits_and_errors(self):
+        status, body = self.batch([{'url': '/api/items/'}] * 7)
+        self.assertEqual(status, 400)
+        self.assertIn('At most 6', body['error'])
+        response = self.client.post('/club/api/batch/', '[]', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+        status, body = self.batch([
+            {'id': 'write', 'url': '/api/items/', 'method': 'POST'},
+            {'id': 'outside', 'url': '/club/rides/'},
+            {'id': 'absolute', 'url': 'https://example.com/api/items/'},
+            {'id': 'nested', 'url': '/club/api/batch/'},
+            {'id': 'missing', 'url': '/club/api/rides/999999/'},
+            {'id': 'no-url'},
+        ])
+        self.assertEqual(status, 200)
+        statuses = {item['id']: item['status'] for item in body['responses']}
+        self.assertEqual(statuses, {
+            'write': 405, 'outside': 400, 'absolute': 400, 'nested': 400, 'missing': 404, 'no-url': 400,
+        })
+
+
+class AuthBackendTests(TestCase):
+    """Sessions keep working across the switch to ProfileModelBackend."""
+
+    def test_sessions_from_model_backend_still_resolve(self):
+        member = User.objects.create_user('backend-rider', password='ride-safe-2024')
+        self.client.force_login(member, backend='django.contrib.auth.backends.ModelBackend')
+        response = self.client.get('/club/rides/')
+        self.assertEqual(response.wsgi_request.user, member)
+        # ...and are moved to the new backend for good
+        self.assertEqual(self.client.session[BACKEND_SESSION_KEY], 'club.backends.ProfileModelBackend')
+
+    async def test_sessions_from_model_backend_resolve_under_asgi(self):
+        member = await sync_to_async(User.objects.create_user)('backend-rider', password='ride-safe-2024')
+        await self.async_client.aforce_login(member, backend='django.contrib.auth.backends.ModelBackend')
+        response = await self.async_client.get('/club/api/profiles/me/', headers={'accept': 'application/json'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['user']['username'], 'backend-rider')
+        session = await self.async_client.asession()
+        self.assertEqual(await session.aget(BACKEND_SESSION_KEY), 'club.backends.ProfileModelBackend')
+
+    async def test_async_user_arrives_with_profile(self):
+        member = await sync_to_async(User.objects.create_user)('backend-rider', password='ride-safe-2024')
+        user = await ProfileModelBackend().aget_user(member.pk)
+        self.assertTrue(User.profile.is_cached(user))
+        request = RequestFactory().get('/club/api/profiles/')
+
+        async def auser():
+            return user
+
+        request.auser = auser
+        with mock.patch.object(Profile.objects, 'aget_or_create') as get_or_create:
+            profile = await aget_profile(request)
+        get_or_create.assert_not_called()
+        self.assertEqual(profile.user_id, member.pk)
+
+    def test_failed_login_hashes_once(self):
+        User.objects.create_user('backend-rider', password='ride-safe-2024')
+        for username in ('backend-rider', 'backend-nobody'):
+            with self.subTest(username=username), \
+                    mock.patch('django.contrib.auth.hashers.PBKDF2PasswordHasher.encode', autospec=True,
+                               side_effect=PBKDF2PasswordHasher.encode) as encode:
+                self.assertFalse(self.client.login(username=username, password='wrong'))
+                self.assertEqual(encode.call_count, 1)
+
+    def test_new_logins_use_the_profile_backend(self):
+        User.objects.create_user('backend-rider', password='ride-safe-2024')
+        self.assertTrue(self.client.login(username='backend-rider', password='ride-safe-2024'))
+        self.assertEqual(self.client.session[BACKEND_SESSION_KEY], 'club.backends.ProfileModelBackend')
+
+
+class VersionTrackingTests(TestCase):
+    """Logins do not invalidate the ETags and cached payloads that depend on User."""
+
+    def test_login_does_not_bump_user_version(self):
+        member = User.objects.create_user('version-rider', password='ride-safe-2024')
+        before = model_versions(User)
+        self.assertTrue(self.client.login(username='version-rider', password='ride-safe-2024'))
+        self.assertEqual(model_versions(User), before)
+        member.first_name = 'Robin'
+        member.save(update_fields=['first_name', 'last_login'])
+        self.assertNotEqual(model_versions(User), before)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, CLUB_JOBS_EAGER=True)
+class MemberDeletionTests(TestCase):
+    """The deletion job removes or unlinks every row that points at the member, and keeps stats consistent."""
+
+    @classmethod
+    def setUpTestData(cls):
+        generate(40, seed=6, prefix='delete-')
+        cls.admin = User.objects.create_superuser('delete-admin', 'delete-admin@example.com', 'delete')
+        # A leader with every kind of activity
+        cls.member = next(
+            user for user in User.objects.filter(username__startswith='delete-').order_by('pk')
+            if all(queryset.filter(**{field: user}).exists() for queryset, field in [
+                (Vote.objects, 'user'), (RideComment.objects, 'user'), (Ride.riders.through.objects, 'user'),
+                (Ride.objects, 'created_by'), (RidePhoto.objects, 'uploaded_by'), (Poll.objects, 'created_by'),
+            ])
+        )
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def test_job_removes_and_unlinks_member_rows(self):
+        led = list(Ride.objects.filter(created_by=self.member).values_list('pk', flat=True))
+        photos = list(RidePhoto.objects.filter(uploaded_by=self.member).values_list('pk', flat=True))
+        polls = list(Poll.objects.filter(created_by=self.member).values_list('pk', flat=True))
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f'/club/members/{self.member.pk}/delete/')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()['status'], MemberDeletionJob.STATUS_PENDING)
+
+        status = self.client.get(response.json()['status_url']).json()
+        self.assertEqual(status['status'], MemberDeletionJob.STATUS_DONE, status['error'])
+        self.assertEqual(status['progress']['rides_unlinked'], len(led))
+
+        member_id = self.member.pk
+        self.assertFalse(User.objects.filter(pk=member_id).exists())
+        for model in (Vote, RideComment, Ride.riders.through, Profile, MemberStats):
+            self.assertFalse(model.objects.filter(user_id=member_id).exists(), model.__name__)
+        # Rides, photos and polls stay, without their creator
+        self.assertEqual(Ride.objects.filter(pk__in=led, created_by=None).count(), len(led))
+        self.assertEqual(RidePhoto.objects.filter(pk__in=photos, uploaded_by=None).count(), len(photos))
+        self.assertEqual(Poll.objects.filter(pk__in=polls, created_by=None).count(), len(polls))
+        self.assertEqual(stored_stats(), computed_stats(MemberStats.objects.values_list('user_id', flat=True)))
+
+    def test_requests_reuse_the_running_job(self):
+        job = MemberDeletionJob.objects.create(
+            member_id=self.member.pk, username=self.member.username, status=MemberDeletionJob.STATUS_RUNNING
+        )
+        response = self.client.post(f'/club/members/{self.member.pk}/delete/')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()['job_id'], job.pk)
+        self.assertEqual(MemberDeletionJob.objects.count(), 1)
+
+    def test_failed_job_records_the_error_and_can_rerun(self):
+        job = MemberDeletionJob.objects.create(member_id=self.member.pk, username=self.member.username)
+        with mock.patch('club.jobs._profile_media', side_effect=OSError('media offline')):
+            job = run_member_deletion(job.pk)
+        self.assertEqual(job.status, MemberDeletionJob.STATUS_FAILED)
+        self.assertEqual(job.error, 'media offline')
+        self.assertTrue(User.objects.filter(pk=self.member.pk).exists())
+
+        job = run_member_deletion(job.pk)
+        self.assertEqual((job.status, job.error), (MemberDeletionJob.STATUS_DONE, ''))
+        self.assertFalse(User.objects.filter(pk=self.member.pk).exists())
+        finished = job.finished_at
+        self.assertEqual(run_member_deletion(job.pk).finished_at, finished)
+
+
+# Fast hashing for the tests; PBKDF2 stays listed for pool workers that set Django up afresh
+@override_settings(PASSWORD_HASHERS=[
+    'django.contrib.auth.hashers.MD5PasswordHasher', 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+])
+class MemberImportTests(TestCase):
+    """Bulk import reports bad rows and creates users with profiles and stats for the rest."""
+
+    def setUp(self):
+        User.objects.create_user('import-taken', password='ride-safe-2024')
+
+    def row(self, username, **fields):
+        return {'username': username, 'password': f'{username}-secret', 'email': f'{username}@example.com', **fields}
+
+    def test_import_reports_invalid_and_racing_rows(self):
+        rows = [
+            self.row('import-a', first_name='Alex', bio='Bonneville'),
+            self.row('import-b'),
+            self.row('import-taken'),
+            self.row('import-a'),
+            self.row('import-c', password=''),
+            self.row('import-d', email='not-an-email'),
+            self.row('import-race'),
+            self.row('import-e'),
+        ]
+
+        def hash_while_someone_signs_up(passwords, workers=None, progress=None):
+            # Taken after validation: only the database constraint can catch it
+            User.objects.create_user('import-race')
+            return hash_passwords(passwords, workers=1)
+
+        with mock.patch('club.imports.hash_passwords', side_effect=hash_while_someone_signs_up):
+            report = import_members(rows, batch_size=2)
+
+        self.assertEqual(report['created'], ['import-a', 'import-b', 'import-e'])
+        self.assertEqual([(error['row'], error['username']) for error in report['errors']], [
+            (3, 'import-taken'), (4, 'import-a'), (5, 'import-c'), (6, 'import-d'), (7, 'import-race'),
+        ])
+        self.assertIn('UNIQUE', report['errors'][-1]['error'])
+
+        members = User.objects.filter(username__in=report['created']).select_related('profile', 'stats')
+        self.assertEqual(len(members), 3)
+        for member in members:
+            self.assertTrue(member.check_password(f'{member.username}-secret'))
+            self.assertEqual(member.stats.rides_attended, 0)
+        alex = members.get(username='import-a')
+        self.assertEqual((alex.first_name, alex.profile.bio), ('Alex', 'Bonneville'))
+
+    def test_parallel_hashing_matches_inline(self):
+        passwords = [f'rider-{i}' for i in range(8)]
+        reported = []
+        hashes = hash_passwords(passwords, workers=2, progress=reported.append)
+        self.assertEqual(len(hashes), len(passwords))
+        self.assertEqual(reported[-1], len(passwords))
+        for password, hashed in zip(passwords, hashes):
+            self.assertTrue(check_password(password, hashed))
+
+    @override_settings(CLUB_JOBS_EAGER=True)
+    def test_upload_runs_as_a_background_job(self):
+        admin = User.objects.create_superuser('import-admin', 'import-admin@example.com', 'import')
+        self.client.force_login(admin)
+        upload = SimpleUploadedFile('riders.csv', b'username,password,email\nimport-f,secret,\nimport-taken,secret,\n')
+        with mock.patch('club.jobs.import_members', wraps=import_members) as run, \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/club/members/import/', {'members_file': upload})
+        job = MemberImportJob.objects.get()
+        self.assertRedirects(response, f'/club/members/import/?job={job.pk}')
+        # The job, not the request, hashes the passwords, and lets the pool decide the worker count
+        self.assertIsNone(run.call_args.kwargs['workers'])
+
+        page = self.client.get(response.url)
+        self.assertContains(page, f'/club/members/import-jobs/{job.pk}/')
+        status = self.client.get(f'/club/members/import-jobs/{job.pk}/').json()
+        self.assertEqual(status['status'], MemberImportJob.STATUS_DONE, status['error'])
+        self.assertEqual((status['rows'], status['created'], status['progress']['hashed']), (2, 1, 1))
+        self.assertEqual([error['username'] for error in status['errors']], ['import-taken'])
+        self.assertTrue(User.objects.get(username='import-f').check_password('secret'))
+
+
+class WriteQueueTests(SimpleTestCase):
+    """The SQLite write-queue lock is released however a transaction ends."""
+    alias = 'write-queue-test'
+
+    def setUp(self):
+        directory = tempfile.mkdtemp(prefix='club-write-queue-')
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.path = str(Path(directory) / 'queue.sqlite3')
+        settings_dict = {
+            **connections['default'].settings_dict,
+            'NAME': self.path,
+            'OPTIONS': {'write_queue': True, 'pragmas': {'busy_timeout': 200}},
+        }
+        self.db = DatabaseWrapper(settings_dict, alias=self.alias)
+        connections[self.alias] = self.db
+        self.addCleanup(connections.__delitem__, self.alias)
+        self.addCleanup(self.db.close)
+        with self.db.cursor() as cursor:
+            cursor.execute('CREATE TABLE ride (title TEXT)')
+        self.lock = write_lock(self.path)
+
+    def rides(self):
+        with self.db.cursor() as cursor:
+            cursor.execute('SELECT COUNT(*) FROM ride')
+            return cursor.fetchone()[0]
+
+    def insert(self):
+        with self.db.cursor() as cursor:
+            cursor.execute("INSERT INTO ride VALUES ('Snake Pass')")
+
+    def test_released_on_commit_exception_and_rollback(self):
+        with transaction.atomic(using=self.alias):
+            self.assertTrue(self.lock.locked())
+            self.insert()
+        self.assertFalse(self.lock.locked())
+
+        with self.assertRaises(ZeroDivisionError):
+            with transaction.atomic(using=self.alias):
+                self.insert()
+                1 / 0
+        self.assertFalse(self.lock.locked())
+
+        with transaction.atomic(using=self.alias):
+            self.insert()
+            transaction.set_rollback(True, using=self.alias)
+        self.assertFalse(self.lock.locked())
+        self.assertEqual(self.rides(), 1)
+
+    def test_released_on_close(self):
+        with transaction.atomic(using=self.alias):
+            self.insert()
+            self.db.close()
+            self.assertFalse(self.lock.locked())
+        self.assertFalse(self.lock.locked())
+        self.assertEqual(self.rides(), 0)
+
+    def test_times_out_while_another_writer_holds_it(self):
+        self.lock.acquire()
+        try:
+            with self.assertRaisesMessage(OperationalError, 'write queue'):
+                with transaction.atomic(using=self.alias):
+                    self.insert()
+        finally:
+            self.lock.release()
+        # The failed attempt did not take the lock or leave a transaction open
+        with transaction.atomic(using=self.alias):
+            self.insert()
+        self.assertFalse(self.lock.locked())
+        self.assertEqual(self.rides(), 1)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class PhotoZipTests(TestCase):
+    """The gallery ZIP is replayed byte for byte, so a resumed download joins up with the first part."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.member = User.objects.create_user('zip-rider', password='ride-safe-2024')
+        cls.ride = Ride.objects.create(
+            title='Horseshoe Pass', description='Loop', start_point='Llangollen', end_point='Llangollen',
+            date_time=timezone.now() - timedelta(days=3), completed=True, created_by=cls.member,
+        )
+        cls.files = {
+            'zip-tests/pass.jpg': os.urandom(200 * 1024),
+            'zip-tests/route.txt': b'Left at the Ponderosa cafe, then follow the A542. ' * 2000,
+            'zip-tests/café-stop.jpg': os.urandom(10 * 1024),
+        }
+        for name, data in cls.files.items():
+            default_storage.delete(name)
+            stored = default_storage.save(name, ContentFile(data))
+            RidePhoto.objects.create(ride=cls.ride, photo=stored, thumbnail=stored, uploaded_by=cls.member)
+
+    def setUp(self):
+        cache.clear()
+        self.url = f'/club/rides/{self.ride.pk}/photos/download/'
+
+    def download(self, **headers):
+        response = self.client.get(self.url, headers=headers)
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        return response, body
+
+    def test_range_resumes_with_the_tail_of_the_archive(self):
+        first, full = self.download()
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual((first['Accept-Ranges'], int(first['Content-Length'])), ('bytes', len(full)))
+        self.assertEqual(self.download()[1], full)
+
+        for start in (1, 1000, len(full) // 2, len(full) - 1):
+            with self.subTest(start=start):
+                partial, tail = self.download(Range=f'bytes={start}-', If_Range=first['ETag'])
+                self.assertEqual(partial.status_code, 206)
+                self.assertEqual(partial['Content-Range'], f'bytes {start}-{len(full) - 1}/{len(full)}')
+                self.assertEqual(int(partial['Content-Length']), len(full) - start)
+                self.assertEqual(tail, full[start:])
+
+        stale, body = self.download(Range='bytes=1000-', If_Range='"stale"')
+        self.assertEqual((stale.status_code, body), (200, full))
+        self.assertEqual(self.download(Range=f'bytes={len(full)}-')[0].status_code, 416)
+
+    def test_interrupted_first_download_resumes(self):
+        first = self.client.get(self.url)
+        received = b''
+        for chunk in first.streaming_content:
+            received += chunk
+            if len(received) > 100 * 1024:
+                break
+        first.close()
+
+        cache.clear()
+        rest, tail = self.download(Range=f'bytes={len(received)}-', If_Range=first['ETag'])
+        self.assertEqual(rest.status_code, 206)
+        self.assertEqual(len(received) + len(tail), int(first['Content-Length']))
+        with zipfile.ZipFile(io.BytesIO(received + tail)) as archive:
+            self.assertIsNone(archive.testzip())
+
+    def test_entries_are_stored(self):
+        _, full = self.download()
+        with zipfile.ZipFile(io.BytesIO(full)) as archive:
+            self.assertEqual(len(archive.infolist()), len(self.files))
+            for info in archive.infolist():
+                self.assertEqual(info.compress_type, zipfile.ZIP_STORED)
+                self.assertEqual(archive.read(info), self.files[f'zip-tests/{info.filename.split("_", 1)[1]}'])
+
+    def test_etag_follows_the_photo_list(self):
+        response, _ = self.download()
+        etag = response['ETag']
+        self.assertEqual(self.download()[0]['ETag'], etag)
+        photo = self.ride.photos.first()
+        RidePhoto.objects.create(ride=self.ride, photo=photo.photo.name, thumbnail=photo.photo.name)
+        self.assertNotEqual(self.download()[0]['ETag'], etag)
+
+
+class OrphanedMediaTests(TestCase):
+    """collect_orphaned_media removes files no model references, once they are past the grace period."""
+
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp(prefix='club-test-orphans-'))
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=str(self.root))
+        override.enable()
+        self.addCleanup(override.disable)
+
+        day_old = time.time() - 25 * 3600
+        for name in ['gpx_files/route.gpx', 'gpx_files/orphan.gpx', 'ride_photos/fresh.jpg']:
+            path = self.root / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(b'<gpx/>')
+            if name != 'ride_photos/fresh.jpg':
+                os.utime(path, (day_old, day_old))
+        Ride.objects.create(
+            title='Bwlch', description='Loop', start_point='Bala', end_point='Bala',
+            date_time=timezone.now(), gpx_file='gpx_files/route.gpx',
+        )
+
+    def collect(self, *args):
+        out = io.StringIO()
+        call_command('collect_orphaned_media', *args, stdout=out)
+        return out.getvalue()
+
+    def remaining(self):
+        return sorted(str(path.relative_to(self.root)) for path in self.root.rglob('*') if path.is_file())
+
+    def test_dry_run_reports_orphans(self):
+        output = self.collect('--dry-run')
+        self.assertIn('Would remove gpx_files/orphan.gpx', output)
+        self.assertNotIn('route.gpx', output)
+        self.assertIn('Skipped 1 unreferenced file(s) newer than the grace period.', output)
+        self.assertIn('1 orphaned file(s) would be removed', output)
+        self.assertEqual(self.remaining(), ['gpx_files/orphan.gpx', 'gpx_files/route.gpx', 'ride_photos/fresh.jpg'])
+
+    def test_deletes_orphans(self):
+        self.assertIn('1 orphaned file(s) deleted', self.collect())
+        self.assertEqual(self.remaining(), ['gpx_files/route.gpx', 'ride_photos/fresh.jpg'])
+
+    def test_quarantine_keeps_relative_paths(self):
+        quarantine = self.root / 'quarantine'
+        self.assertIn('2 orphaned file(s) quarantined', self.collect('--quarantine', str(quarantine), '--grace-hours', '0'))
+        self.assertEqual(self.remaining(), [
+            'gpx_files/route.gpx', 'quarantine/gpx_files/orphan.gpx', 'quarantine/ride_photos/fresh.jpg',
+        ])
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, FAST_LIST_SERIALIZATION=True)
+class SparseFieldsTests(TestCase):
+    """?fields= trims fast list responses to the requested keys and columns."""
+
+    @classmethod
+    def setUpTestData(cls):
+        member = User.objects.create_user('sparse-rider')
+        cls.ride = Ride.objects.create(
+            title='Evo Triangle', description='Loop', start_point='Ruthin', end_point='Ruthin',
+            date_time=timezone.now() + timedelta(days=2), created_by=member,
+        )
+        cls.ride.riders.add(member)
+        cls.poll = Poll.objects.create(title='Next trip?', created_by=member)
+        PollChoice.objects.create(poll=cls.poll, text='Wales')
+
+    def test_only_requested_fields_are_returned(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/club/api/rides/?fields=id, title,nonsense')
+        self.assertEqual(response.json()['results'], [{'id': self.ride.pk, 'title': 'Evo Triangle'}])
+        # The rider_count annotation and created_by join are left out of the query too
+        select = [query['sql'] for query in queries.captured_queries if 'FROM "club_ride"' in query['sql']][-1]
+        self.assertNotIn('club_ride_riders', select)
+        self.assertNotIn('auth_user', select)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/club/api/polls/?fields=id,choice_count')
+        self.assertEqual(response.json()['results'], [{'id': self.poll.pk, 'choice_count': 1}])
+        self.assertFalse(any('club_voterollup' in query['sql'] for query in queries.captured_queries))
+
+    def test_matches_the_regular_serializer(self):
+        fast = self.client.get('/club/api/rides/?fields=title,rider_count,is_upcoming').json()
+        slow = self.client.get('/club/api/rides/?fields=title,rider_count,is_upcoming&fast=0').json()
+        self.assertEqual(fast, slow)
+        self.assertEqual(fast['results'], [{'title': 'Evo Triangle', 'rider_count': 1, 'is_upcoming': True}])
+
+    def test_without_fields_everything_is_returned(self):
+        row = self.client.get('/club/api/rides/').json()['results'][0]
+        self.assertEqual(set(row), {
+            'id', 'title', 'date_time', 'start_point', 'end_point', 'header_photo', 'created_by_username',
+            'rider_count', 'is_upcoming', 'created_at',
+        })
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class CacheDependencyTests(TestCase):
+    """A cached entry is rebuilt after a change to any model it depends on, and only then."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.member = User.objects.create_user('cache-rider')
+        cls.ride = Ride.objects.create(
+            title='Llanberis Pass', description='Loop', start_point='Capel Curig', end_point='Capel Curig',
+            date_time=timezone.now() + timedelta(days=1), created_by=cls.member,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.builds = 0
+        self.entry = CachedEntry('test-ride-riders', depends_on=[Ride, Ride.riders.through])
+
+    def build(self):
+        self.builds += 1
+        return list(self.ride.riders.values_list('username', flat=True))
+
+    def read(self):
+        return self.entry.get_or_set([self.ride.pk], self.build)
+
+    def test_hits_until_a_dependency_changes(self):
+        self.assertEqual(self.read(), [])
+        self.assertEqual(self.read(), [])
+        self.assertEqual(self.builds, 1)
+
+        # A model outside depends_on leaves the entry alone
+        Poll.objects.create(title='Unrelated', created_by=self.member)
+        self.read()
+        self.assertEqual(self.builds, 1)
+
+        self.ride.riders.add(self.member)
+        self.assertEqual(self.read(), ['cache-rider'])
+        self.assertEqual(self.builds, 2)
+
+        self.ride.title = 'Llanberis Pass (wet)'
+        self.ride.save()
+        self.read()
+        self.assertEqual(self.builds, 3)
+
+        Ride.objects.filter(pk=self.ride.pk).delete()
+        self.assertEqual(self.read(), [])
+        self.assertEqual(self.builds, 4)
+
+    def test_async_reads_share_the_entry(self):
+        async def abuild():
+            return await sync_to_async(self.build)()
+
+        self.read()
+        self.assertEqual(async_to_sync(self.entry.aget_or_set)([self.ride.pk], abuild), [])
+        self.assertEqual(self.builds, 1)
+        self.ride.riders.add(self.member)
+        self.assertEqual(async_to_sync(self.entry.aget_or_set)([self.ride.pk], abuild), ['cache-rider'])
+        self.assertEqual(self.builds, 2)
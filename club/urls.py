@@ -1,6 +1,7 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from . import views
+from . import async_views, views
 
 # API Router
 router = DefaultRouter()
@@ -12,6 +13,7 @@ app_name = 'club'
 
 urlpatterns = [
     # API endpoints
+    path('api/batch/', views.api_batch, name='api_batch'),
     path('api/', include(router.urls)),
     
     # Frontend views
@@ -21,6 +23,7 @@ urlpatterns = [
     path('rides/<int:pk>/', views.ride_detail, name='ride_detail'),
     path('upcoming-ride/', views.upcoming_ride, name='upcoming_ride'),
     path('rides/add/', views.ride_add, name='ride_add'),
+    path('rides/<int:pk>/photos/download/', views.ride_photos_download, name='ride_photos_download'),
     path('rides/<int:pk>/edit/', views.ride_edit, name='ride_edit'),
     path('rides/<int:pk>/edit-completed/', views.ride_edit_completed, name='ride_edit_completed'),
     path('rides/<int:pk>/join/', views.ride_join, name='ride_join'),
@@ -29,8 +32,22 @@ urlpatterns = [
     path('polls/', views.poll_list, name='poll_list'),
     path('members/', views.members_list, name='members_list'),
     path('members/add/', views.member_add, name='member_add'),
+    path('members/import/', views.member_import, name='member_import'),
+    path('members/import-jobs/<int:job_id>/', views.member_import_status, name='member_import_status'),
     path('members/<int:user_id>/delete/', views.member_delete, name='member_delete'),
+    path('members/delete-jobs/<int:job_id>/', views.member_delete_status, name='member_delete_status'),
+    path('cache/stats/', views.cache_stats_view, name='cache_stats'),
     path('login/', views.login_view, name='login'),
     path('register/', views.register_view, name='register'),
     path('logout/', views.logout_view, name='logout'),
 ]
+
+if settings.ASYNC_READ_VIEWS:
+    # Async twins of the hot read paths (club.async_views); listed first so they win over the router
+    urlpatterns = [
+        path('api/rides/upcoming/', async_views.upcoming_ride_api, name='ride-upcoming'),
+        path('api/polls/<int:pk>/', async_views.poll_detail_api, name='poll-detail'),
+        path('api/profiles/', async_views.profile_list_api, name='profile-list'),
+        path('rides/', async_views.rides_list, name='rides_list'),
+        path('rides/<int:pk>/', async_views.ride_detail, name='ride_detail'),
+    ] + urlpatterns
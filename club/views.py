@@ -1,35 +1,140 @@
+import json
+
 from django.shortcuts import render, get_object_or_404, redirect
+from django.urls import reverse
+from django.db import transaction
 from django.contrib.auth.decorators import login_required
 from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.models import User
 from django.contrib.auth import logout as auth_logout
 from django.contrib import messages
 from django.utils import timezone
-from django.http import JsonResponse
+from django.http import JsonResponse, HttpResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET, require_POST
+from django.core.paginator import Paginator
+from django.db.models import Count
+from django.http import Http404
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
-from .models import Profile, Ride, Poll, PollChoice, Vote, RidePhoto, RideComment
+from .models import (
+    Profile, Ride, Poll, PollChoice, Vote, RidePhoto, RideComment, MemberStats,
+    MemberDeletionJob, MemberImportJob, ArchivedRide, VoteRollup
+)
+from . import archive
+from .stats import COUNTER_FIELDS
+from .imports import read_members
+from .jobs import enqueue_member_deletion, enqueue_member_import
+from .cache import cached, cache_stats
+from .batch import max_batch_size, run_batch
+from .downloads import build_manifest, parse_range_start, stream_zip
 from .serializers import (
     ProfileSerializer, RideListSerializer, RideDetailSerializer,
-    PollListSerializer, PollDetailSerializer, VoteSerializer
+    PollListSerializer, PollDetailSerializer, VoteSerializer,
+    RideGalleryPhotoSerializer, MemberDirectorySerializer, LeaderboardSerializer,
+    ProfileValuesSerializer, RideListValuesSerializer, PollListValuesSerializer
 )
+from config.conditional import ConditionalGetMixin
+from config.exports import ExportMixin
+from config.fastpath import FastListMixin
+from config.throttling import BucketThrottle, throttle
+
+GALLERY_PAGE_SIZE = 24
+
+
+class GalleryPagination(PageNumberPagination):
+    """Pagination for ride photo galleries."""
+    page_size = GALLERY_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 100
 
 
-class ProfileViewSet(viewsets.ModelViewSet):
+def gallery_page(request, ride):
+    """Return one page of a ride's photos for the template views."""
+    photos = ride.photos.select_related('uploaded_by')
+    return Paginator(photos, GALLERY_PAGE_SIZE).get_page(request.GET.get('page'))
+
+
+# Cached lookups (see club.cache); short timeouts where the answer depends on the clock
+
+@cached('upcoming_ride_id', depends_on=[Ride], timeout=60)
+def upcoming_ride_id():
+    """ID of the next upcoming ride, or the most recent incomplete one."""
+    # First try to get future incomplete rides
+    ride_ids = Ride.objects.filter(
+        date_time__gt=timezone.now(),
+        completed=False
+    ).order_by('date_time').values_list('pk', flat=True)
+    # If no future incomplete rides, get the most recent incomplete ride
+    return ride_ids.first() or Ride.objects.filter(
+        completed=False
+    ).order_by('-date_time').values_list('pk', flat=True).first()
+
+
+upcoming_ride_payload = cached(
+    'upcoming_ride_payload',
+    depends_on=[Ride, Ride.riders.through, User, RidePhoto],
+    timeout=60
+)
+
+members_directory_payload = cached('members_directory', depends_on=[Profile, User, MemberStats])
+
+
+@cached('completed_rides', depends_on=[Ride, Ride.riders.through, ArchivedRide, ArchivedRide.riders.through])
+def completed_rides():
+    """Completed rides from both tiers (see club.archive), newest first, with their rider counts."""
+    return archive.completed_rides()
+
+
+class ProfileViewSet(ConditionalGetMixin, FastListMixin, viewsets.ModelViewSet):
     """ViewSet for user profiles."""
     queryset = Profile.objects.all()
     serializer_class = ProfileSerializer
+    fast_serializer_class = ProfileValuesSerializer
+    conditional_models = [User, MemberStats]
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     
     def get_queryset(self):
-        queryset = Profile.objects.all()
+        queryset = Profile.objects.select_related('user', 'user__stats')
         # Filter by username if provided
         username = self.request.query_params.get('username', None)
         if username:
             queryset = queryset.filter(user__username=username)
         return queryset
     
+    @action(detail=False, methods=['get'], pagination_class=None)
+    def directory(self, request):
+        """Whole member roster in one unpaginated response, for the members grid."""
+        queryset = Profile.objects.select_related('user', 'user__stats').only(
+            'id', 'user_id', 'user__username', 'avatar', 'bio',
+            'bike_photo_1', 'bike_photo_2', 'bike_photo_3',
+            *[f'user__stats__{name}' for name in COUNTER_FIELDS + ['last_ride_date']]
+        )
+        parts = [request.scheme, request.get_host(), request.query_params.get('fields')]
+        data = members_directory_payload.get_or_set(
+            parts,
+            lambda: MemberDirectorySerializer(queryset, many=True, context={'request': request}).data
+        )
+        return Response(data)
+    
+    @action(detail=False, methods=['get'], pagination_class=None)
+    def leaderboard(self, request):
+        """Top members by an activity counter (?by=rides_attended&limit=10)."""
+        by = request.query_params.get('by', 'rides_attended')
+        if by not in COUNTER_FIELDS:
+            return Response(
+                {'error': f'by must be one of: {", ".join(COUNTER_FIELDS)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            limit = min(max(int(request.query_params.get('limit', 10)), 1), 100)
+        except ValueError:
+            limit = 10
+        queryset = MemberStats.objects.select_related('user').order_by(f'-{by}', 'user__username')[:limit]
+        serializer = LeaderboardSerializer(queryset, many=True)
+        return Response(serializer.data)
+    
     @action(detail=False, methods=['get', 'put', 'patch'])
     def me(self, request):
         """Get or update the current user's profile."""
@@ -39,7 +144,7 @@ class ProfileViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_401_UNAUTHORIZED
             )
         
-        profile, created = Profile.objects.get_or_create(user=request.user)
+        profile = request.profile
         
         if request.method == 'GET':
             serializer = self.get_serializer(profile)
@@ -52,10 +157,14 @@ class ProfileViewSet(viewsets.ModelViewSet):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class RideViewSet(viewsets.ModelViewSet):
+class RideViewSet(ConditionalGetMixin, FastListMixin, ExportMixin, viewsets.ModelViewSet):
     """ViewSet for rides."""
     queryset = Ride.objects.all()
+    fast_serializer_class = RideListValuesSerializer
+    conditional_models = [Ride.riders.through, User, RidePhoto, ArchivedRide]
+    export_filename = 'rides'
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    throttle_scope = None  # Set per write action; see config.throttling
     
     def get_serializer_class(self):
         if self.action == 'list':
@@ -68,32 +177,71 @@ class RideViewSet(viewsets.ModelViewSet):
         upcoming = self.request.query_params.get('upcoming', None)
         if upcoming == 'true':
             queryset = queryset.filter(date_time__gt=timezone.now())
+        completed = self.request.query_params.get('completed', None)
+        if completed in ('true', 'false'):
+            queryset = queryset.filter(completed=completed == 'true')
+        if self.action not in ('list', 'export'):
+            queryset = queryset.annotate(photo_count=Count('photos'))
         return queryset
     
+    def get_archived_queryset(self):
+        """Archived rides matching the list filters (they are all completed and in the past)."""
+        params = self.request.query_params
+        if params.get('upcoming') == 'true' or params.get('completed') == 'false':
+            return ArchivedRide.objects.none()
+        return ArchivedRide.objects.all()
+    
+    def get_object(self):
+        try:
+            return super().get_object()
+        except Http404:
+            # Archived rides can be read but not changed
+            if self.action not in ('retrieve', 'photos'):
+                raise
+        ride = get_object_or_404(ArchivedRide.objects.annotate(photo_count=Count('photos')), pk=self.kwargs['pk'])
+        self.check_object_permissions(self.request, ride)
+        return ride
+    
+    def get_fast_rows(self, fast):
+        return archive.TieredRides(self.filter_queryset(self.get_queryset()), self.get_archived_queryset(), fast.prepare)
+    
+    def paginate_queryset(self, queryset):
+        if self.action == 'list' and not isinstance(queryset, archive.TieredRides):
+            # The regular serializers (?fast=0) page over both tiers too
+            queryset = archive.TieredRides(queryset, self.get_archived_queryset())
+        return super().paginate_queryset(queryset)
+    
+    def get_export_rows(self, serializer):
+        return archive.TieredRides(
+            self.get_export_queryset(), self.get_archived_queryset().order_by('pk'), serializer.prepare
+        )
+    
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
     
     @action(detail=False, methods=['get'])
     def upcoming(self, request):
         """Get the next upcoming ride."""
-        # First try to get future incomplete rides
-        ride = Ride.objects.filter(
-            date_time__gt=timezone.now(),
-            completed=False
-        ).order_by('date_time').first()
-        
-        # If no future incomplete rides, get the most recent incomplete ride
-        if not ride:
-            ride = Ride.objects.filter(
-                completed=False
-            ).order_by('-date_time').first()
-        
-        if ride:
-            serializer = RideDetailSerializer(ride, context={'request': request})
-            return Response(serializer.data)
+        ride_id = upcoming_ride_id()
+        if ride_id:
+            parts = [ride_id, request.scheme, request.get_host(), request.query_params.get('fields')]
+            data = upcoming_ride_payload.get_or_set(
+                parts,
+                lambda: RideDetailSerializer(Ride.objects.get(pk=ride_id), context={'request': request}).data
+            )
+            return Response(data)
         return Response({'message': 'No upcoming rides'}, status=status.HTTP_404_NOT_FOUND)
     
-    @action(detail=True, methods=['post'])
+    @action(detail=True, methods=['get'], pagination_class=GalleryPagination)
+    def photos(self, request, pk=None):
+        """Paginated photo gallery for a ride."""
+        ride = self.get_object()
+        photos = ride.photos.select_related('uploaded_by')
+        page = self.paginate_queryset(photos)
+        serializer = RideGalleryPhotoSerializer(page, many=True, context={'request': request})
+        return self.get_paginated_response(serializer.data)
+    
+    @action(detail=True, methods=['post'], throttle_classes=[BucketThrottle], throttle_scope='ride_membership')
     def join(self, request, pk=None):
         """Join a ride as a participant."""
         if not request.user.is_authenticated:
@@ -106,7 +254,7 @@ class RideViewSet(viewsets.ModelViewSet):
         ride.riders.add(request.user)
         return Response({'message': 'Successfully joined the ride'})
     
-    @action(detail=True, methods=['post'])
+    @action(detail=True, methods=['post'], throttle_classes=[BucketThrottle], throttle_scope='ride_membership')
     def leave(self, request, pk=None):
         """Leave a ride."""
         if not request.user.is_authenticated:
@@ -120,10 +268,14 @@ class RideViewSet(viewsets.ModelViewSet):
         return Response({'message': 'Successfully left the ride'})
 
 
-class PollViewSet(viewsets.ModelViewSet):
+class PollViewSet(ConditionalGetMixin, FastListMixin, viewsets.ModelViewSet):
     """ViewSet for polls."""
     queryset = Poll.objects.all()
+    fast_serializer_class = PollListValuesSerializer
+    conditional_models = [PollChoice, Vote, VoteRollup, User, Profile]
+    updated_field = None  # Poll has no updated_at; the version stamps cover changes
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    throttle_scope = None  # Set per write action; see config.throttling
     
     def get_serializer_class(self):
         if self.action == 'list':
@@ -131,7 +283,7 @@ class PollViewSet(viewsets.ModelViewSet):
         return PollDetailSerializer
     
     def get_queryset(self):
-        queryset = Poll.objects.all()
+        queryset = Poll.objects.select_related('created_by')
         # Filter active polls
         active = self.request.query_params.get('active', None)
         if active == 'true':
@@ -144,14 +296,14 @@ class PollViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def active(self, request):
         """Get the current active poll."""
-        poll = Poll.objects.filter(is_active=True).first()
+        poll = Poll.objects.select_related('created_by').filter(is_active=True).first()
         
         if poll:
             serializer = PollDetailSerializer(poll, context={'request': request})
             return Response(serializer.data)
         return Response({'message': 'No active polls'}, status=status.HTTP_404_NOT_FOUND)
     
-    @action(detail=True, methods=['post'])
+    @action(detail=True, methods=['post'], throttle_classes=[BucketThrottle], throttle_scope='vote')
     def vote(self, request, pk=None):
         """Submit a vote for this poll."""
         if not request.user.is_authenticated:
@@ -177,14 +329,24 @@ class PollViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Remove any existing vote for this poll
-        Vote.objects.filter(
-            user=request.user,
-            choice__poll=poll
-        ).delete()
-        
-        # Create new vote
-        vote = Vote.objects.create(user=request.user, choice=choice)
+        with transaction.atomic():
+            # Re-read under the write lock: compaction (club.compaction) may have
+            # rolled the votes up since get_object(), and would not see this one
+            poll = Poll.objects.select_for_update().get(pk=poll.pk)
+            if poll.voting_closed:
+                return Response(
+                    {'error': 'Voting has closed for this poll'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            # Remove any existing vote for this poll
+            Vote.objects.filter(
+                user=request.user,
+                choice__poll=poll
+            ).delete()
+
+            # Create new vote
+            vote = Vote.objects.create(user=request.user, choice=choice)
         serializer = VoteSerializer(vote, context={'request': request})
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
@@ -261,10 +423,7 @@ def register_view(request):
             last_name=last_name
         )
         
-        # Create profile
-        Profile.objects.create(user=user)
-        
-        # Log them in
+        # Log them in (the profile is created by the post_save hook)
         login(request, user)
         messages.success(request, f'Welcome to Costa Brava Bikers, {username}!')
         return redirect('club:profile_edit')
@@ -275,22 +434,21 @@ def register_view(request):
 @login_required
 def profile_edit(request):
     """Profile edit page."""
-    profile, created = Profile.objects.get_or_create(user=request.user)
-    return render(request, 'club/profile_edit.html', {'profile': profile})
+    return render(request, 'club/profile_edit.html', {'profile': request.profile})
 
 
 def rides_list(request):
     """Completed rides list page."""
-    completed_rides = Ride.objects.filter(completed=True).order_by('-date_time')
-    return render(request, 'club/rides_list.html', {'completed_rides': completed_rides})
+    return render(request, 'club/rides_list.html', {'completed_rides': completed_rides()})
 
 
+@throttle('comment')
 def ride_detail(request, pk):
     """Ride detail page with comments."""
-    ride = get_object_or_404(Ride, pk=pk)
+    ride = archive.get_ride(pk)
     
-    # Handle comment submission
-    if request.method == 'POST' and request.user.is_authenticated:
+    # Handle comment submission (archived rides are read-only)
+    if request.method == 'POST' and request.user.is_authenticated and not isinstance(ride, ArchivedRide):
         if 'comment_message' in request.POST:
             message = request.POST.get('comment_message', '').strip()
             if message:
@@ -319,13 +477,49 @@ def ride_detail(request, pk):
     
     # Get all comments for this ride
     comments = ride.comments.select_related('user', 'user__profile').all()
+    riders = list(ride.riders.select_related('profile'))
     
     return render(request, 'club/ride_detail.html', {
         'ride': ride,
-        'comments': comments
+        'riders': riders,
+        'comments': comments,
+        'photos': gallery_page(request, ride)
     })
 
 
+@require_GET
+def ride_photos_download(request, pk):
+    """Stream a ride's photo gallery as a ZIP archive (supports resuming)."""
+    ride = archive.get_ride(pk)
+    manifest = build_manifest(ride)
+    if not manifest['entries']:
+        messages.error(request, 'This ride has no photos to download.')
+        return redirect('club:ride_detail', pk=pk)
+    
+    size = manifest['size']
+    offset = 0
+    start = parse_range_start(request.headers.get('Range'))
+    if_range = request.headers.get('If-Range')
+    if start is not None and if_range in (None, manifest['etag']):
+        if start >= size:
+            return HttpResponse(status=416, headers={'Content-Range': f'bytes */{size}'})
+        offset = start
+    
+    storage = RidePhoto._meta.get_field('photo').storage
+    response = StreamingHttpResponse(
+        stream_zip(manifest, storage, offset=offset),
+        content_type='application/zip',
+        status=206 if offset else 200
+    )
+    response['Content-Disposition'] = f'attachment; filename="ride-{ride.pk}-photos.zip"'
+    response['ETag'] = manifest['etag']
+    response['Accept-Ranges'] = 'bytes'
+    response['Content-Length'] = size - offset
+    if offset:
+        response['Content-Range'] = f'bytes {offset}-{size - 1}/{size}'
+    return response
+
+
 def poll_list(request):
     """Poll list and voting page."""
     return render(request, 'club/poll_list.html')
@@ -336,16 +530,14 @@ def members_list(request):
     return render(request, 'club/members_list.html')
 
 
+@throttle('comment')
 def upcoming_ride(request):
     """Upcoming ride detail page with chat."""
-    from django.utils import timezone
-    # First try to get future incomplete rides
-    ride = Ride.objects.filter(date_time__gt=timezone.now(), completed=False).order_by('date_time').first()
-    # If no future incomplete rides, get the most recent incomplete ride
-    if not ride:
-        ride = Ride.objects.filter(completed=False).order_by('-date_time').first()
+    ride_id = upcoming_ride_id()
+    ride = Ride.objects.filter(pk=ride_id).first() if ride_id else None
     
     comments = None
+    riders = []
     if ride:
         # Handle comment submission
         if request.method == 'POST' and request.user.is_authenticated:
@@ -377,14 +569,19 @@ def upcoming_ride(request):
         
         # Get all comments for this ride
         comments = ride.comments.select_related('user', 'user__profile').all()
+        # Loaded once so the join button and "Going" badges don't query per use
+        riders = list(ride.riders.select_related('profile'))
     
     return render(request, 'club/upcoming_ride.html', {
         'ride': ride,
+        'riders': riders,
+        'rider_ids': {rider.pk for rider in riders},
         'comments': comments
     })
 
 
 @login_required
+@throttle('ride_membership')
 def ride_join(request, pk):
     """Join a ride."""
     if request.method == 'POST':
@@ -396,6 +593,7 @@ def ride_join(request, pk):
 
 
 @login_required
+@throttle('ride_membership')
 def ride_leave(request, pk):
     """Leave a ride."""
     if request.method == 'POST':
@@ -542,8 +740,8 @@ def ride_edit_completed(request, pk):
             messages.success(request, f'Ride "{ride.title}" has been updated successfully!')
             return redirect('club:ride_detail', pk=pk)
     
-    # Get all photos for this ride
-    photos = ride.photos.all()
+    # Get one page of photos for this ride
+    photos = gallery_page(request, ride)
     
     return render(request, 'club/ride_edit_completed.html', {
         'ride': ride,
@@ -571,7 +769,7 @@ def member_add(request):
             return render(request, 'club/member_add.html')
         
         # Create user
-        user = User.objects.create_user(
+        User.objects.create_user(
             username=username,
             email=email,
             password=password,
@@ -579,15 +777,43 @@ def member_add(request):
             last_name=last_name
         )
         
-        # Create profile
-        Profile.objects.create(user=user)
-        
         messages.success(request, f'Rider "{username}" has been added successfully!')
         return redirect('club:members_list')
     
     return render(request, 'club/member_add.html')
 
 
+@staff_member_required
+def member_import(request):
+    """Bulk import members from a CSV or JSON upload (admin only)."""
+    if request.method == 'POST':
+        upload = request.FILES.get('members_file')
+        if not upload:
+            messages.error(request, 'Please choose a CSV or JSON file.')
+            return render(request, 'club/member_import.html')
+        
+        fmt = 'json' if upload.name.lower().endswith('.json') else 'csv'
+        try:
+            rows = read_members(upload.read().decode('utf-8-sig'), fmt)
+        except (UnicodeDecodeError, ValueError) as exc:
+            messages.error(request, f'Could not read file: {exc}')
+            return render(request, 'club/member_import.html')
+        
+        # Hashing thousands of passwords outlives the request; hand it to a background job
+        with transaction.atomic():
+            job = MemberImportJob.objects.create(filename=upload.name, rows=len(rows), requested_by=request.user)
+            enqueue_member_import(job, rows)
+        return redirect(f"{reverse('club:member_import')}?job={job.pk}")
+    
+    job = None
+    if request.GET.get('job', '').isdigit():
+        job = MemberImportJob.objects.filter(pk=request.GET['job']).first()
+    return render(request, 'club/member_import.html', {
+        'job': job,
+        'status_url': reverse('club:member_import_status', args=[job.pk]) if job else None,
+    })
+
+
 @staff_member_required
 def member_delete(request, user_id):
     """Delete a member (admin only)."""
@@ -598,9 +824,84 @@ def member_delete(request, user_id):
         if user == request.user:
             return JsonResponse({'error': 'You cannot delete yourself.'}, status=400)
         
-        username = user.username
-        user.delete()
-        
-        return JsonResponse({'message': f'Rider "{username}" has been deleted successfully.'})
+        # The cascade is too heavy for the request; hand it to a background job
+        job = MemberDeletionJob.objects.filter(
+            member_id=user.pk,
+            status__in=[MemberDeletionJob.STATUS_PENDING, MemberDeletionJob.STATUS_RUNNING]
+        ).first()
+        if not job:
+            with transaction.atomic():
+                # Lock the account out straight away
+                User.objects.filter(pk=user.pk).update(is_active=False)
+                job = MemberDeletionJob.objects.create(
+                    member_id=user.pk,
+                    username=user.username,
+                    requested_by=request.user
+                )
+                enqueue_member_deletion(job)
+        
+        return JsonResponse({
+            'message': f'Rider "{user.username}" is being deleted.',
+            'job_id': job.pk,
+            'status': job.status,
+            'status_url': reverse('club:member_delete_status', args=[job.pk])
+        }, status=202)
     
     return JsonResponse({'error': 'Invalid request method.'}, status=400)
+
+
+@staff_member_required
+def cache_stats_view(request):
+    """Hit and miss counters for the club cache (admin only)."""
+    return JsonResponse(cache_stats())
+
+
+@require_POST
+def api_batch(request):
+    """Run several read-only API GETs in one round trip.
+
+    Body: ``{"requests": [{"id": "polls", "url": "/club/api/polls/?active=true"}, ...]}``.
+    Returns ``{"responses": [{"id", "url", "status", "body"}, ...]}`` in the same order.
+    """
+    try:
+        items = json.loads(request.body or b'{}').get('requests')
+    except (ValueError, AttributeError):
+        items = None
+    if not isinstance(items, list):
+        return JsonResponse({'error': 'Expected {"requests": [...]}.'}, status=400)
+    if len(items) > max_batch_size():
+        return JsonResponse({'error': f'At most {max_batch_size()} requests per batch.'}, status=400)
+    return HttpResponse(run_batch(request, items), content_type='application/json')
+
+
+@staff_member_required
+def member_import_status(request, job_id):
+    """Progress of a background member import (admin only)."""
+    job = get_object_or_404(MemberImportJob, pk=job_id)
+    return JsonResponse({
+        'job_id': job.pk,
+        'filename': job.filename,
+        'status': job.status,
+        'rows': job.rows,
+        'progress': job.progress,
+        'created': len(job.report.get('created', [])),
+        'errors': job.report.get('errors', []),
+        'error': job.error,
+        'created_at': job.created_at,
+        'finished_at': job.finished_at
+    })
+
+
+@staff_member_required
+def member_delete_status(request, job_id):
+    """Progress of a background member deletion (admin only)."""
+    job = get_object_or_404(MemberDeletionJob, pk=job_id)
+    return JsonResponse({
+        'job_id': job.pk,
+        'username': job.username,
+        'status': job.status,
+        'progress': job.progress,
+        'error': job.error,
+        'created_at': job.created_at,
+        'finished_at': job.finished_at
+    })
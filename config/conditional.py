@@ -0,0 +1,153 @@
+"""
+Conditional GET support for API viewsets.
+
+Every tracked model has a version stamp in the cache: the time (ns) of its
+last change, bumped from post_save/post_delete/m2m_changed. Code that
+writes with bulk queries (``update()``, ``bulk_create()``, raw deletes)
+bypasses those signals and must call ``bump_version()`` itself.
+
+With more than one server process the default cache must be shared
+(file-based or Redis) so every process sees the same stamps; the settings
+refuse locmem unless ``DEBUG`` is on.
+"""
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+VERSION_KEY = 'model-version:{}'
+
+
+def _version_key(model):
+    return VERSION_KEY.format(model._meta.label_lower)
+
+
+def bump_version(*models):
+    """Record that rows of these models just changed."""
+    stamp = time.time_ns()
+    cache.set_many({_version_key(model): stamp for model in models}, timeout=None)
+
+
+def model_versions(*models):
+    """Return the version stamps for models, in order.
+
+    A missing stamp (cold or evicted cache) is treated as "changed now".
+    """
+    keys = [_version_key(model) for model in models]
+    found = cache.get_many(keys)
+    missing = [key for key in keys if key not in found]
+    if missing:
+        stamp = time.time_ns()
+        cache.set_many({key: stamp for key in missing}, timeout=None)
+        found.update(dict.fromkeys(missing, stamp))
+    return [found[key] for key in keys]
+
+
+async def amodel_versions(*models):
+    """Async twin of ``model_versions()``."""
+    keys = [_version_key(model) for model in models]
+    found = await cache.aget_many(keys)
+    missing = [key for key in keys if key not in found]
+    if missing:
+        stamp = time.time_ns()
+        await cache.aset_many({key: stamp for key in missing}, timeout=None)
+        found.update(dict.fromkeys(missing, stamp))
+    return [found[key] for key in keys]
+
+
+def _make_validator(request, user, summary, versions):
+    last_modified = max(versions) / 1e9
+    if summary.get('last'):
+        last_modified = max(last_modified, summary['last'].timestamp())
+
+    user_id = user.pk if user.is_authenticated else 0
+    parts = [request.get_full_path(), user_id, summary['count'], summary.get('last'), *versions]
+    etag = '"%s"' % hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+    return etag, int(last_modified)
+
+
+def _aggregates(updated_field):
+    aggregates = {'count': Count('pk')}
+    if updated_field:
+        aggregates['last'] = Max(updated_field)
+    return aggregates
+
+
+async def avalidator(request, queryset, conditional_models=(), updated_field='updated_at'):
+    """Async twin of ``ConditionalGetMixin._validator``; the ETags are interchangeable."""
+    summary = await queryset.order_by().aaggregate(**_aggregates(updated_field))
+    if not summary['count']:
+        return None, None
+    versions = await amodel_versions(queryset.model, *conditional_models)
+    return _make_validator(request, await request.auser(), summary, versions)
+
+
+# Saves of only these fields change no response (every login saves last_login)
+IGNORED_UPDATE_FIELDS = frozenset({'last_login'})
+
+
+def _bump_sender(sender, update_fields=None, **kwargs):
+    if update_fields and update_fields <= IGNORED_UPDATE_FIELDS:
+        return
+    bump_version(sender)
+
+
+def track_model_versions(*models):
+    """Bump a model's version on save/delete, and its M2M tables' on changes."""
+    for model in models:
+        uid = f'model-version-{model._meta.label_lower}'
+        post_save.connect(_bump_sender, sender=model, dispatch_uid=f'{uid}-save')
+        post_delete.connect(_bump_sender, sender=model, dispatch_uid=f'{uid}-delete')
+        for field in model._meta.local_many_to_many:
+            through = field.remote_field.through
+            m2m_changed.connect(_bump_sender, sender=through, dispatch_uid=f'{uid}-{field.name}')
+
+
+class ConditionalGetMixin:
+    """Answer conditional ``list``/``retrieve`` requests with 304 before serializing.
+
+    The validator combines max(``updated_field``) and the row count of the
+    (filtered) queryset with the version stamps of ``conditional_models``:
+    every model whose changes can alter the response.
+    """
+    conditional_models = ()
+    updated_field = 'updated_at'
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return self._conditional(request, queryset, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.get_queryset().model._base_manager.filter(
+            **{self.lookup_field: self.kwargs[lookup]}
+        )
+        return self._conditional(request, queryset, super().retrieve, *args, **kwargs)
+
+    def _validator(self, request, queryset):
+        summary = queryset.order_by().aggregate(**_aggregates(self.updated_field))
+        if not summary['count']:
+            return None, None
+
+        versions = model_versions(queryset.model, *self.conditional_models)
+        return _make_validator(request, request.user, summary, versions)
+
+    def _conditional(self, request, queryset, view, *args, **kwargs):
+        etag, last_modified = self._validator(request, queryset)
+        if etag is None:
+            # Empty results or a missing object: let the normal view answer
+            return view(request, *args, **kwargs)
+
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        response = view(request, *args, **kwargs)
+        if response.status_code == 200:
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        return response
@@ -0,0 +1,202 @@
+"""
+Fast read path for list endpoints.
+
+Builds response rows straight from ``.values()`` dicts instead of model
+instances and DRF field-by-field serialization. Each ``ValuesSerializer``
+mirrors an existing serializer; its output must stay byte-for-byte equal
+(``manage.py bench_list_serializers`` checks that).
+"""
+from django.conf import settings
+from django.core.files.storage import default_storage
+from rest_framework import serializers
+from rest_framework.response import Response
+
+_SKIP = object()
+_datetime_field = serializers.DateTimeField()
+
+
+class Column:
+    """A plain column, returned as-is."""
+
+    def __init__(self, lookup):
+        self.lookup = lookup
+
+    def lookups(self):
+        return [self.lookup]
+
+    def compile(self, context):
+        lookup = self.lookup
+        return lambda row: row[lookup]
+
+
+class DateTime(Column):
+    """A datetime column, formatted like ``serializers.DateTimeField``."""
+
+    def compile(self, context):
+        lookup = self.lookup
+        to_representation = _datetime_field.to_representation
+
+        def convert(row):
+            value = row[lookup]
+            return None if value is None else to_representation(value)
+        return convert
+
+
+class File(Column):
+    """A FileField/ImageField column, rendered as an (absolute) URL like DRF does."""
+
+    def compile(self, context):
+        lookup = self.lookup
+        request = context.get('request')
+        url = default_storage.url
+        build = request.build_absolute_uri if request is not None else None
+
+        def convert(row):
+            name = row[lookup]
+            if not name:
+                return None
+            return build(url(name)) if build else url(name)
+        return convert
+
+
+class Related(Column):
+    """A column reached through a nullable forward FK (``source='created_by.username'``).
+
+    DRF leaves the key out when the relation is null, so this does too.
+    """
+
+    def __init__(self, lookup):
+        super().__init__(lookup)
+        self.relation_id = lookup.rsplit('__', 1)[0] + '_id'
+
+    def lookups(self):
+        return [self.relation_id, self.lookup]
+
+    def compile(self, context):
+        lookup = self.lookup
+        relation_id = self.relation_id
+
+        def convert(row):
+            if row[relation_id] is None:
+                return _SKIP
+            return row[lookup]
+        return convert
+
+
+class Computed:
+    """A value derived from other columns, e.g. ``is_upcoming``."""
+
+    def __init__(self, func, *lookups):
+        self.func = func
+        self._lookups = list(lookups)
+
+    def lookups(self):
+        return self._lookups
+
+    def compile(self, context):
+        func = self.func
+        lookups = self._lookups
+        return lambda row: func(*[row[lookup] for lookup in lookups])
+
+
+class Nested:
+    """A nested object; ``None`` when the ``present`` lookup is null."""
+
+    def __init__(self, fields, present=None):
+        self.fields = fields
+        self.present = present
+
+    def lookups(self):
+        lookups = [self.present] if self.present else []
+        for spec in self.fields.values():
+            lookups.extend(spec.lookups())
+        return lookups
+
+    def compile(self, context):
+        compiled = [(name, spec.compile(context)) for name, spec in self.fields.items()]
+        present = self.present
+
+        def convert(row):
+            if present and row[present] is None:
+                return None
+            return {name: func(row) for name, func in compiled}
+        return convert
+
+
+class ValuesSerializer:
+    """Serialize a queryset from ``.values()`` rows.
+
+    Subclasses set ``fields`` (an ordered ``{name: spec}`` dict matching the
+    original serializer's field order) and may override ``annotate()``.
+    Set ``sparse_fields`` when the original serializer honours ``?fields=``.
+    """
+    fields = {}
+    sparse_fields = False
+
+    def __init__(self, context=None, only=None):
+        self.context = context or {}
+        names = [name for name in self.fields if only is None or name in only]
+        self.names = names
+        self._compiled = [(name, self.fields[name].compile(self.context)) for name in names]
+        lookups = []
+        for name in names:
+            for lookup in self.fields[name].lookups():
+                if lookup not in lookups:
+                    lookups.append(lookup)
+        self._lookups = lookups
+
+    def annotate(self, queryset):
+        return queryset
+
+    def prepare(self, queryset):
+        """Turn a model queryset into the ``.values()`` queryset to paginate."""
+        # Meta.ordering is dropped once annotate() adds a GROUP BY; keep it explicit
+        if not queryset.query.order_by:
+            queryset = queryset.order_by(*queryset.model._meta.ordering)
+        return self.annotate(queryset).values(*self._lookups)
+
+    def to_representation(self, row):
+        data = {}
+        for name, func in self._compiled:
+            value = func(row)
+            if value is not _SKIP:
+                data[name] = value
+        return data
+
+    def serialize(self, rows):
+        to_representation = self.to_representation
+        return [to_representation(row) for row in rows]
+
+
+def fast_lists_enabled():
+    return getattr(settings, 'FAST_LIST_SERIALIZATION', True)
+
+
+class FastListMixin:
+    """Serve ``list`` through ``fast_serializer_class`` when enabled.
+
+    ``?fields=`` is honoured when the fast serializer allows it; ``?fast=0``
+    forces the regular serializer, which is handy for comparisons.
+    """
+    fast_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        if (self.fast_serializer_class is None or not fast_lists_enabled()
+                or request.query_params.get('fast') == '0'):
+            return super().list(request, *args, **kwargs)
+
+        requested = request.query_params.get('fields')
+        only = None
+        if requested and self.fast_serializer_class.sparse_fields:
+            only = {name.strip() for name in requested.split(',') if name.strip()}
+        fast = self.fast_serializer_class(context=self.get_serializer_context(), only=only)
+
+        queryset = self.get_fast_rows(fast)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(fast.serialize(page))
+        return Response(fast.serialize(queryset))
+
+    def get_fast_rows(self, fast):
+        """The ``.values()`` rows to paginate; override to read more than one table."""
+        return fast.prepare(self.filter_queryset(self.get_queryset()))
@@ -0,0 +1,147 @@
+"""
+On-demand request profiling for staff.
+
+A staff user adds ``X-Profile: 1`` (header) or ``?_profile=1`` to any
+request under ``PROFILING_PATHS``. The request then runs under cProfile
+while a background thread samples its stack every ``PROFILING_INTERVAL``
+seconds. Two files are written to ``PROFILING_DIR``:
+
+- ``<id>.pstats``: load with ``python -m pstats`` or snakeviz (skipped when
+  another request is already under cProfile, which allows only one at a time);
+- ``<id>.collapsed``: one ``frame;frame;frame count`` line per stack, for
+  flamegraph.pl or speedscope.
+
+The id is returned in the ``X-Profile-Id`` header and only the newest
+``PROFILING_KEEP`` profiles are kept. Requests without the trigger pay one
+dictionary lookup. Under ASGI the event loop thread is profiled, so other
+requests running concurrently on the loop can show up in the profile.
+"""
+import cProfile
+import os
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+HEADER = 'HTTP_X_PROFILE'
+PARAM = '_profile'
+
+
+class StackSampler(threading.Thread):
+    """Sample one thread's Python stack into collapsed-stack counts.
+
+    cProfile sees every thread, so the loop sticks to builtins (which the
+    profiler is told to ignore) to stay out of the request's pstats.
+    """
+
+    def __init__(self, thread_id, interval):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = {}
+        self.running = True
+
+    def run(self):
+        stacks = self.stacks
+        current_frames = sys._current_frames
+        while self.running:
+            time.sleep(self.interval)
+            frame = current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append('%s (%s:%d)' % (code.co_name, code.co_filename.rpartition(os.sep)[2], code.co_firstlineno))
+                frame = frame.f_back
+            if stack:
+                stack.reverse()
+                key = ';'.join(stack)
+                stacks[key] = stacks.get(key, 0) + 1
+
+    def stop(self):
+        self.running = False
+        self.join()
+
+    def collapsed(self):
+        ordered = sorted(self.stacks.items(), key=lambda item: -item[1])
+        return ''.join(f'{stack} {count}\n' for stack, count in ordered)
+
+
+def profile_dir():
+    return Path(getattr(settings, 'PROFILING_DIR', settings.BASE_DIR / '.profiles'))
+
+
+def _rotate(directory, keep):
+    profiles = sorted(directory.glob('*.collapsed'), key=lambda path: path.stat().st_mtime, reverse=True)
+    for path in profiles[keep:]:
+        path.unlink(missing_ok=True)
+        path.with_suffix('.pstats').unlink(missing_ok=True)
+
+
+class ProfilingMiddleware:
+    """Profile staff requests that ask for it; must come after AuthenticationMiddleware."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.paths = tuple(getattr(settings, 'PROFILING_PATHS', ('/club/', '/api/')))
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def _requested(self, request):
+        return (HEADER in request.META or PARAM in request.GET) and request.path.startswith(self.paths)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not (self._requested(request) and request.user.is_staff):
+            return self.get_response(request)
+        profile_id, sampler, profiler = self._start()
+        try:
+            response = self.get_response(request)
+        finally:
+            self._stop(sampler, profiler)
+        return self._finish(response, profile_id, sampler, profiler)
+
+    async def __acall__(self, request):
+        if not (self._requested(request) and (await request.auser()).is_staff):
+            return await self.get_response(request)
+        profile_id, sampler, profiler = self._start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            self._stop(sampler, profiler)
+        return self._finish(response, profile_id, sampler, profiler)
+
+    def _start(self):
+        profile_id = f'{time.strftime("%Y%m%d-%H%M%S")}-{uuid.uuid4().hex[:8]}'
+        sampler = StackSampler(threading.get_ident(), getattr(settings, 'PROFILING_INTERVAL', 0.001))
+        sampler.start()
+        profiler = cProfile.Profile(builtins=False)
+        try:
+            profiler.enable()
+        except ValueError:
+            # Only one cProfile can run at a time; sample this request only
+            profiler = None
+        return profile_id, sampler, profiler
+
+    def _stop(self, sampler, profiler):
+        if profiler is not None:
+            profiler.disable()
+        sampler.stop()
+
+    def _finish(self, response, profile_id, sampler, profiler):
+        directory = profile_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        if profiler is not None:
+            profiler.dump_stats(directory / f'{profile_id}.pstats')
+        (directory / f'{profile_id}.collapsed').write_text(sampler.collapsed())
+        _rotate(directory, getattr(settings, 'PROFILING_KEEP', 50))
+
+        response['X-Profile-Id'] = profile_id
+        return response
@@ -0,0 +1,133 @@
+"""
+Per-request SQL instrumentation.
+
+``QueryLogMiddleware`` wraps every database connection for the duration of
+a request and records the query count, total DB time and how often each
+SQL statement (with its placeholders, so values don't matter) was run.
+The numbers go out as a ``Server-Timing`` header and one JSON log line on
+the ``config.querylog`` logger. A statement repeated
+``SQL_N_PLUS_ONE_THRESHOLD`` times or more is reported as a likely N+1,
+together with the view, the template being rendered and the first frame of
+project code that issued it.
+
+Enable with ``SQL_INSTRUMENTATION=True``; otherwise the middleware removes
+itself at startup.
+"""
+import json
+import logging
+import re
+import sys
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r'\s+')
+_IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+
+
+def fingerprint(sql):
+    """Normalize SQL so the same statement with different values compares equal."""
+    sql = _WHITESPACE.sub(' ', sql).strip()
+    # IN (%s, %s, ...) varies with the number of ids; count those as one shape
+    return _IN_LIST.sub('IN (...)', sql)
+
+
+def _origin():
+    """Return (template name, first project frame) for the current query."""
+    template = None
+    source = None
+    base_dir = str(settings.BASE_DIR)
+    frame = sys._getframe(2)
+    while frame is not None:
+        code = frame.f_code
+        if template is None and code.co_name == 'render' and 'django/template' in code.co_filename:
+            origin = getattr(frame.f_locals.get('self'), 'origin', None)
+            if origin is not None and origin.template_name:
+                template = origin.template_name
+        filename = code.co_filename
+        if (source is None and filename.startswith(base_dir)
+                and 'site-packages' not in filename and filename != __file__):
+            source = f'{filename[len(base_dir) + 1:]}:{frame.f_lineno} in {code.co_name}'
+        frame = frame.f_back
+    return template, source
+
+
+class QueryRecorder:
+    """An ``execute_wrapper`` that tallies queries for one request."""
+
+    def __init__(self, threshold):
+        self.threshold = threshold
+        self.count = 0
+        self.duration = 0.0
+        self.statements = {}
+        self.origins = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            key = fingerprint(sql)
+            seen = self.statements.get(key, 0) + 1
+            self.statements[key] = seen
+            # Only pay for the stack walk once a statement looks repeated
+            if seen == self.threshold:
+                self.origins[key] = _origin()
+
+    def repeated(self):
+        return [
+            {'sql': sql, 'count': count, 'template': self.origins[sql][0], 'source': self.origins[sql][1]}
+            for sql, count in sorted(self.statements.items(), key=lambda item: -item[1])
+            if sql in self.origins
+        ]
+
+
+class QueryLogMiddleware:
+    """Record queries per request; see the module docstring."""
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'SQL_INSTRUMENTATION', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.threshold = getattr(settings, 'SQL_N_PLUS_ONE_THRESHOLD', 5)
+
+    def __call__(self, request):
+        recorder = QueryRecorder(self.threshold)
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - started
+
+        repeated = recorder.repeated()
+        match = request.resolver_match
+        view = match.view_name if match else None
+        timings = [
+            f'db;dur={recorder.duration * 1000:.1f};desc="{recorder.count} queries"',
+            f'app;dur={elapsed * 1000:.1f}',
+        ]
+        if repeated:
+            timings.append(f'n1;desc="{len(repeated)} repeated statements"')
+        response['Server-Timing'] = ', '.join(timings)
+
+        logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'view': view,
+            'status': response.status_code,
+            'queries': recorder.count,
+            'db_ms': round(recorder.duration * 1000, 1),
+            'total_ms': round(elapsed * 1000, 1),
+            'distinct': len(recorder.statements),
+        }))
+        for statement in repeated:
+            logger.warning(json.dumps({'n_plus_one': True, 'view': view, 'path': request.path, **statement}))
+        return response
@@ -0,0 +1,34 @@
+"""
+JSON renderers for the REST API.
+
+``FastJSONRenderer`` uses orjson (listed in the project requirements) and
+falls back to DRF's stock renderer when it is missing, so it is always safe
+to configure; ``fast_json_backend()`` says which one is in use.
+"""
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def fast_json_backend():
+    """Name of the encoder ``FastJSONRenderer`` is using, for benchmarks and diagnostics."""
+    if orjson is None:
+        return 'DRF JSONRenderer (orjson not installed)'
+    return f'orjson {orjson.__version__}'
+
+
+class FastJSONRenderer(JSONRenderer):
+    """Compact JSON via orjson; indented output (``?indent``/Accept) still uses the stock path."""
+
+    _default = staticmethod(JSONEncoder().default)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type or '', renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return orjson.dumps(data, default=self._default)
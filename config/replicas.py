@@ -0,0 +1,123 @@
+"""
+Primary/replica routing for the ``club`` and ``api`` apps.
+
+``PrimaryReplicaRouter`` sends reads to a random alias from
+``DATABASE_REPLICAS`` and every write to ``default``. Reads go to the
+primary instead when:
+
+- they run inside a transaction on the primary;
+- the current request has already written;
+- the client wrote within the last ``REPLICA_PIN_SECONDS``. After a write,
+  ``ReplicaPinMiddleware`` sets a short-lived cookie, so a member who
+  posts a comment or votes sees it on the next page even while the
+  replicas lag behind.
+
+Locally, ``SQLITE_REPLICAS`` adds replica aliases backed by SQLite files,
+and ``manage.py replicate_sqlite`` stands in for replication. It copies
+the primary into them with SQLite's online backup API every
+``--interval`` seconds. With no replicas configured the router does
+nothing.
+"""
+import random
+import sqlite3
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+ROUTED_APPS = {'club', 'api'}
+COOKIE = 'primary_reads'
+
+# Per-request {'pinned': bool, 'wrote': bool}; a dict so writes made in a
+# sync_to_async thread are seen by the middleware
+_state = ContextVar('replica_routing', default=None)
+
+
+def replicas():
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+def _current():
+    state = _state.get()
+    if state is None:
+        # Outside a request (shell, commands): this context reads its own writes from now on
+        state = {'pinned': False, 'wrote': False}
+        _state.set(state)
+    return state
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        aliases = replicas()
+        if not aliases or model._meta.app_label not in ROUTED_APPS:
+            return None
+        state = _current()
+        if state['pinned'] or state['wrote'] or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(aliases)
+
+    def db_for_write(self, model, **hints):
+        if replicas():
+            _current()['wrote'] = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Every alias holds the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get the schema along with the data
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaPinMiddleware:
+    """Route a client's reads to the primary for ``REPLICA_PIN_SECONDS`` after it writes."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        token = _state.set({'pinned': COOKIE in request.COOKIES, 'wrote': False})
+        try:
+            return self._pin(self.get_response(request))
+        finally:
+            _state.reset(token)
+
+    async def __acall__(self, request):
+        token = _state.set({'pinned': COOKIE in request.COOKIES, 'wrote': False})
+        try:
+            return self._pin(await self.get_response(request))
+        finally:
+            _state.reset(token)
+
+    def _pin(self, response):
+        if _state.get()['wrote'] and replicas():
+            response.set_cookie(
+                COOKIE, '1', max_age=getattr(settings, 'REPLICA_PIN_SECONDS', 5),
+                httponly=True, samesite='Lax',
+            )
+        return response
+
+
+def replicate(aliases=None):
+    """Copy the primary SQLite database into each replica alias; return the aliases copied."""
+    aliases = replicas() if aliases is None else aliases
+    source = sqlite3.connect(connections.settings[DEFAULT_DB_ALIAS]['NAME'])
+    try:
+        for alias in aliases:
+            target = sqlite3.connect(connections.settings[alias]['NAME'], timeout=30)
+            try:
+                source.backup(target)
+            finally:
+                target.close()
+    finally:
+        source.close()
+    return aliases
@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 
 from pathlib import Path
 import os
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -50,12 +51,17 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'config.querylog.QueryLogMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'config.replicas.ReplicaPinMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'club.middleware.RetiredBackendMiddleware',
+    'club.middleware.ProfileMiddleware',
+    'config.profiling.ProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -84,13 +90,83 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
+# config.sqlite adds WAL and other pragmas, BEGIN IMMEDIATE and an optional
+# process-local write queue on top of Django's sqlite3 backend
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'config.sqlite',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            'write_queue': os.getenv('SQLITE_WRITE_QUEUE', 'True') == 'True',
+        },
+        # Keep connections (and their pragmas) across requests
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '600')),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Read replicas (config.replicas): SQLITE_REPLICAS=db-replica.sqlite3 adds a
+# read-only alias per file; `manage.py replicate_sqlite` keeps them in sync
+for index, name in enumerate(filter(None, os.getenv('SQLITE_REPLICAS', '').split(',')), start=1):
+    DATABASES[f'replica{index}'] = {
+        **DATABASES['default'],
+        'NAME': BASE_DIR / name.strip(),
+        'OPTIONS': {'pragmas': {'query_only': 1}},
+        # Tests read the primary through this alias
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['config.replicas.PrimaryReplicaRouter']
+
+# Seconds a client's reads stay on the primary after it writes
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', '5'))
+
+
+# Authentication
+# Loads the member's profile in the same query as request.user. Sessions created
+# before the switch name ModelBackend; club.middleware.RetiredBackendMiddleware
+# moves them over.
+
+AUTHENTICATION_BACKENDS = [
+    'club.backends.ProfileModelBackend',
+]
+
+
+# Cache
+# CACHE_BACKEND picks the backend: locmem (default, per process), file, or redis
+# (Django's RedisCache, needs the redis package). CACHE_LOCATION overrides the
+# directory or redis:// URL. Throttle buckets and model version stamps live
+# here and must be shared by every server process, so locmem is for DEBUG only.
+
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'locmem')
+if CACHE_BACKEND == 'locmem' and not DEBUG:
+    raise ImproperlyConfigured(
+        "CACHE_BACKEND=locmem is per process: rate limits would multiply by the number of workers and "
+        "ETags would go stale across them. Set CACHE_BACKEND=file or redis when DEBUG is off."
+    )
+_CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'club',
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv('CACHE_LOCATION', str(BASE_DIR / '.cache')),
+    },
+    'redis': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.getenv('CACHE_LOCATION', 'redis://127.0.0.1:6379/1'),
+    },
+}
+CACHES = {
+    'default': _CACHE_BACKENDS[CACHE_BACKEND],
+}
+
+# Default lifetime (seconds) of club.cache entries; model changes invalidate them sooner
+CLUB_CACHE_TIMEOUT = int(os.getenv('CLUB_CACHE_TIMEOUT', '300'))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -147,6 +223,53 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
+    # config.renderers.FastJSONRenderer uses orjson when installed;
+    # set API_JSON_RENDERER=rest_framework.renderers.JSONRenderer for the stock one
+    'DEFAULT_RENDERER_CLASSES': [
+        os.getenv('API_JSON_RENDERER', 'config.renderers.FastJSONRenderer'),
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+}
+
+# Rows per query for bulk item writes (api.views.ItemViewSet); ?batch_size= may go up to the max
+API_BULK_BATCH_SIZE = int(os.getenv('API_BULK_BATCH_SIZE', '500'))
+API_BULK_BATCH_SIZE_MAX = 5000
+
+# Serve the hot read paths from async views (club.async_views); only worth it under ASGI
+ASYNC_READ_VIEWS = os.getenv('ASYNC_READ_VIEWS', 'False') == 'True'
+
+# Token buckets for write endpoints (config.throttling): per client IP and per member
+THROTTLE_ENABLED = os.getenv('THROTTLE_ENABLED', 'True') == 'True'
+THROTTLE_RATES = {
+    'vote': {'ip': '120/min', 'user': '10/min'},
+    'ride_membership': {'ip': '120/min', 'user': '20/min'},
+    'comment': {'ip': '120/min', 'user': '10/min'},
+}
+
+# Most sub-requests one POST to /club/api/batch/ may carry (club.batch)
+BATCH_MAX_REQUESTS = int(os.getenv('BATCH_MAX_REQUESTS', '25'))
+
+# Serve list endpoints from .values() rows (config.fastpath) instead of DRF serializers
+FAST_LIST_SERIALIZATION = os.getenv('FAST_LIST_SERIALIZATION', 'True') == 'True'
+
+# Per-request SQL instrumentation (config.querylog): Server-Timing header, a log
+# line per request and warnings for statements repeated SQL_N_PLUS_ONE_THRESHOLD+ times
+SQL_INSTRUMENTATION = os.getenv('SQL_INSTRUMENTATION', 'False') == 'True'
+SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv('SQL_N_PLUS_ONE_THRESHOLD', '5'))
+
+# Staff can profile a request with X-Profile: 1 or ?_profile=1 (config.profiling)
+PROFILING_DIR = Path(os.getenv('PROFILING_DIR', BASE_DIR / '.profiles'))
+PROFILING_KEEP = int(os.getenv('PROFILING_KEEP', '50'))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'config.querylog': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
 }
 
 # CORS settings
@@ -0,0 +1,97 @@
+"""
+SQLite backend tuned for a web server with concurrent writers.
+
+Use ``'ENGINE': 'config.sqlite'``. On top of Django's sqlite3 backend it:
+
+- sets ``PRAGMAS`` on every new connection (WAL journal, ``synchronous=NORMAL``,
+  memory-mapped I/O, a larger page cache, ``busy_timeout``, in-memory temp
+  tables); override or extend them with ``OPTIONS['pragmas']``;
+- starts ``atomic()`` transactions with ``BEGIN IMMEDIATE`` unless
+  ``OPTIONS['transaction_mode']`` says otherwise. A deferred transaction
+  that reads and then writes cannot wait for the write lock and fails with
+  "database is locked" straight away; an immediate one takes the lock up
+  front and waits its turn through ``busy_timeout``;
+- with ``OPTIONS['write_queue'] = True``, makes ``atomic()`` transactions
+  on the same database file in this process wait on one lock before
+  ``BEGIN``. Threads then queue in order instead of retrying SQLite's busy
+  handler against each other. Writes outside ``atomic()`` don't take it.
+
+Pair it with ``CONN_MAX_AGE`` so connections, and their pragmas, are reused
+across requests. ``manage.py bench_sqlite_contention`` compares the settings.
+"""
+import threading
+
+from django.db import OperationalError
+from django.db.backends.sqlite3 import base
+
+PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 128 * 1024 * 1024,
+    # Negative sizes are KiB rather than pages
+    'cache_size': -32 * 1024,
+    'busy_timeout': 5000,
+    'temp_store': 'MEMORY',
+}
+
+_write_locks = {}
+_write_locks_guard = threading.Lock()
+
+
+def write_lock(name):
+    """The process-wide write lock for one database file."""
+    with _write_locks_guard:
+        return _write_locks.setdefault(str(name), threading.Lock())
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    _holds_write_lock = False
+
+    def get_connection_params(self):
+        kwargs = super().get_connection_params()
+        self.pragmas = {**PRAGMAS, **kwargs.pop('pragmas', {})}
+        self.write_queue = kwargs.pop('write_queue', False)
+        if 'transaction_mode' not in self.settings_dict['OPTIONS']:
+            self.transaction_mode = 'IMMEDIATE'
+        return kwargs
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.pragmas.items():
+            conn.execute(f'PRAGMA {name} = {value}')
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        if self.write_queue and not self.is_in_memory_db():
+            timeout = self.pragmas['busy_timeout'] / 1000
+            if not write_lock(self.settings_dict['NAME']).acquire(timeout=timeout):
+                raise OperationalError('database is locked (timed out waiting for the write queue)')
+            self._holds_write_lock = True
+        try:
+            super()._start_transaction_under_autocommit()
+        except Exception:
+            self._release_write_lock()
+            raise
+
+    def _release_write_lock(self):
+        if self._holds_write_lock:
+            self._holds_write_lock = False
+            write_lock(self.settings_dict['NAME']).release()
+
+    def _commit(self):
+        try:
+            return super()._commit()
+        finally:
+            self._release_write_lock()
+
+    def _rollback(self):
+        try:
+            return super()._rollback()
+        finally:
+            self._release_write_lock()
+
+    def _close(self):
+        try:
+            return super()._close()
+        finally:
+            self._release_write_lock()
@@ -0,0 +1,100 @@
+"""
+Token-bucket rate limits for write endpoints.
+
+Each scope in ``THROTTLE_RATES`` has a per-IP and a per-user rate such as
+``'10/min'``: a bucket holds up to that many tokens and refills at that
+rate, so short bursts pass and sustained loops are cut to the rate. The
+IP bucket is checked first and needs nothing but ``REMOTE_ADDR``; the user
+bucket then uses the already-authenticated user. Over-limit requests get a
+``429`` with ``Retry-After`` before the view runs, so they never reach a
+write.
+
+Buckets live in the default cache as ``(tokens, timestamp)`` pairs. With
+more than one server process the cache must be shared (file or Redis);
+the settings refuse the per-process locmem cache unless ``DEBUG`` is on.
+Two requests racing on the same bucket can both pass; the limit is
+approximate under that kind of contention, which is fine for stopping
+runaway clients. ``THROTTLE_ENABLED=False`` turns all of it off.
+"""
+import math
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from rest_framework.throttling import BaseThrottle
+
+KEY = 'throttle:{}:{}:{}'
+PERIODS = {'s': 1, 'sec': 1, 'm': 60, 'min': 60, 'h': 3600, 'hour': 3600, 'd': 86400, 'day': 86400}
+
+
+def parse_rate(rate):
+    """``'10/min'`` -> ``(10, 60)``: bucket capacity and the seconds it takes to refill."""
+    count, _, period = rate.partition('/')
+    return int(count), PERIODS[period]
+
+
+def take(key, rate, now=None):
+    """Take a token from the bucket at ``key``; return 0 if allowed, else seconds until one is free."""
+    capacity, period = parse_rate(rate)
+    now = time.time() if now is None else now
+    per_second = capacity / period
+    tokens, stamp = cache.get(key) or (capacity, now)
+    tokens = min(capacity, tokens + (now - stamp) * per_second)
+    if tokens < 1:
+        return (1 - tokens) / per_second
+    cache.set(key, (tokens - 1, now), timeout=period + 1)
+    return 0
+
+
+def throttle_enabled():
+    return getattr(settings, 'THROTTLE_ENABLED', True)
+
+
+def check(scope, request):
+    """Seconds the client must wait before ``scope`` accepts another request (0 = go ahead)."""
+    if not throttle_enabled():
+        return 0
+    rates = settings.THROTTLE_RATES[scope]
+    wait = take(KEY.format(scope, 'ip', request.META.get('REMOTE_ADDR', '')), rates['ip'])
+    if wait:
+        return wait
+    if request.user.is_authenticated:
+        return take(KEY.format(scope, 'user', request.user.pk), rates['user'])
+    return 0
+
+
+def too_many_requests(wait):
+    seconds = math.ceil(wait)
+    response = HttpResponse(
+        f'Too many requests. Try again in {seconds} seconds.\n',
+        status=429, content_type='text/plain; charset=utf-8'
+    )
+    response['Retry-After'] = seconds
+    return response
+
+
+def throttle(scope, methods=('POST',)):
+    """Rate-limit a function view's ``methods`` with the ``scope`` buckets."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method in methods:
+                wait = check(scope, request)
+                if wait:
+                    return too_many_requests(wait)
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class BucketThrottle(BaseThrottle):
+    """DRF throttle for the view's ``throttle_scope``; DRF turns ``wait()`` into ``Retry-After``."""
+
+    def allow_request(self, request, view):
+        self._wait = check(view.throttle_scope, request)
+        return not self._wait
+
+    def wait(self):
+        return self._wait